@@ -0,0 +1,25 @@
+import sys
+import argparse
+import multiprocessing
+from core.config import Config
+from core.services.job_api import run_forever
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="无界面任务接口服务（提交/查询/取消语音、豆包和视频任务）")
+    parser.add_argument("--host", default=Config.API_HOST, help="监听地址")
+    parser.add_argument("--port", type=int, default=Config.API_PORT, help="监听端口")
+    parser.add_argument("--max-queued", type=int, default=Config.API_MAX_QUEUED, help="排队任务上限，超出时返回 429")
+    parser.add_argument("--tts-slots", type=int, default=Config.API_SLOTS["tts"], help="同时进行的语音合成任务数")
+    parser.add_argument("--browser-slots", type=int, default=Config.API_SLOTS["browser"], help="同时进行的豆包任务数")
+    parser.add_argument("--ffmpeg-slots", type=int, default=Config.API_SLOTS["ffmpeg"], help="同时进行的视频渲染任务数")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    multiprocessing.freeze_support()
+    args = parse_args(argv)
+    slots = {"tts": max(1, args.tts_slots), "browser": max(1, args.browser_slots), "ffmpeg": max(1, args.ffmpeg_slots)}
+    run_forever(args.host, args.port, slots, max(1, args.max_queued))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import os
+import sys
+import argparse
+import multiprocessing
+from core.config import Config
+from core.utils.data_manager import DataManager
+from core.services.batch_service import BatchRenderService
+from core.utils.telemetry import MetricsExporter
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="无界面批量渲染视频（清单格式: JSONL 或 CSV）")
+    parser.add_argument("manifest", help="任务清单文件路径 (.jsonl / .csv)")
+    parser.add_argument("-o", "--output-dir", default=Config.OUTPUT_DIR, help="未指定 video_output 的任务的输出目录")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="并行渲染的进程数")
+    parser.add_argument("--gpu", action="store_true", help="默认开启GPU加速（可被清单中的 use_gpu 覆盖）")
+    parser.add_argument("--still-frames", action="store_true", help="默认使用静态帧快速模式（可被清单中的 still_frames 覆盖）")
+    parser.add_argument("--segments", type=int, default=1, help="单个视频按字幕边界分段并行编码的段数（可被清单中的 segments 覆盖）")
+    parser.add_argument("--segment-seconds", type=float, help="按目标时长（秒）自动决定分段数（可被清单中的 segment_seconds 覆盖）")
+    parser.add_argument("--report", help="将渲染统计以JSON格式写入该文件")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    multiprocessing.freeze_support()
+    args = parse_args(argv)
+    output_dir = os.path.abspath(args.output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        jobs = BatchRenderService.load_manifest(args.manifest, output_dir, args.gpu, args.still_frames, args.segments, args.segment_seconds)
+    except (OSError, ValueError) as e:
+        print(f"读取任务清单失败: {e}")
+        return 2
+
+    if not jobs:
+        print("任务清单为空，无需渲染。")
+        return 0
+
+    print(f"共 {len(jobs)} 个任务，使用 {args.workers} 个进程并行渲染...")
+    summary = BatchRenderService.run_batch(jobs, args.workers)
+
+    print(f"\n完成: {summary['succeeded']}/{summary['total']}，失败: {summary['failed']}")
+    print(f"总耗时: {summary['wall_time']:.2f}s，单任务累计耗时: {summary['job_time_total']:.2f}s")
+    print(f"吞吐量: {summary['clips_per_hour']:.1f} 个/小时")
+    if summary['avg_realtime_factor']:
+        print(f"平均编码实时倍率: {summary['avg_realtime_factor']:.2f}x")
+
+    if args.report and not DataManager.save_json(summary, args.report):
+        print(f"写入统计文件 '{args.report}' 失败。")
+
+    if Config.TELEMETRY_ENABLED:
+        exporter = MetricsExporter()
+        exporter.refresh()
+        try:
+            print(f"指标快照已写入: {exporter.write_prometheus()}")
+        except OSError as e:
+            print(f"写入指标快照失败: {e}")
+
+    return 1 if summary['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import os
+import time
+import signal
+import argparse
+import tempfile
+import multiprocessing
+
+from core.config import Config
+from core.utils.farm_queue import FarmQueue
+from core.services.batch_service import BatchRenderService
+from core.services.render_farm import run_worker_process
+from benchmarks.bench_still_frames import build_fixture
+
+def worker_in_own_group(*args):
+    os.setsid()
+    run_worker_process(*args)
+
+def kill_one_worker(farm: FarmQueue, processes: list, timeout: float) -> bool:
+    pids = {process.pid for process in processes}
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for job in farm.status()['running_jobs']:
+            pid = int(job['worker'].rsplit('-', 1)[-1])
+            if pid in pids:
+                os.killpg(pid, signal.SIGKILL)
+                print(f"已强制结束节点 {job['worker']}（正在处理 {job['job_id']}），模拟节点宕机。")
+                return True
+        time.sleep(0.1)
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description="在本地目录上启动多个渲染节点进程，验证共享文件系统渲染农场的领取、心跳与租约重排")
+    parser.add_argument("--jobs", type=int, default=6, help="提交的视频任务数")
+    parser.add_argument("--workers", type=int, default=3, help="渲染节点进程数")
+    parser.add_argument("--duration", type=int, default=20, help="每个任务的旁白时长（秒）")
+    parser.add_argument("--lease", type=float, default=5.0, help="租约时长（秒）")
+    parser.add_argument("--heartbeat", type=float, default=1.0, help="心跳间隔（秒）")
+    parser.add_argument("--kill", action="store_true", help="在某个节点领取任务后强制结束它，验证任务会被重新排队")
+    parser.add_argument("--font", default=Config.DEFAULT_FONT_PATH, help="字体文件路径")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        _, audio_path, srt_path, _ = build_fixture(work_dir, args.duration, 3.0, args.font)
+        farm = FarmQueue(os.path.join(work_dir, "farm"), args.lease)
+        outputs = []
+        for index in range(args.jobs):
+            output = os.path.join(work_dir, "output", f"video_{index:03d}.mp4")
+            row = {'audio': audio_path, 'srt': srt_path, 'font': args.font, 'author': f"@farm{index}", 'cover_title': "农场", 'still_frames': True, 'video_output': output}
+            farm.submit(BatchRenderService.params_from_row(row, work_dir, output), f"job{index:03d}")
+            outputs.append(output)
+
+        start = time.perf_counter()
+        worker_args = (farm.root, args.lease, args.heartbeat, 0.2, True)
+        processes = [multiprocessing.Process(target=worker_in_own_group if args.kill else run_worker_process, args=worker_args) for _ in range(args.workers)]
+        for process in processes:
+            process.start()
+        killed = kill_one_worker(farm, processes, 60) if args.kill else False
+        for process in processes:
+            process.join()
+        wall_time = time.perf_counter() - start
+
+        status = farm.status()
+        done = farm.results('done')
+        requeues = sum(len(job['history']) - 1 for job in done)
+        per_worker = {}
+        for job in done:
+            per_worker[job['worker']] = per_worker.get(job['worker'], 0) + 1
+        missing = [path for path in outputs if not os.path.isfile(path)]
+
+        print(f"\n任务: {args.jobs}，节点: {args.workers}，完成: {status['done']}，失败: {status['failed']}，剩余: {status['queue'] + status['running']}")
+        print(f"重新排队次数: {requeues}，总耗时: {wall_time:.2f}s，吞吐量: {len(done) * 3600 / wall_time:.1f} 个/小时")
+        for worker_id, count in sorted(per_worker.items()):
+            print(f"  {worker_id}: {count} 个任务")
+
+        ok = status['done'] == args.jobs and not missing and (not args.kill or (killed and requeues >= 1))
+        print("校验通过。" if ok else f"校验失败: 缺少输出 {missing}" if missing else "校验失败。")
+        return 0 if ok else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
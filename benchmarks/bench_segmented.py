@@ -0,0 +1,38 @@
+import os
+import argparse
+import tempfile
+from datetime import timedelta
+
+from core.config import Config
+from core.services.video_service import VideoCreationService
+from benchmarks.bench_still_frames import build_fixture, measure
+
+def main():
+    parser = argparse.ArgumentParser(description="对比单进程编码与按字幕边界分段并行编码的耗时")
+    parser.add_argument("--duration", type=int, default=600, help="旁白时长（秒），默认10分钟")
+    parser.add_argument("--cue-seconds", type=float, default=3.0, help="每条字幕的时长（秒）")
+    parser.add_argument("--segments", type=int, nargs='+', default=[os.cpu_count() or 1], help="要测试的分段数，可指定多个")
+    parser.add_argument("--bgm", action="store_true", help="同时混入背景音乐（使用旁白本身作为BGM）")
+    parser.add_argument("--font", default=Config.DEFAULT_FONT_PATH, help="字体文件路径")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        bg_path, audio_path, srt_path, cue_count = build_fixture(work_dir, args.duration, args.cue_seconds, args.font)
+        bgm_path = audio_path if args.bgm else None
+        print(f"旁白时长: {timedelta(seconds=args.duration)}，字幕条数: {cue_count}，CPU核数: {os.cpu_count()}")
+
+        results = [measure("单进程", VideoCreationService.create_video_with_ffmpeg, bg_path, audio_path, srt_path, args.font, os.path.join(work_dir, "single.mp4"), False, bgm_path)]
+        for segments in args.segments:
+            results.append(measure(f"分段x{segments}", VideoCreationService.create_video_with_ffmpeg, bg_path, audio_path, srt_path, args.font,
+                                   os.path.join(work_dir, f"segmented_{segments}.mp4"), False, bgm_path, None, segments))
+
+    print(f"\n{'模式':<12}{'成功':<6}{'墙钟(s)':>10}{'CPU(s)':>10}{'实时倍率':>10}")
+    for r in results:
+        print(f"{r['mode']:<12}{str(r['ok']):<6}{r['wall']:>10.2f}{r['cpu']:>10.2f}{args.duration / r['wall']:>10.2f}")
+    baseline = results[0]
+    for r in results[1:]:
+        if baseline['ok'] and r['ok']:
+            print(f"{r['mode']} 相对 {baseline['mode']}: 墙钟加速 {baseline['wall'] / r['wall']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+HEAVY_MODULES = ['selenium', 'edge_tts', 'aiohttp', 'requests', 'pysrt', 'PIL.Image', 'PyQt5.QtMultimedia']
+
+def probe_import() -> dict:
+    start = time.perf_counter()
+    import core.ui.main_window
+    import_time = time.perf_counter() - start
+
+    from core.utils.lazy_import import is_loaded
+    return {'import': import_time, 'eager_modules': [name for name in HEAVY_MODULES if is_loaded(name)]}
+
+def probe_window() -> dict:
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+    from PyQt5.QtWidgets import QApplication
+    from core.config import Config
+    from core.app_controller import AppController
+    from core.ui.main_window import VideoWorkflowApp
+
+    timings = {'first_paint': None, 'start_app': None}
+    original_start_app = AppController.start_app
+
+    def start_app(controller):
+        timings['start_app'] = time.time()
+        original_start_app(controller)
+    AppController.start_app = start_app
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and timings['first_paint'] is None:
+                timings['first_paint'] = time.time()
+                QTimer.singleShot(200, app.quit)
+            return False
+
+    app = QApplication(sys.argv[:1])
+    app.setStyleSheet(Config.STYLESHEET)
+    window = VideoWorkflowApp()
+    watcher = PaintWatcher()
+    window.installEventFilter(watcher)
+    window.show()
+    QTimer.singleShot(30_000, app.quit)
+    app.exec_()
+    window.controller.stop_app()
+    return timings
+
+def run_child(mode: str, platform_name: str) -> dict:
+    env = dict(os.environ, QT_QPA_PLATFORM=platform_name)
+    launched = time.time()
+    completed = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child", mode], capture_output=True, text=True, env=env, timeout=120)
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+    if completed.returncode != 0 or not lines:
+        raise RuntimeError(f"子进程 ({mode}) 运行失败:\n{completed.stderr[-2000:]}")
+    result = json.loads(lines[-1])
+    result['launched'] = launched
+    return result
+
+def measure(runs: int, platform_name: str) -> dict:
+    imports, eager, first_window, deferred = [], set(), [], True
+    for _ in range(runs):
+        probe = run_child('import', platform_name)
+        imports.append(probe['import'])
+        eager.update(probe['eager_modules'])
+
+        window = run_child('window', platform_name)
+        if window['first_paint'] is None:
+            raise RuntimeError("窗口未能完成首次绘制。")
+        first_window.append(window['first_paint'] - window['launched'])
+        deferred = deferred and (window['start_app'] is None or window['start_app'] >= window['first_paint'])
+    return {'import_seconds': statistics.median(imports), 'first_window_seconds': statistics.median(first_window),
+            'eager_modules': sorted(eager), 'startup_deferred': deferred}
+
+def check_regressions(result: dict, baseline: dict, tolerance: float) -> list:
+    problems = []
+    if result['eager_modules']:
+        problems.append(f"启动时被提前加载的重量级模块: {', '.join(result['eager_modules'])}")
+    if not result['startup_deferred']:
+        problems.append("语音加载等启动任务在窗口首次绘制前执行。")
+    for key, label in [('import_seconds', "导入耗时"), ('first_window_seconds', "首窗耗时")]:
+        if baseline.get(key) and result[key] > baseline[key] * (1 + tolerance):
+            problems.append(f"{label} {result[key] * 1000:.0f}ms 超过基线 {baseline[key] * 1000:.0f}ms 的 {tolerance:.0%} 容差")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="测量主窗口模块导入耗时与冷启动到首个窗口绘制的耗时，并检查启动性能回退")
+    parser.add_argument("--runs", type=int, default=5, help="每项测量的冷启动次数（取中位数）")
+    parser.add_argument("--platform", default=os.environ.get("QT_QPA_PLATFORM", "offscreen"), help="Qt 平台插件（无显示器环境使用 offscreen）")
+    parser.add_argument("--baseline", default=os.path.join(os.path.dirname(__file__), "startup_baseline.json"), help="基线文件路径")
+    parser.add_argument("--save-baseline", action="store_true", help="将本次结果写入基线文件")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="相对基线允许的耗时增长比例")
+    parser.add_argument("--require-baseline", action="store_true", help="缺少基线文件时视为失败（用于持续集成）")
+    parser.add_argument("--child", choices=['import', 'window'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(probe_import() if args.child == 'import' else probe_window()))
+        return 0
+
+    result = measure(args.runs, args.platform)
+    print(f"主窗口模块导入耗时 (中位数): {result['import_seconds'] * 1000:.1f}ms")
+    print(f"冷启动到首个窗口绘制 (中位数): {result['first_window_seconds'] * 1000:.1f}ms")
+    print(f"提前加载的重量级模块: {', '.join(result['eager_modules']) or '无'}")
+    print(f"启动任务在首次绘制后执行: {'是' if result['startup_deferred'] else '否'}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({key: result[key] for key in ('import_seconds', 'first_window_seconds')}, f, indent=2)
+        print(f"基线已写入: {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    else:
+        print(f"警告: 未找到基线文件 {args.baseline}，本次不会检查启动耗时回退，只检查提前加载的模块与启动顺序。\n"
+              "请先在本机运行 `python -m benchmarks.bench_startup --save-baseline` 生成基线。", file=sys.stderr)
+        if args.require_baseline:
+            return 1
+
+    problems = check_regressions(result, baseline, args.tolerance)
+    for problem in problems:
+        print(f"回退: {problem}")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import os
+import time
+import argparse
+import tempfile
+import subprocess
+from datetime import timedelta
+
+import pysrt
+
+from core.config import Config
+from core.services.video_service import VideoCreationService
+
+SAMPLE_TEXT = "今天我们来聊一聊如何建立自己的知识体系，让每一次学习都能沉淀下来。"
+
+def build_fixture(work_dir: str, duration: int, cue_seconds: float, font_path: str):
+    audio_path = os.path.join(work_dir, "narration.m4a")
+    subprocess.run(['ffmpeg', '-y', '-f', 'lavfi', '-i', f'sine=frequency=220:duration={duration}', '-c:a', 'aac', '-b:a', '64k', audio_path], check=True, capture_output=True)
+
+    subs = pysrt.SubRipFile()
+    cue_ms, t, i = int(cue_seconds * 1000), 0, 0
+    while t + cue_ms <= duration * 1000:
+        start = SAMPLE_TEXT[(i * 7) % 20:]
+        text = f"{start[:12]}\n{start[12:24]}" if len(start) > 12 else start
+        subs.append(pysrt.SubRipItem(index=i + 1, start=pysrt.SubRipTime.from_ordinal(t), end=pysrt.SubRipTime.from_ordinal(t + cue_ms - 100), text=text))
+        t, i = t + cue_ms, i + 1
+    srt_path = os.path.join(work_dir, "subtitles.srt")
+    subs.save(srt_path, encoding='utf-8')
+
+    bg_path = os.path.join(work_dir, "background.jpg")
+    if not VideoCreationService.create_video_background(Config.DEFAULT_AVATAR_PATH, font_path, bg_path, "@benchmark", "benchmark"):
+        raise RuntimeError("生成背景图失败")
+    return bg_path, audio_path, srt_path, len(subs)
+
+def measure(label: str, func, *args):
+    before_wall, before_cpu = time.perf_counter(), os.times()
+    ok = func(*args)
+    after_wall, after_cpu = time.perf_counter(), os.times()
+    cpu = sum(after_cpu[i] - before_cpu[i] for i in range(4))
+    return {'mode': label, 'ok': ok, 'wall': after_wall - before_wall, 'cpu': cpu}
+
+def main():
+    parser = argparse.ArgumentParser(description="对比 libass 字幕滤镜与静态帧模式的编码耗时")
+    parser.add_argument("--duration", type=int, default=600, help="旁白时长（秒），默认10分钟")
+    parser.add_argument("--cue-seconds", type=float, default=3.0, help="每条字幕的时长（秒）")
+    parser.add_argument("--still-fps", type=int, default=5, help="静态帧模式下固定帧率的对照组")
+    parser.add_argument("--font", default=Config.DEFAULT_FONT_PATH, help="字体文件路径")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        bg_path, audio_path, srt_path, cue_count = build_fixture(work_dir, args.duration, args.cue_seconds, args.font)
+        print(f"旁白时长: {timedelta(seconds=args.duration)}，字幕条数: {cue_count}")
+
+        results = [
+            measure("subtitles 滤镜", VideoCreationService.create_video_with_ffmpeg, bg_path, audio_path, srt_path, args.font, os.path.join(work_dir, "filter.mp4"), False, None),
+            measure("静态帧(VFR)", VideoCreationService.create_video_with_still_frames, bg_path, audio_path, srt_path, args.font, os.path.join(work_dir, "still_vfr.mp4"), False, None),
+            measure(f"静态帧({args.still_fps}fps)", VideoCreationService.create_video_with_still_frames, bg_path, audio_path, srt_path, args.font, os.path.join(work_dir, "still_cfr.mp4"), False, None, None, args.still_fps),
+        ]
+
+    print(f"\n{'模式':<16}{'成功':<6}{'墙钟(s)':>10}{'CPU(s)':>10}")
+    for r in results:
+        print(f"{r['mode']:<16}{str(r['ok']):<6}{r['wall']:>10.2f}{r['cpu']:>10.2f}")
+    baseline = results[0]
+    for r in results[1:]:
+        if baseline['ok'] and r['ok'] and r['cpu'] > 0:
+            print(f"{r['mode']} 相对 {baseline['mode']}: CPU 时间加速 {baseline['cpu'] / r['cpu']:.1f}x，墙钟加速 {baseline['wall'] / r['wall']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import os
+import re
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+import traceback
+from datetime import timedelta
+
+import pysrt
+
+from core.services.video_service import VideoCreationService
+from core.utils import word_timing
+
+def legacy_process_subtitles(input_srt_path: str, output_srt_path: str, max_chars_per_line: int, max_lines_per_sub: int) -> bool:
+    if not os.path.exists(input_srt_path):
+        print(f"错误: 字幕文件 '{input_srt_path}' 不存在。")
+        return False
+    try:
+        subs = pysrt.open(input_srt_path, encoding='utf-8')
+        char_timestamps = []
+        full_text_list = []
+        for sub in subs:
+            text = sub.text_without_tags.strip().replace('\n', ' ')
+            if not text: continue
+
+            duration_ms = sub.end.ordinal - sub.start.ordinal
+            time_per_char = duration_ms / len(text) if len(text) > 0 else 0
+
+            for i, char in enumerate(text):
+                char_time = pysrt.SubRipTime.from_ordinal(sub.start.ordinal + int(i * time_per_char))
+                char_timestamps.append(char_time)
+
+            full_text_list.append(text)
+
+        full_text = "".join(full_text_list)
+        if not full_text:
+            print("警告: 字幕文件内容为空。")
+            with open(output_srt_path, 'w', encoding='utf-8') as f: pass
+            return True
+
+        clauses = re.split(r'([，。！？、,.:;!?])', full_text)
+        semantic_clauses = [clauses[i] + (clauses[i+1] if i + 1 < len(clauses) else '') for i in range(0, len(clauses), 2)]
+
+        final_lines = []
+        for clause in semantic_clauses:
+            clause = clause.strip()
+            if not clause: continue
+            while len(clause) > max_chars_per_line:
+                final_lines.append(clause[:max_chars_per_line])
+                clause = clause[max_chars_per_line:]
+            if clause:
+                final_lines.append(clause)
+
+        new_subs = pysrt.SubRipFile()
+        char_offset = 0
+        punctuation_marks = '，。！？、,.:;!?'
+
+        for i in range(0, len(final_lines), max_lines_per_sub):
+            text_block_lines = final_lines[i : i + max_lines_per_sub]
+            if len(text_block_lines) > 1 and len(text_block_lines[-1]) == 1 and text_block_lines[-1] in punctuation_marks:
+                punctuation = text_block_lines.pop()
+                text_block_lines[-1] += punctuation
+
+            new_text = '\n'.join(text_block_lines).strip()
+            if not new_text: continue
+
+            cleaned_text = new_text.lstrip(punctuation_marks)
+            text_length_for_sub = len("".join(text_block_lines))
+
+            if not cleaned_text:
+                char_offset += text_length_for_sub
+                continue
+
+            start_char_idx, end_char_idx = char_offset, char_offset + text_length_for_sub - 1
+
+            if start_char_idx >= len(char_timestamps) or end_char_idx >= len(char_timestamps):
+                continue
+
+            start_time, end_time = char_timestamps[start_char_idx], char_timestamps[end_char_idx]
+            if end_time < start_time:
+                end_time = start_time + timedelta(milliseconds=100)
+
+            new_subs.append(pysrt.SubRipItem(index=len(new_subs) + 1, start=start_time, end=end_time, text=cleaned_text))
+            char_offset += text_length_for_sub
+
+        for sub in new_subs:
+            lines = sub.text.split('\n')
+            if len(lines) == 2:
+                combined = "".join(lines)
+                if len(combined) <= max_chars_per_line:
+                    sub.text = combined
+                else:
+                    sub.text = f"{combined[:max_chars_per_line]}\n{combined[max_chars_per_line:]}"
+
+        new_subs.save(output_srt_path, encoding='utf-8')
+        return True
+    except Exception as e:
+        print(f"处理字幕时发生严重错误: {e}\n{traceback.format_exc()}")
+        return False
+
+
+def build_corpus(path: str, char_count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    alphabet = "的一是了我不人在他有这个上们来到时大地为子中你说生国年着就那和要她出也得里后自以会家可下而过天去能对小多然于心学么之都好看起发当没成只如事把还用第样道想作种开美总从无情己面最女但现前些所同日手又行意动方期它头经长儿回位分爱老因很给名法间斯知世什两次使身者被高已亲其进此话常与活正感"
+    marks = "，。！？、,.:;!? "
+    subs = pysrt.SubRipFile()
+    t, written = 0, 0
+    while written < char_count:
+        length = min(rng.randint(4, 40), char_count - written)
+        text = "".join(rng.choice(marks) if rng.random() < 0.12 else rng.choice(alphabet) for _ in range(length))
+        duration = rng.randint(150, 260) * length
+        subs.append(pysrt.SubRipItem(index=len(subs) + 1, start=pysrt.SubRipTime.from_ordinal(t), end=pysrt.SubRipTime.from_ordinal(t + duration), text=text))
+        t += duration + rng.choice([0, 0, 50, 400])
+        written += length
+    subs.save(path, encoding='utf-8')
+
+def measure(func, *args):
+    start = time.perf_counter()
+    ok = func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ok, elapsed, peak
+
+def check_regression(work_dir: str, seeds: int) -> int:
+    mismatches = 0
+    for seed in range(seeds):
+        src = os.path.join(work_dir, f"corpus_{seed}.srt")
+        build_corpus(src, 300 + seed * 37, seed)
+        for max_chars, max_lines in [(12, 2), (8, 1), (16, 3), (1, 2)]:
+            legacy_out, new_out = os.path.join(work_dir, "legacy.srt"), os.path.join(work_dir, "new.srt")
+            legacy_process_subtitles(src, legacy_out, max_chars, max_lines)
+            VideoCreationService.process_subtitles(src, new_out, max_chars, max_lines)
+            with open(legacy_out, 'rb') as a, open(new_out, 'rb') as b:
+                if a.read() != b.read():
+                    mismatches += 1
+                    print(f"输出不一致: seed={seed}, max_chars={max_chars}, max_lines={max_lines}")
+    return mismatches
+
+def process_from_sidecar(audio_path: str, output_srt_path: str, max_chars: int, max_lines: int) -> bool:
+    _, entries = word_timing.read_sidecar(word_timing.sidecar_path(audio_path))
+    return VideoCreationService.process_subtitles("", output_srt_path, max_chars, max_lines, entries)
+
+def main():
+    parser = argparse.ArgumentParser(description="对比 process_subtitles 新旧实现的耗时与峰值内存，并校验输出一致")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="字幕总字符数")
+    parser.add_argument("--seeds", type=int, default=25, help="回归语料的数量")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        mismatches = check_regression(work_dir, args.seeds)
+        print(f"回归语料校验: {args.seeds * 4} 组，不一致 {mismatches} 组")
+
+        print(f"\n{'字符数':>8}{'旧耗时(s)':>12}{'新耗时(s)':>12}{'时间戳文件(s)':>12}{'旧峰值(MB)':>12}{'新峰值(MB)':>12}{'时间戳一致':>8}")
+        for size in args.sizes:
+            src = os.path.join(work_dir, f"bench_{size}.srt")
+            build_corpus(src, size, size)
+            _, old_time, old_peak = measure(legacy_process_subtitles, src, os.path.join(work_dir, "legacy.srt"), 12, 2)
+            _, new_time, new_peak = measure(VideoCreationService.process_subtitles, src, os.path.join(work_dir, "new.srt"), 12, 2)
+            audio = os.path.join(work_dir, f"bench_{size}.mp3")
+            word_timing.write_sidecar(audio, "SentenceBoundary", ((s.start.ordinal, s.end.ordinal, s.text) for s in pysrt.open(src, encoding='utf-8')), src)
+            _, sidecar_time, _ = measure(process_from_sidecar, audio, os.path.join(work_dir, "sidecar.srt"), 12, 2)
+            with open(os.path.join(work_dir, "new.srt"), 'rb') as a, open(os.path.join(work_dir, "sidecar.srt"), 'rb') as b:
+                same = a.read() == b.read()
+            print(f"{size:>8}{old_time:>12.3f}{new_time:>12.3f}{sidecar_time:>12.3f}{old_peak / 2**20:>12.1f}{new_peak / 2**20:>12.1f}{str(same):>8}")
+
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
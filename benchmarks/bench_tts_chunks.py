@@ -0,0 +1,65 @@
+import io
+import time
+import asyncio
+import argparse
+
+import edge_tts
+from aiohttp import web
+
+from core.services.tts_service import TTSService
+from core.services.tts_backends import StandinTTSBackend
+from core.services.tts_standin import create_app
+
+SAMPLE_SENTENCES = ["今天我们来聊一聊如何建立自己的知识体系。", "很多人学了很多东西，却总觉得用不上！", "问题往往不在于学得不够多，而在于没有把知识串起来。",
+                    "第一步，是明确你真正关心的问题？", "第二步，是围绕这些问题持续积累素材。", "第三步，是定期复盘，把零散的笔记整理成自己的框架。"]
+
+def build_text(sentence_count: int) -> str:
+    return "".join(SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)] for i in range(sentence_count))
+
+async def run_benchmark(args):
+    runner = web.AppRunner(create_app(args.speed, args.chars_per_second, args.first_byte_ms))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    backend = StandinTTSBackend(f"http://127.0.0.1:{runner.addresses[0][1]}")
+
+    def stream_factory(text: str):
+        return backend.stream(text, "zh-CN-StandinXiaoNeural", "+0%", "+0%", "+0Hz")
+
+    text = build_text(args.sentences)
+    chunks = TTSService.split_sentences(text, args.chunk_chars)
+    print(f"文本长度: {len(text)} 字，句子数: {args.sentences}，分段数: {len(chunks)} (每段不超过 {args.chunk_chars} 字)")
+
+    results = []
+    for label, concurrency, chunk_list in [("整段单连接", 1, [text])] + [(f"分段并发x{c}", c, chunks) for c in args.concurrency]:
+        sub_maker, audio = edge_tts.SubMaker(), io.BytesIO()
+        start = time.perf_counter()
+        total_bytes = await TTSService.synthesize_chunked(chunk_list, stream_factory, concurrency, audio, sub_maker, bitrate_bps=backend.audio_bitrate_bps)
+        elapsed = time.perf_counter() - start
+        offsets = [cue.start for cue in sub_maker.cues]
+        audio_seconds = total_bytes * 8 / backend.audio_bitrate_bps
+        results.append({"mode": label, "wall": elapsed, "cues": len(sub_maker.cues), "audio": audio_seconds,
+                        "monotonic": offsets == sorted(offsets), "last_end": sub_maker.cues[-1].end.total_seconds() if sub_maker.cues else 0.0,
+                        "srt": sub_maker.get_srt()})
+
+    await runner.cleanup()
+
+    print(f"\n{'模式':<14}{'墙钟(s)':>10}{'字幕条数':>10}{'音频(s)':>10}{'末条结束(s)':>12}{'时间轴单调':>10}")
+    for r in results:
+        print(f"{r['mode']:<14}{r['wall']:>10.2f}{r['cues']:>10}{r['audio']:>10.2f}{r['last_end']:>12.2f}{str(r['monotonic']):>10}")
+    baseline = results[0]
+    for r in results[1:]:
+        same = "一致" if r["srt"] == baseline["srt"] else "不一致"
+        print(f"{r['mode']} 相对 {baseline['mode']}: 加速 {baseline['wall'] / r['wall']:.2f}x，合并后的字幕与整段合成{same}")
+
+def main():
+    parser = argparse.ArgumentParser(description="使用本地模拟TTS服务，对比整段合成与分段并发合成的耗时")
+    parser.add_argument("--sentences", type=int, default=120, help="测试文本的句子数")
+    parser.add_argument("--chunk-chars", type=int, default=300, help="每个分段的最大字数")
+    parser.add_argument("--concurrency", type=int, nargs='+', default=[1, 2, 4, 8], help="要测试的并发数，可指定多个")
+    parser.add_argument("--first-byte-ms", type=int, default=300, help="模拟服务的首包延迟（毫秒）")
+    parser.add_argument("--speed", type=float, default=44.0, help="模拟服务的合成速度（相对实时的倍数）")
+    parser.add_argument("--chars-per-second", type=float, default=4.5, help="模拟语速：每秒音频对应的字数")
+    asyncio.run(run_benchmark(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import os
+import socket
+import time
+import argparse
+import statistics
+import multiprocessing
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from core.config import Config
+from core.utils.channel_reader import ChannelReader
+from core.utils.message_channel import MessageChannel, channel_pair
+from core.utils.worker_pool import WorkerPool
+from core.utils.lazy_import import load_module
+
+def probe_task(modules):
+    for module_name in modules:
+        load_module(module_name)
+    return {'pid': os.getpid()}
+
+def spawn_probe_main(sock: socket.socket, task_id: str, modules):
+    channel = MessageChannel(sock)
+    channel.send(('progress', f"进程 {os.getpid()} 已启动，准备执行任务: {task_id}"))
+    try:
+        channel.send(('finished', 'success', probe_task(modules)))
+    except Exception as e:
+        channel.send(('finished', 'error', str(e)))
+    channel.close()
+
+def run_task(submit) -> dict:
+    loop = QEventLoop()
+    timings = {'start': time.perf_counter(), 'first_message': None, 'finished': None, 'status': None}
+
+    def on_progress(message: str):
+        if timings['first_message'] is None:
+            timings['first_message'] = time.perf_counter() - timings['start']
+
+    def on_finished(task_id: str, status: str, result):
+        timings['finished'] = time.perf_counter() - timings['start']
+        timings['status'] = status
+        loop.quit()
+
+    worker = submit(on_progress, on_finished)
+    QTimer.singleShot(120_000, loop.quit)
+    loop.exec_()
+    timings['worker'] = worker
+    return timings
+
+def measure_spawn_per_task(count: int, modules) -> list:
+    results = []
+    for index in range(count):
+        task_id = f"probe_{index}"
+
+        def submit(on_progress, on_finished):
+            parent_sock, child_sock = channel_pair()
+            reader = ChannelReader(parent_sock)
+            done = []
+
+            def on_message(message: tuple):
+                if message[0] == 'progress':
+                    on_progress(message[1])
+                elif not done:
+                    done.append(True)
+                    on_finished(task_id, message[1], message[2])
+
+            reader.message.connect(on_message)
+            reader.closed.connect(lambda: done or on_finished(task_id, 'error', '子进程意外终止。'))
+            process = multiprocessing.Process(target=spawn_probe_main, args=(child_sock, task_id, modules))
+            process.start()
+            child_sock.close()
+            return reader, process
+
+        timings = run_task(submit)
+        reader, process = timings['worker']
+        reader.close()
+        process.join(timeout=5)
+        results.append(timings)
+    return results
+
+def measure_pool(count: int, modules, size: int) -> tuple:
+    pool = WorkerPool(size=size, max_tasks=0, max_memory_growth=0, preload_modules=modules)
+    ready, loop = [], QEventLoop()
+    pool.worker_ready.connect(lambda pid, seconds: (ready.append(seconds), len(ready) >= size and loop.quit()))
+    warm_start = time.perf_counter()
+    pool.start()
+    loop.exec_()
+    warmup = time.perf_counter() - warm_start
+
+    results = []
+    for index in range(count):
+        def submit(on_progress, on_finished):
+            task = pool.submit(f"probe_{index}", probe_task, modules)
+            task.progress.connect(on_progress)
+            task.finished.connect(on_finished)
+            return task
+        results.append(run_task(submit))
+    pool.shutdown()
+    return results, warmup
+
+def summarize(label: str, results: list):
+    finished = [r['finished'] for r in results if r['status'] == 'success']
+    first = [r['first_message'] for r in results if r['first_message'] is not None]
+    if not finished:
+        print(f"{label:<16}全部失败")
+        return None
+    print(f"{label:<16}{len(finished):>6}{statistics.median(first) * 1000:>14.1f}{statistics.median(finished) * 1000:>14.1f}{max(finished) * 1000:>14.1f}")
+    return statistics.median(finished)
+
+def main():
+    parser = argparse.ArgumentParser(description="对比每个任务新建子进程与常驻预热进程池的任务启动延迟")
+    parser.add_argument("--tasks", type=int, default=5, help="每种模式顺序执行的任务数")
+    parser.add_argument("--pool-size", type=int, default=1, help="进程池大小")
+    parser.add_argument("--start-method", choices=multiprocessing.get_all_start_methods(), default="spawn", help="子进程启动方式（Windows/macOS 默认为 spawn）")
+    args = parser.parse_args()
+
+    multiprocessing.set_start_method(args.start_method, force=True)
+    app = QCoreApplication([])
+    modules = Config.WORKER_PRELOAD_MODULES
+    print(f"启动方式: {args.start_method}，任务需要的模块: {', '.join(modules)}")
+
+    spawn_results = measure_spawn_per_task(args.tasks, modules)
+    pool_results, warmup = measure_pool(args.tasks, modules, args.pool_size)
+
+    print(f"\n{'模式':<16}{'成功数':>6}{'首条消息(ms)':>14}{'完成中位(ms)':>14}{'完成最大(ms)':>14}")
+    spawn_median = summarize("每任务新建进程", spawn_results)
+    pool_median = summarize("预热进程池", pool_results)
+    print(f"\n进程池预热耗时: {warmup * 1000:.1f}ms（应用启动时在后台完成一次）")
+    if spawn_median and pool_median:
+        print(f"预热进程池相对每任务新建进程: 任务启动延迟降低 {spawn_median / pool_median:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -2,43 +2,87 @@ import os
 import re
 import json
 from datetime import datetime
-from typing import Callable, Any, Optional
+from typing import Callable, Any, Dict, List
 
-from PyQt5.QtCore import QObject, pyqtSlot
+from PyQt5.QtCore import QObject, QTimer, pyqtSlot
 from PyQt5.QtWidgets import QMessageBox
 
 from .utils.chromedriver_downloader import ChromedriverDownloader
-from .utils.process_worker import ProcessWorker
-from .services.tts_service import TTSService, TaskSignals, AsyncioRunner
+from .utils.worker_pool import WorkerPool
+from .utils.job_scheduler import JobScheduler
+from .utils.job_store import JobStore
+from .utils.telemetry import MetricsExporter
+from .utils.progress import format_seconds
+from .services.tts_service import TTSService
+from .services.task_signals import AsyncioRunner, TaskSignals
+from .services.tts_queue import TTSJobQueue
 from .services.doubao_service import DoubaoProvider
 from .services.video_service import VideoCreationService
+from .config import Config
 
 class AppController(QObject):
+    JOB_RESOURCES = {'doubao': {'browser': 1}, 'video_generation': {'ffmpeg': 1}}
+
     def __init__(self, view: 'VideoWorkflowApp'):
         super().__init__()
         self.view = view
-        self.worker: Optional[ProcessWorker] = None
+        self.worker_pool = WorkerPool(max_size=Config.WORKER_POOL_MAX_SIZE)
+        self.scheduler = JobScheduler(self.worker_pool)
+        self.scheduler.job_progress.connect(lambda job_id, message: self.view.update_status(message))
+        self.scheduler.job_event.connect(self.on_process_event)
+        self.scheduler.job_finished.connect(self.on_process_finished)
+        self.scheduler.jobs_changed.connect(lambda: self.view.update_job_list(self.scheduler.active_jobs()))
+        self.job_store = JobStore()
+        self.metrics_exporter = MetricsExporter(rotate=True)
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.export_metrics)
         self.chromedriver_downloader = ChromedriverDownloader(status_callback=self.view.update_status, error_callback=self.view.on_task_error)
 
         self.async_runner = AsyncioRunner()
-        self.async_runner.start()
 
         self.task_signals = TaskSignals()
         self.tts_service = TTSService(self.async_runner, self.task_signals)
+        self.tts_queue = TTSJobQueue(self.tts_service, self.task_signals)
+        self._tts_results: Dict[str, List] = {'succeeded': [], 'failed': []}
 
         self.task_signals.voices_ready.connect(self.view.on_voices_loaded)
         self.task_signals.voices_error.connect(self.view.on_task_error)
         self.task_signals.tts_finished.connect(self.on_tts_finished)
         self.task_signals.tts_error.connect(self.view.on_task_error)
         self.task_signals.task_progress.connect(self.view.update_status)
+        self.task_signals.video_finished.connect(self.on_text_to_video_finished)
+        self.task_signals.tts_job_progress.connect(self.on_tts_job_progress)
+        self.task_signals.tts_job_finished.connect(self.on_tts_job_finished)
+        self.task_signals.tts_job_error.connect(self.on_tts_job_error)
+        self.task_signals.tts_queue_changed.connect(self.on_tts_queue_changed)
 
     def start_app(self):
+        self.async_runner.start()
+        self.worker_pool.start()
         self.tts_service.fetch_voices()
+        self.tts_queue.set_concurrency(self.view.tts_queue_spinbox.value())
+        if Config.TELEMETRY_ENABLED:
+            self.metrics_timer.start(Config.TELEMETRY_EXPORT_INTERVAL_MS)
+        resumable = self._resumable_jobs()
+        if resumable:
+            self.view.update_status(f"发现 {len(resumable)} 个未完成的视频任务，可点击“恢复未完成任务”继续。", 10000)
 
     def stop_app(self):
+        self.worker_pool.shutdown()
         self.async_runner.stop_loop()
+        self.metrics_timer.stop()
+        if Config.TELEMETRY_ENABLED:
+            self.export_metrics()
+
+    @pyqtSlot()
+    def export_metrics(self):
+        try:
+            self.metrics_exporter.refresh()
+            self.metrics_exporter.write_prometheus()
+        except OSError as e:
+            print(f"警告: 导出指标快照失败: {e}")
 
-    def _execute_process_task(self, task_id: str, target_func: Callable, *args, **kwargs):
+    def _execute_process_task(self, task_id: str, title: str, target_func: Callable, *args, priority: int = JobScheduler.PRIORITY_NORMAL, **kwargs):
         is_selenium_task = "doubao" in task_id
         if is_selenium_task:
             self.view.update_status("正在准备 ChromeDriver...")
@@ -52,14 +96,13 @@ class AppController(QObject):
         else:
             new_args = args
 
-        self.view.set_ui_enabled(False)
-        self.worker = ProcessWorker(task_id, target_func, *new_args, **kwargs)
-        self.worker.progress.connect(self.view.update_status)
-        self.worker.finished.connect(self.on_process_finished)
-        self.worker.run()
+        resources = self.JOB_RESOURCES.get('doubao' if is_selenium_task else task_id, {})
+        self.scheduler.submit(task_id, title, target_func, new_args, kwargs, resources, priority)
 
     @pyqtSlot(str, str, object)
-    def on_process_finished(self, task_id: str, status: str, result: Any):
+    def on_process_finished(self, job_id: str, status: str, result: Any):
+        job = self.scheduler.jobs[job_id]
+        task_id = job['kind']
         if status == 'success':
             if task_id == 'doubao_login':
                 self.view.update_status("登录流程结束！您的登录信息已保存。", 5000)
@@ -68,12 +111,30 @@ class AppController(QObject):
                 task_type = task_id.split('_')[-1]
                 self.on_doubao_task_finished(task_type, result.get("text", ""))
             elif task_id == 'video_generation':
-                self.on_video_finished(result)
+                self.on_video_finished(result['video_output'])
+        elif status == 'cancelled':
+            store_job_id = job['kwargs'].get('job_id')
+            if store_job_id:
+                self.job_store.update_job(store_job_id, 'cancelled')
+            self.view.update_status(f"任务 '{job['title']}' 已取消。", 5000)
         else:
-            self.view.on_task_error(f"任务 '{task_id}' 失败: {result}")
+            self.view.on_task_error(f"任务 '{job['title']}' 失败: {result}")
 
-        self.view.set_ui_enabled(True)
-        self.worker = None
+    @pyqtSlot(str, dict)
+    def on_process_event(self, job_id: str, event: dict):
+        if event.get('type') != 'ffmpeg_progress':
+            return
+        parts = ["正在合成视频"]
+        if event.get('percent') is not None:
+            parts.append(f"{event['percent']:.1f}%")
+        if event.get('speed'):
+            parts.append(f"速度 {event['speed']:.2f}x")
+        if event.get('fps'):
+            parts.append(f"{event['fps']:.0f} fps")
+        if event.get('eta') is not None:
+            parts.append(f"剩余 {format_seconds(event['eta'])}")
+        self.scheduler.set_message(job_id, " | ".join(parts[1:]))
+        self.view.update_status(" | ".join(parts))
 
     @pyqtSlot()
     def on_login_clicked(self):
@@ -81,41 +142,25 @@ class AppController(QObject):
             QMessageBox.critical(self.view, "依赖缺失", "需要安装 Selenium 才能使用此功能。")
             return
         QMessageBox.information(self.view, "开始登录", "即将打开浏览器以登录「豆包」网站。\n\n请在打开的浏览器窗口中完成登录操作（如扫码）。\n\n登录成功后，请【手动关闭】该浏览器窗口以继续。您的登录状态会被保存。")
-        self._execute_process_task('doubao_login', DoubaoProvider.login)
+        self._execute_process_task('doubao_login', "登录豆包", DoubaoProvider.login, priority=JobScheduler.PRIORITY_INTERACTIVE)
 
     @pyqtSlot(str)
     def on_doubao_action_clicked(self, task_type: str):
         if not self.view.selenium_available:
             QMessageBox.critical(self.view, "依赖缺失", "需要安装 Selenium 才能使用此功能。")
             return
-        prompt_templates = {
-            'extract': '1. 提取完整的视频文案，输出内容中禁止出现换行符和英文双引号，视频分享链接：【{link}】；\n\n2. 基于提取出的文案，严格按照以下JSON格式返回，禁止包含任何Markdown标记：{{"content": "这里是提取出的完整文案，禁止出现视频分享链接相关的信息", "cover_title": "这里是根据文案生成的4个字的封面主标题", "cover_subtitle": "这里是根据文案生成的10个字的封面副标题"}}\n\n3. 仅输出JSON内容。',
-            'process': '1. 请对以下文案进行这项操作：“{instruction}”，输出内容中禁止出现换行符和英文双引号，原始文案是：【{text}】。\n\n2. 处理完成后，严格按照以下JSON格式返回，禁止包含任何Markdown标记：{{"content": "这里是处理后的文案", "cover_title": "这里是根据新文案生成的4个字的封面主标题", "cover_subtitle": "这里是根据新文案生成的10个字的封面副标题"}}\n\n3. 仅输出JSON内容。'
-        }
-        prompt = ""
-        if task_type == 'extract':
-            link = self.view.douyin_link_edit.text().strip()
-            if not link: QMessageBox.warning(self.view, "警告", "请输入抖音视频分享链接！"); return
-            prompt = prompt_templates['extract'].format(link=link)
-            self.view.update_status("正在提取文案并生成标题...")
-        else:
-            text = self.view.text_edit.toPlainText().strip()
-            if not text: QMessageBox.warning(self.view, "警告", "文本框内没有内容！"); return
-            if task_type == 'original':
-                instruction = "对文案进行深度去重和二创，使其更具原创性，风格保持不变"
-                prompt = prompt_templates['process'].format(instruction=instruction, text=text)
-                self.view.update_status("正在进行一键原创并生成新标题...")
-            elif task_type == 'translate':
-                lang_name = self.view.translate_lang_combo.currentText()
-                if not lang_name: QMessageBox.warning(self.view, "警告", "请选择目标翻译语言！"); return
-                instruction = f"将文案翻译成{lang_name}"
-                prompt = prompt_templates['process'].format(instruction=instruction, text=text)
-                self.view.update_status(f"正在翻译为 {lang_name} 并生成新标题...")
-        if prompt: self._execute_process_task(f'doubao_task_{task_type}', DoubaoProvider.get_content, prompt_text=prompt)
+        lang_name = self.view.translate_lang_combo.currentText()
+        try:
+            prompt = DoubaoProvider.build_prompt(task_type, link=self.view.douyin_link_edit.text().strip(), text=self.view.text_edit.toPlainText().strip(), language=lang_name)
+        except ValueError as e:
+            QMessageBox.warning(self.view, "警告", str(e))
+            return
+        status_messages = {'extract': "正在提取文案并生成标题...", 'original': "正在进行一键原创并生成新标题...", 'translate': f"正在翻译为 {lang_name} 并生成新标题..."}
+        self.view.update_status(status_messages[task_type])
+        self._execute_process_task(f'doubao_task_{task_type}', f"豆包{DoubaoProvider.TASK_NAMES[task_type]}", DoubaoProvider.get_content, priority=JobScheduler.PRIORITY_INTERACTIVE, prompt_text=prompt)
 
     def on_doubao_task_finished(self, task_type: str, text: str):
-        task_name_map = {'extract': '文案提取', 'original': '一键原创', 'translate': '一键翻译'}
-        task_name = task_name_map.get(task_type, "操作")
+        task_name = DoubaoProvider.TASK_NAMES.get(task_type, "操作")
         json_match = re.search(r'\{.*\}', text, re.DOTALL)
         if not json_match:
             self.view.text_edit.setText(text)
@@ -143,10 +188,81 @@ class AppController(QObject):
         except OSError as e:
             QMessageBox.critical(self.view, "错误", f"创建输出目录 '{params['output_dir']}' 失败:\n{e}")
             return
+        self._submit_tts_job(params, params['text'], self._unique_audio_path(params['output_dir']))
+
+    @pyqtSlot()
+    def on_batch_audio_clicked(self):
+        file_paths = self.view.select_batch_text_files()
+        if not file_paths: return
+        params = self.view.get_tts_parameters(require_text=False)
+        if not params: return
+        try:
+            os.makedirs(params['output_dir'], exist_ok=True)
+        except OSError as e:
+            QMessageBox.critical(self.view, "错误", f"创建输出目录 '{params['output_dir']}' 失败:\n{e}")
+            return
+        submitted = 0
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    text = f.read().strip()
+            except (OSError, UnicodeDecodeError) as e:
+                self._tts_results['failed'].append(f"{os.path.basename(file_path)}: 无法读取文件: {e}")
+                continue
+            if not text:
+                continue
+            self._submit_tts_job(params, text, self._unique_audio_path(params['output_dir'], os.path.splitext(os.path.basename(file_path))[0]))
+            submitted += 1
+        self.view.update_status(f"已将 {submitted} 个文本加入配音队列。", 5000)
+
+    def _unique_audio_path(self, output_dir: str, label: str = "") -> str:
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        audio_path = os.path.abspath(os.path.join(params['output_dir'], f"audio_{timestamp}.mp3"))
-        self.view.set_ui_enabled(False)
-        self.tts_service.run_tts(params['text'], params['voice'], params['rate'], params['volume'], params['pitch'], params['generate_srt'], audio_path)
+        stem = f"audio_{timestamp}_{label}" if label else f"audio_{timestamp}"
+        taken = set(self.tts_queue.pending_paths())
+        audio_path, index = os.path.abspath(os.path.join(output_dir, f"{stem}.mp3")), 2
+        while audio_path in taken or os.path.exists(audio_path):
+            audio_path = os.path.abspath(os.path.join(output_dir, f"{stem}_{index}.mp3"))
+            index += 1
+        return audio_path
+
+    def _submit_tts_job(self, params: Dict[str, Any], text: str, audio_path: str):
+        job_id = self.tts_queue.submit(text, params['voice'], params['rate'], params['volume'], params['pitch'], params['generate_srt'], audio_path, params['concurrency'], params['incremental'])
+        self.view.update_status(f"[任务 {job_id}] 已加入配音队列: {os.path.basename(audio_path)}", 5000)
+
+    @pyqtSlot(str, str)
+    def on_tts_job_progress(self, job_id: str, message: str):
+        self.view.update_status(f"[任务 {job_id}] {message}")
+
+    @pyqtSlot(str, str, str)
+    def on_tts_job_finished(self, job_id: str, audio_path: str, srt_path: str):
+        self._tts_results['succeeded'].append((audio_path, srt_path))
+        self.view.last_audio_file = audio_path
+        self.view.last_srt_file = srt_path
+        self.view.update_audio_player_source()
+        self.view.update_status(f"[任务 {job_id}] 生成完成: {os.path.basename(audio_path)}", 5000)
+
+    @pyqtSlot(str, str)
+    def on_tts_job_error(self, job_id: str, error_msg: str):
+        self._tts_results['failed'].append(f"任务 {job_id}: {error_msg}")
+        self.view.update_status(f"[任务 {job_id}] {error_msg}", 10000)
+
+    @pyqtSlot(int, int)
+    def on_tts_queue_changed(self, running: int, pending: int):
+        self.view.tts_queue_label.setText(f"配音队列: 进行中 {running} / 等待 {pending}")
+        if running or pending:
+            return
+        succeeded, failed = self._tts_results['succeeded'], self._tts_results['failed']
+        self._tts_results = {'succeeded': [], 'failed': []}
+        if failed and not succeeded and len(failed) == 1:
+            self.view.on_task_error(failed[0])
+        elif failed:
+            QMessageBox.warning(self.view, "部分任务失败", f"配音队列已完成: 成功 {len(succeeded)} 个，失败 {len(failed)} 个。\n\n" + "\n".join(failed))
+        elif len(succeeded) == 1:
+            self.on_tts_finished(*succeeded[0])
+        elif succeeded:
+            output_directory = os.path.dirname(succeeded[-1][0])
+            self.view.update_status(f"配音队列已完成，共 {len(succeeded)} 个音频。", 5000)
+            QMessageBox.information(self.view, "生成成功", f"{len(succeeded)} 个音频已全部生成，保存在目录:\n{output_directory}")
 
     @pyqtSlot(str, str)
     def on_tts_finished(self, audio_path: str, srt_path: str):
@@ -168,7 +284,61 @@ class AppController(QObject):
     def on_generate_video_clicked(self):
         params = self.view.get_video_parameters()
         if not params: return
-        self._execute_process_task('video_generation', VideoCreationService.run_generation_workflow, params=params)
+        queued_outputs = {job['kwargs'].get('params', {}).get('video_output') for job in self.scheduler.jobs.values()}
+        stem, index = os.path.splitext(params['video_output'])[0], 2
+        while params['video_output'] in queued_outputs:
+            params['video_output'] = f"{stem}_{index}.mp4"
+            index += 1
+        title = f"生成视频 {os.path.basename(params['video_output'])}"
+        self._execute_process_task('video_generation', title, VideoCreationService.run_generation_workflow, params=params,
+                                   job_id=self.job_store.create_job('video_generation', title, params))
+        self.view.update_status(f"已加入任务列表: {os.path.basename(params['video_output'])}", 5000)
+
+    def _resumable_jobs(self) -> List[Dict[str, Any]]:
+        active = {job['kwargs'].get('job_id') for job in self.scheduler.jobs.values()}
+        return [job for job in self.job_store.list_jobs(('queued', 'running', 'failed', 'cancelled'), 'video_generation') if job['job_id'] not in active]
+
+    @pyqtSlot()
+    def on_resume_jobs_clicked(self):
+        resumable = self._resumable_jobs()
+        if not resumable:
+            self.view.update_status("没有需要恢复的任务。", 5000)
+            return
+        for job in resumable:
+            self.job_store.requeue(job['job_id'])
+            self._execute_process_task('video_generation', job['title'], VideoCreationService.run_generation_workflow, params=job['params'], job_id=job['job_id'])
+        self.view.update_status(f"已恢复 {len(resumable)} 个任务，已完成的步骤将被跳过。", 5000)
+
+    @pyqtSlot()
+    def on_cancel_job_clicked(self):
+        job_id = self.view.selected_job_id()
+        job = self.scheduler.jobs.get(job_id) if job_id else None
+        if job is None:
+            self.view.update_status("请先在任务列表中选择要取消的任务。", 5000)
+            return
+        if self.scheduler.cancel(job_id):
+            return
+        store_job_id = job['kwargs'].get('job_id')
+        if not store_job_id:
+            QMessageBox.information(self.view, "无法取消", f"任务 '{job['title']}' 正在运行，不支持中途取消。")
+            return
+        self.job_store.request_cancel(store_job_id)
+        self.scheduler.set_message(job_id, "正在取消...")
+        self.view.update_status(f"已请求取消任务 '{job['title']}'，将在当前步骤安全停止。", 5000)
+
+    @pyqtSlot()
+    def on_text_to_video_clicked(self):
+        tts_params = self.view.get_tts_parameters()
+        if not tts_params: return
+        video_params = self.view.get_video_parameters(require_media=False)
+        if not video_params: return
+        self.view.set_ui_enabled(False)
+        self.tts_service.run_text_to_video(tts_params['text'], tts_params['voice'], tts_params['rate'], tts_params['volume'], tts_params['pitch'], video_params, tts_params['concurrency'])
+
+    @pyqtSlot(str)
+    def on_text_to_video_finished(self, video_path: str):
+        self.view.set_ui_enabled(True)
+        self.on_video_finished(video_path)
 
     @pyqtSlot(str)
     def on_video_finished(self, video_path: str):
@@ -12,8 +12,65 @@ class Config:
     MUSICS_DIR = os.path.join(ASSETS_DIR, "musics")
     OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
     DOUBAO_USER_DATA_DIR = os.path.join(PROJECT_ROOT, "doubao_user_data")
+    CACHE_DIR = os.path.join(PROJECT_ROOT, "cache")
+    RENDER_CACHE_DIR = os.path.join(CACHE_DIR, "renders")
+    RENDER_CACHE_MAX_BYTES = 512 * 1024 * 1024
+    AUDIO_CACHE_DIR = os.path.join(CACHE_DIR, "audio")
+    AUDIO_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+    TTS_CHUNK_MAX_CHARS = 300
+    TTS_CACHE_DIR = os.path.join(CACHE_DIR, "tts")
+    TTS_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+    TTS_BACKEND = os.environ.get("TTS_BACKEND", "edge")
+    TTS_STANDIN_URL = os.environ.get("TTS_STANDIN_URL", "http://127.0.0.1:8765")
+    TTS_RATE_LIMIT_PER_HOST = 4.0
+    TTS_RATE_LIMIT_BURST = 8
+    TTS_QUEUE_CONCURRENCY = 2
+    TTS_MAX_RETRIES = 4
+    TTS_RETRY_BASE_DELAY = 1.0
+    TTS_RETRY_MAX_DELAY = 30.0
+
+    SCHEDULER_SLOTS = {"browser": 1, "ffmpeg": max(1, (os.cpu_count() or 1) // 2)}
+    WORKER_POOL_SIZE = 2
+    WORKER_POOL_MAX_SIZE = sum(SCHEDULER_SLOTS.values())
+    WORKER_MAX_TASKS = 20
+    WORKER_MAX_MEMORY_GROWTH = 512 * 1024 * 1024
+    WORKER_SPAWN_RETRIES = 5
+    WORKER_SPAWN_RETRY_DELAY = 0.5
+    RENDER_MODULES = ["PIL.Image", "PIL.ImageDraw", "PIL.ImageFont", "PIL.ImageFilter", "pysrt"]
+    WORKER_PRELOAD_MODULES = RENDER_MODULES + ["core.services.video_service", "core.services.doubao_service"]
+
+    TELEMETRY_ENABLED = os.environ.get("TELEMETRY", "1") != "0"
+    TELEMETRY_DIR = os.path.join(PROJECT_ROOT, "telemetry")
+    TELEMETRY_EVENTS_FILE = os.path.join(TELEMETRY_DIR, "events.jsonl")
+    TELEMETRY_METRICS_FILE = os.path.join(TELEMETRY_DIR, "metrics.prom")
+    TELEMETRY_MAX_BYTES = 16 * 1024 * 1024
+    TELEMETRY_EXPORT_INTERVAL_MS = 15000
+
+    JOBS_DIR = os.path.join(PROJECT_ROOT, "jobs")
+    JOB_STORE_FILE = os.path.join(JOBS_DIR, "jobs.sqlite3")
+
+    API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+    API_PORT = int(os.environ.get("API_PORT", "8787"))
+    API_JOBS_DIR = os.path.join(OUTPUT_DIR, "api")
+    API_SLOTS = {"tts": TTS_QUEUE_CONCURRENCY, "browser": SCHEDULER_SLOTS["browser"], "ffmpeg": SCHEDULER_SLOTS["ffmpeg"]}
+    API_MAX_QUEUED = 64
+    API_RETRY_AFTER = 5
+    API_JOB_HISTORY = 1000
+    API_EVENT_HISTORY = 500
+    API_LONG_POLL_TIMEOUT = 30.0
+    API_SSE_KEEPALIVE = 15.0
+    API_WORKER_START_METHOD = "spawn"
+    API_WORKER_PRELOAD_MODULES = WORKER_PRELOAD_MODULES + ["core.services.job_api"]
+
+    FARM_LEASE_SECONDS = 60.0
+    FARM_HEARTBEAT_INTERVAL = 10.0
+    FARM_POLL_INTERVAL = 2.0
+    FARM_MAX_ATTEMPTS = 3
 
     VOICES_CACHE_FILE = os.path.join(PROJECT_ROOT, "voices.json")
+    VOICES_CACHE_TTL = 7 * 24 * 3600
+    VOICES_REFRESH_RETRY_INTERVAL = 10 * 60
     CONFIG_FILE = os.path.join(PROJECT_ROOT, "config.json")
     TRANSLATE_FILE = os.path.join(PROJECT_ROOT, "translate.json")
 
@@ -0,0 +1,122 @@
+import os
+import csv
+import json
+import time
+import traceback
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+
+from ..config import Config
+from .video_service import VideoCreationService
+
+class BatchRenderService:
+    PATH_FIELDS = ['avatar', 'font', 'audio', 'srt', 'bgm', 'video_output']
+    REQUIRED_FIELDS = ['audio', 'srt']
+
+    @staticmethod
+    def _parse_bool(value: Any) -> bool:
+        if isinstance(value, bool):
+            return value
+        return str(value).strip().lower() in ('1', 'true', 'yes', 'y', 'on')
+
+    @staticmethod
+    def _read_manifest_rows(manifest_path: str) -> List[Dict[str, Any]]:
+        rows = []
+        if manifest_path.lower().endswith('.csv'):
+            with open(manifest_path, 'r', encoding='utf-8-sig', newline='') as f:
+                rows.extend(dict(row) for row in csv.DictReader(f))
+        else:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    try:
+                        rows.append(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"清单第 {line_no} 行不是有效的JSON: {e}")
+        return rows
+
+    @staticmethod
+    def params_from_row(row: Dict[str, Any], base_dir: str, default_output: str, use_gpu: bool = False, still_frames: bool = False, segments: int = 1, segment_seconds: Optional[float] = None) -> Dict[str, Any]:
+        row_gpu, row_still = row.get('use_gpu'), row.get('still_frames')
+        row_segments, row_segment_seconds = row.get('segments'), row.get('segment_seconds')
+        params = {
+            'avatar': row.get('avatar') or Config.DEFAULT_AVATAR_PATH,
+            'font': row.get('font') or Config.DEFAULT_FONT_PATH,
+            'audio': row.get('audio') or '',
+            'srt': row.get('srt') or '',
+            'author': row.get('author') or '',
+            'subtext': row.get('subtext') or '',
+            'cover_title': row.get('cover_title') or '',
+            'cover_subtitle': row.get('cover_subtitle') or '',
+            'bgm': row.get('bgm') or '',
+            'use_gpu': BatchRenderService._parse_bool(use_gpu if row_gpu in (None, '') else row_gpu),
+            'still_frames': BatchRenderService._parse_bool(still_frames if row_still in (None, '') else row_still),
+            'segments': segments if row_segments in (None, '') else int(row_segments),
+            'segment_seconds': segment_seconds if row_segment_seconds in (None, '') else float(row_segment_seconds),
+            'video_output': row.get('video_output') or default_output,
+        }
+        for key in BatchRenderService.PATH_FIELDS:
+            if params[key]:
+                params[key] = os.path.abspath(os.path.join(base_dir, params[key]))
+
+        for key in BatchRenderService.REQUIRED_FIELDS:
+            if not params[key]:
+                raise ValueError(f"任务缺少必填字段 '{key}'。")
+        return params
+
+    @staticmethod
+    def load_manifest(manifest_path: str, output_dir: str, use_gpu: bool = False, still_frames: bool = False, segments: int = 1, segment_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
+        base_dir = os.path.dirname(os.path.abspath(manifest_path))
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        jobs = []
+        for index, row in enumerate(BatchRenderService._read_manifest_rows(manifest_path), 1):
+            default_output = os.path.join(output_dir, f"video_{timestamp}_{index:04d}.mp4")
+            try:
+                params = BatchRenderService.params_from_row(row, base_dir, default_output, use_gpu, still_frames, segments, segment_seconds)
+            except ValueError as e:
+                raise ValueError(f"清单第 {index} 条{e}")
+            jobs.append({'job_id': str(row.get('job_id') or row.get('name') or index), 'params': params})
+        return jobs
+
+    @staticmethod
+    def render_job(job_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            os.makedirs(os.path.dirname(params['video_output']), exist_ok=True)
+            result = VideoCreationService.run_generation_workflow(params)
+            return {'job_id': job_id, 'status': 'success', 'result': result, 'elapsed': time.perf_counter() - start}
+        except Exception as e:
+            return {'job_id': job_id, 'status': 'error', 'error': f"{e}\n{traceback.format_exc()}", 'elapsed': time.perf_counter() - start}
+
+    @staticmethod
+    def run_batch(jobs: List[Dict[str, Any]], workers: Optional[int] = None) -> Dict[str, Any]:
+        workers = workers or os.cpu_count() or 1
+        results = []
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(BatchRenderService.render_job, job['job_id'], job['params']) for job in jobs]
+            for future in as_completed(futures):
+                job_result = future.result()
+                results.append(job_result)
+                if job_result['status'] == 'success':
+                    print(f"[{len(results)}/{len(jobs)}] 任务 {job_result['job_id']} 完成，耗时 {job_result['elapsed']:.2f}s -> {job_result['result']['video_output']}")
+                else:
+                    print(f"[{len(results)}/{len(jobs)}] 任务 {job_result['job_id']} 失败，耗时 {job_result['elapsed']:.2f}s\n{job_result['error']}")
+
+        wall_time = time.perf_counter() - start
+        succeeded = sum(1 for r in results if r['status'] == 'success')
+        realtime_factors = [r['result']['encode_stats']['realtime_factor'] for r in results if r['status'] == 'success' and r['result']['encode_stats'].get('realtime_factor')]
+        return {
+            'workers': workers,
+            'total': len(jobs),
+            'succeeded': succeeded,
+            'failed': len(jobs) - succeeded,
+            'wall_time': wall_time,
+            'job_time_total': sum(r['elapsed'] for r in results),
+            'clips_per_hour': succeeded * 3600 / wall_time if wall_time > 0 else 0.0,
+            'avg_realtime_factor': sum(realtime_factors) / len(realtime_factors) if realtime_factors else None,
+            'jobs': results,
+        }
@@ -4,21 +4,43 @@ import traceback
 from typing import Dict, Any
 
 from ..config import Config
-
-try:
-    from selenium import webdriver
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.common.keys import Keys
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.common.action_chains import ActionChains
-    from selenium.webdriver.support import expected_conditions as EC
-    from selenium.common.exceptions import TimeoutException, WebDriverException
-except ImportError:
-    pass
+from ..utils import telemetry
 
 class DoubaoProvider:
+    TASK_NAMES = {'extract': '文案提取', 'original': '一键原创', 'translate': '一键翻译'}
+    PROMPT_TEMPLATES = {
+        'extract': '1. 提取完整的视频文案，输出内容中禁止出现换行符和英文双引号，视频分享链接：【{link}】；\n\n2. 基于提取出的文案，严格按照以下JSON格式返回，禁止包含任何Markdown标记：{{"content": "这里是提取出的完整文案，禁止出现视频分享链接相关的信息", "cover_title": "这里是根据文案生成的4个字的封面主标题", "cover_subtitle": "这里是根据文案生成的10个字的封面副标题"}}\n\n3. 仅输出JSON内容。',
+        'process': '1. 请对以下文案进行这项操作：“{instruction}”，输出内容中禁止出现换行符和英文双引号，原始文案是：【{text}】。\n\n2. 处理完成后，严格按照以下JSON格式返回，禁止包含任何Markdown标记：{{"content": "这里是处理后的文案", "cover_title": "这里是根据新文案生成的4个字的封面主标题", "cover_subtitle": "这里是根据新文案生成的10个字的封面副标题"}}\n\n3. 仅输出JSON内容。'
+    }
+
+    @staticmethod
+    def build_prompt(task_type: str, link: str = "", text: str = "", language: str = "") -> str:
+        if task_type == 'extract':
+            if not link:
+                raise ValueError("请输入抖音视频分享链接！")
+            return DoubaoProvider.PROMPT_TEMPLATES['extract'].format(link=link)
+        if task_type not in ('original', 'translate'):
+            raise ValueError(f"未知的豆包任务类型: {task_type}")
+        if not text:
+            raise ValueError("文本框内没有内容！")
+        if task_type == 'original':
+            instruction = "对文案进行深度去重和二创，使其更具原创性，风格保持不变"
+        else:
+            if not language:
+                raise ValueError("请选择目标翻译语言！")
+            instruction = f"将文案翻译成{language}"
+        return DoubaoProvider.PROMPT_TEMPLATES['process'].format(instruction=instruction, text=text)
+
+    @staticmethod
+    def _wait_until(wait: 'WebDriverWait', condition: Any, name: str) -> Any:
+        with telemetry.span('doubao', 'selenium_wait', labels={'wait': name}):
+            return wait.until(condition)
+
     @staticmethod
     def login(driver_path: str) -> Dict[str, Any]:
+        from selenium import webdriver
+        from selenium.common.exceptions import WebDriverException
+
         os.makedirs(Config.DOUBAO_USER_DATA_DIR, exist_ok=True)
         options = webdriver.ChromeOptions()
         options.add_argument(f"--user-data-dir={os.path.abspath(Config.DOUBAO_USER_DATA_DIR)}")
@@ -49,6 +71,14 @@ class DoubaoProvider:
 
     @staticmethod
     def get_content(driver_path: str, prompt_text: str) -> Dict[str, Any]:
+        from selenium import webdriver
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.common.action_chains import ActionChains
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
         options = webdriver.ChromeOptions()
         options.add_argument(f"--user-data-dir={os.path.abspath(Config.DOUBAO_USER_DATA_DIR)}")
         options.add_argument("--disable-gpu")
@@ -57,11 +87,13 @@ class DoubaoProvider:
         service = webdriver.ChromeService(executable_path=driver_path)
         driver = None
         try:
-            driver = webdriver.Chrome(service=service, options=options)
-            driver.get("https://www.doubao.com/chat/")
+            with telemetry.span('doubao', 'browser_start'):
+                driver = webdriver.Chrome(service=service, options=options)
+            with telemetry.span('doubao', 'page_load'):
+                driver.get("https://www.doubao.com/chat/")
             wait = WebDriverWait(driver, 180)
 
-            textarea = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'textarea[data-testid="chat_input_input"]')))
+            textarea = DoubaoProvider._wait_until(wait, EC.element_to_be_clickable((By.CSS_SELECTOR, 'textarea[data-testid="chat_input_input"]')), 'input_ready')
             num_messages_before = len(driver.find_elements(By.CSS_SELECTOR, 'div[data-testid="receive_message"]'))
 
             textarea.clear()
@@ -73,20 +105,20 @@ class DoubaoProvider:
                 if i < len(lines) - 1:
                     ActionChains(driver).key_down(Keys.SHIFT).send_keys(Keys.ENTER).key_up(Keys.SHIFT).perform()
 
-            send_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-testid="chat_input_send_button"]')))
+            send_button = DoubaoProvider._wait_until(wait, EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-testid="chat_input_send_button"]')), 'send_ready')
             send_button.click()
 
-            wait.until(lambda d: len(d.find_elements(By.CSS_SELECTOR, 'div[data-testid="receive_message"]')) > num_messages_before)
+            DoubaoProvider._wait_until(wait, lambda d: len(d.find_elements(By.CSS_SELECTOR, 'div[data-testid="receive_message"]')) > num_messages_before, 'reply_started')
 
             try:
-                use_dialog_button = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, "//div[text()='改用对话直接回答']")))
+                use_dialog_button = DoubaoProvider._wait_until(WebDriverWait(driver, 5), EC.element_to_be_clickable((By.XPATH, "//div[text()='改用对话直接回答']")), 'writing_assistant')
                 print("检测到 AI 写作助手，已点击'改用对话直接回答'。")
                 use_dialog_button.click()
                 time.sleep(1)
             except TimeoutException:
                 pass
 
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div[data-testid="receive_message"]:last-of-type button[data-testid="message_action_regenerate"]')))
+            DoubaoProvider._wait_until(wait, EC.presence_of_element_located((By.CSS_SELECTOR, 'div[data-testid="receive_message"]:last-of-type button[data-testid="message_action_regenerate"]')), 'reply_finished')
             time.sleep(0.5)
 
             content_element = driver.find_elements(By.CSS_SELECTOR, 'div[data-testid="receive_message"]')[-1].find_element(By.CSS_SELECTOR, 'div[data-testid="message_text_content"]')
@@ -0,0 +1,364 @@
+import os
+import re
+import json
+import time
+import asyncio
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from aiohttp import web
+
+from .tts_service import TTSService
+from .doubao_service import DoubaoProvider
+from .video_service import VideoCreationService
+from .batch_service import BatchRenderService
+from ..utils import progress
+from ..utils.job_store import JobStore
+from ..utils.async_worker_pool import AsyncWorkerPool
+from ..utils.chromedriver_downloader import ChromedriverDownloader
+from ..config import Config
+
+def _run_cancellable(job_id: str, func: Callable, *args) -> Any:
+    progress.set_cancel_check(JobStore().cancel_checker(job_id))
+    try:
+        return func(*args)
+    finally:
+        progress.set_cancel_check(None)
+
+def _synthesize(params: Dict[str, Any]) -> Dict[str, Any]:
+    audio_path, srt_path = asyncio.run(TTSService().synthesize_with_retry(
+        params['text'], params['voice'], params['rate'], params['volume'], params['pitch'], params['generate_srt'], params['audio_path'],
+        params['concurrency'], params['incremental'], print))
+    artifacts = {'audio': audio_path}
+    if srt_path:
+        artifacts['srt'] = srt_path
+    return {'artifacts': artifacts}
+
+def _ask_doubao(params: Dict[str, Any]) -> Dict[str, Any]:
+    downloader = ChromedriverDownloader(status_callback=print, error_callback=print)
+    success, message = downloader.ensure_chromedriver()
+    if not success:
+        raise RuntimeError(message)
+    progress.raise_if_cancelled()
+    reply = DoubaoProvider.get_content(os.path.abspath(downloader.driver_filename), params['prompt'])
+    if not reply['success']:
+        raise RuntimeError(reply['error'])
+    progress.raise_if_cancelled()
+
+    result = {'text': reply['text'], 'content': '', 'cover_title': '', 'cover_subtitle': ''}
+    json_match = re.search(r'\{.*\}', reply['text'], re.DOTALL)
+    try:
+        data = json.loads(json_match.group(0)) if json_match else {}
+    except json.JSONDecodeError:
+        data = {}
+    if not data:
+        print(f"豆包{DoubaoProvider.TASK_NAMES[params['task']]}成功，但返回内容不是有效的JSON格式。")
+    for key in ('content', 'cover_title', 'cover_subtitle'):
+        result[key] = data.get(key, '')
+    with open(params['result_path'], 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    result['artifacts'] = {'result': params['result_path']}
+    return result
+
+def run_tts_job(job_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return _run_cancellable(job_id, _synthesize, params)
+
+def run_doubao_job(job_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return _run_cancellable(job_id, _ask_doubao, params)
+
+def run_video_job(job_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    result = VideoCreationService.run_generation_workflow(params, job_id)
+    artifacts = {'video': result['video_output']}
+    if result['cover_output']:
+        artifacts['cover'] = result['cover_output']
+    return {'artifacts': artifacts, 'encode_stats': result['encode_stats']}
+
+class JobAPIServer:
+    KINDS = {
+        'tts': ('tts', run_tts_job),
+        'doubao': ('browser', run_doubao_job),
+        'video': ('ffmpeg', run_video_job),
+    }
+    TERMINAL_STATUSES = ('finished', 'failed', 'cancelled')
+
+    def __init__(self, pool: AsyncWorkerPool, store: Optional[JobStore] = None, slots: Optional[Dict[str, int]] = None,
+                 max_queued: int = Config.API_MAX_QUEUED, jobs_dir: str = Config.API_JOBS_DIR):
+        self.pool = pool
+        self.store = store or JobStore()
+        self.slots = dict(Config.API_SLOTS if slots is None else slots)
+        self.max_queued = max_queued
+        self.jobs_dir = jobs_dir
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.pending: deque = deque()
+        self.busy = {resource: 0 for resource in self.slots}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.add_routes([
+            web.get('/health', self.handle_health),
+            web.get('/jobs', self.handle_list),
+            web.post('/jobs/{kind}', self.handle_submit),
+            web.get('/jobs/{job_id}', self.handle_status),
+            web.get('/jobs/{job_id}/events', self.handle_events),
+            web.post('/jobs/{job_id}/cancel', self.handle_cancel),
+            web.delete('/jobs/{job_id}', self.handle_cancel),
+            web.get('/jobs/{job_id}/artifacts/{name}', self.handle_artifact),
+        ])
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    async def _on_startup(self, app: web.Application):
+        for kind in self.KINDS:
+            for stale in self.store.list_jobs(('queued', 'running'), f"api_{kind}"):
+                self.store.update_job(stale['job_id'], 'failed', "服务重启，任务已中断。")
+        await self.pool.start()
+
+    async def _on_cleanup(self, app: web.Application):
+        self.pending.clear()
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        await self.pool.shutdown()
+
+    @staticmethod
+    def _error(exc_class: type, message: str, headers: Optional[Dict[str, str]] = None) -> web.HTTPException:
+        return exc_class(text=json.dumps({'error': message}, ensure_ascii=False), content_type='application/json', headers=headers)
+
+    @staticmethod
+    def _view(job: Dict[str, Any]) -> Dict[str, Any]:
+        view = {key: value for key, value in job.items() if not key.startswith('_')}
+        view['seq'] = job['_seq']
+        view['artifacts'] = sorted(job['artifacts'])
+        return view
+
+    def _get_job(self, request: web.Request) -> Dict[str, Any]:
+        job = self.jobs.get(request.match_info['job_id'])
+        if job is None:
+            raise self._error(web.HTTPNotFound, "任务不存在。")
+        return job
+
+    def _publish(self, job: Dict[str, Any], event_type: str, **data: Any):
+        job['_seq'] += 1
+        job['_events'].append((job['_seq'], event_type, data))
+        changed, job['_changed'] = job['_changed'], asyncio.Event()
+        changed.set()
+
+    def _set_status(self, job: Dict[str, Any], status: str, error: Optional[str] = None):
+        job['status'] = status
+        job['error'] = error
+        if status == 'running':
+            job['started_at'] = time.time()
+        elif status in self.TERMINAL_STATUSES:
+            job['finished_at'] = time.time()
+        self.store.update_job(job['job_id'], status, error)
+        self._publish(job, 'status', status=status, error=error, artifacts=sorted(job['artifacts']))
+
+    def _tts_params(self, body: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        for key in ('text', 'voice'):
+            if body.get(key) is not None and not isinstance(body[key], str):
+                raise ValueError(f"字段 '{key}' 必须是字符串。")
+            if not (body.get(key) or '').strip():
+                raise ValueError(f"缺少必填字段 '{key}'。")
+        params = {
+            'text': body['text'].strip(), 'voice': body['voice'],
+            'rate': body.get('rate') or "+0%", 'volume': body.get('volume') or "+0%", 'pitch': body.get('pitch') or "+0Hz",
+            'generate_srt': BatchRenderService._parse_bool(body.get('generate_srt', True)),
+            'concurrency': max(1, int(body.get('concurrency') or 1)),
+            'incremental': BatchRenderService._parse_bool(body.get('incremental', False)),
+        }
+        return params['text'][:30], params
+
+    def _doubao_params(self, body: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        task = body.get('task') or ''
+        prompt = DoubaoProvider.build_prompt(task, link=(body.get('link') or '').strip(), text=(body.get('text') or '').strip(), language=body.get('language') or '')
+        return f"豆包{DoubaoProvider.TASK_NAMES[task]}", {'task': task, 'prompt': prompt}
+
+    def _video_params(self, body: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        if body.get('video_output'):
+            raise ValueError("不支持指定 'video_output'，视频将写入任务目录。")
+        row = dict(body)
+        source_id = row.pop('tts_job', None)
+        if source_id:
+            source = self.jobs.get(source_id)
+            if source is None or source['kind'] != 'tts':
+                raise ValueError(f"语音任务 '{source_id}' 不存在。")
+            if source['status'] != 'finished':
+                raise ValueError(f"语音任务 '{source_id}' 尚未完成。")
+            row.setdefault('audio', source['artifacts'].get('audio'))
+            row.setdefault('srt', source['artifacts'].get('srt'))
+        params = BatchRenderService.params_from_row(row, Config.PROJECT_ROOT, '')
+        for key in ('audio', 'srt', 'avatar', 'font'):
+            if not os.path.isfile(params[key]):
+                raise ValueError(f"文件不存在: {params[key]}")
+        return params['cover_title'] or os.path.basename(params['audio']), params
+
+    def _prepare_outputs(self, kind: str, params: Dict[str, Any], job_dir: str):
+        os.makedirs(job_dir, exist_ok=True)
+        if kind == 'tts':
+            params['audio_path'] = os.path.join(job_dir, "audio.mp3")
+        elif kind == 'doubao':
+            params['result_path'] = os.path.join(job_dir, "result.json")
+        elif kind == 'video':
+            params['video_output'] = os.path.join(job_dir, "video.mp4")
+
+    async def handle_submit(self, request: web.Request) -> web.Response:
+        kind = request.match_info['kind']
+        if kind not in self.KINDS:
+            raise self._error(web.HTTPNotFound, f"未知的任务类型: {kind}")
+        try:
+            body = await request.json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise self._error(web.HTTPBadRequest, "请求体不是有效的JSON。")
+        if not isinstance(body, dict):
+            raise self._error(web.HTTPBadRequest, "请求体必须是JSON对象。")
+        if len(self.pending) >= self.max_queued:
+            raise self._error(web.HTTPTooManyRequests, f"排队任务已达上限 ({self.max_queued})，请稍后重试。", {'Retry-After': str(Config.API_RETRY_AFTER)})
+        try:
+            title, params = getattr(self, f"_{kind}_params")(body)
+        except (ValueError, TypeError) as e:
+            raise self._error(web.HTTPBadRequest, str(e))
+        except (AttributeError, KeyError) as e:
+            raise self._error(web.HTTPBadRequest, f"请求参数类型错误: {e}")
+
+        job_id = self.store.create_job(f"api_{kind}", title, params)
+        self._prepare_outputs(kind, params, os.path.join(self.jobs_dir, job_id))
+        job = {'job_id': job_id, 'kind': kind, 'title': title, 'status': 'queued', 'error': None, 'message': '', 'stage': None, 'percent': None,
+               'created_at': time.time(), 'started_at': None, 'finished_at': None, 'cancel_requested': False, 'result': None, 'artifacts': {},
+               '_params': params, '_seq': 0, '_events': deque(maxlen=Config.API_EVENT_HISTORY), '_changed': asyncio.Event()}
+        self.jobs[job_id] = job
+        self.pending.append(job)
+        self._publish(job, 'status', status='queued', error=None, artifacts=[])
+        self._prune_history()
+        self._dispatch()
+        return web.json_response(self._view(job), status=202, headers={'Location': f"/jobs/{job_id}"})
+
+    def _prune_history(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] in self.TERMINAL_STATUSES]
+        for job_id in finished[:max(0, len(self.jobs) - Config.API_JOB_HISTORY)]:
+            del self.jobs[job_id]
+
+    def _dispatch(self):
+        for job in list(self.pending):
+            resource = self.KINDS[job['kind']][0]
+            if self.busy.get(resource, 0) < self.slots.get(resource, 1):
+                self.pending.remove(job)
+                self.busy[resource] = self.busy.get(resource, 0) + 1
+                self._tasks[job['job_id']] = asyncio.ensure_future(self._run_job(job))
+
+    async def _run_job(self, job: Dict[str, Any]):
+        resource, target_func = self.KINDS[job['kind']]
+
+        def on_message(kind: str, payload: Any):
+            if kind == 'progress':
+                job['message'] = payload
+                self._publish(job, 'progress', message=payload)
+            elif kind == 'event':
+                if payload.get('percent') is not None:
+                    job['stage'], job['percent'] = payload.get('stage'), payload['percent']
+                self._publish(job, payload.get('type', 'event'), **{key: value for key, value in payload.items() if key != 'type'})
+
+        self._set_status(job, 'running')
+        try:
+            status, result = await self.pool.run(f"api_{job['kind']}#{job['job_id']}", target_func, (job['job_id'], job['_params']), on_message=on_message)
+        except asyncio.CancelledError:
+            status, result = 'cancelled', "服务已停止。"
+        except Exception as e:
+            status, result = 'error', f"任务执行失败: {e}"
+        finally:
+            self.busy[resource] -= 1
+            self._tasks.pop(job['job_id'], None)
+
+        if status == 'success':
+            job['artifacts'] = result.pop('artifacts', {})
+            job['result'] = result
+            self._set_status(job, 'finished')
+        elif status == 'cancelled':
+            self._set_status(job, 'cancelled', result)
+        else:
+            self._set_status(job, 'failed', result)
+        if self.pool.running:
+            self._dispatch()
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({'queued': len(self.pending), 'max_queued': self.max_queued, 'busy': self.busy, 'slots': self.slots,
+                                  'workers': len(self.pool.workers)})
+
+    async def handle_list(self, request: web.Request) -> web.Response:
+        statuses = [s for s in request.query.get('status', '').split(',') if s]
+        kind = request.query.get('kind')
+        jobs = [self._view(job) for job in self.jobs.values() if (not statuses or job['status'] in statuses) and (not kind or job['kind'] == kind)]
+        return web.json_response({'jobs': jobs})
+
+    async def handle_status(self, request: web.Request) -> web.Response:
+        job = self._get_job(request)
+        try:
+            since = int(request.query.get('since', -1))
+            wait = min(float(request.query.get('wait', 0)), Config.API_LONG_POLL_TIMEOUT)
+        except ValueError:
+            raise self._error(web.HTTPBadRequest, "参数 since/wait 必须是数字。")
+        changed = job['_changed']
+        if wait > 0 and job['_seq'] <= since and job['status'] not in self.TERMINAL_STATUSES:
+            try:
+                await asyncio.wait_for(changed.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+        return web.json_response(self._view(job))
+
+    async def handle_events(self, request: web.Request) -> web.StreamResponse:
+        job = self._get_job(request)
+        try:
+            last_id = int(request.headers.get('Last-Event-ID') or request.query.get('since') or 0)
+        except ValueError:
+            raise self._error(web.HTTPBadRequest, "Last-Event-ID 必须是数字。")
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        await response.prepare(request)
+        try:
+            while True:
+                changed = job['_changed']
+                for seq, event_type, data in list(job['_events']):
+                    if seq > last_id:
+                        await response.write(f"id: {seq}\nevent: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8'))
+                        last_id = seq
+                if job['status'] in self.TERMINAL_STATUSES:
+                    break
+                try:
+                    await asyncio.wait_for(changed.wait(), Config.API_SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    await response.write(b": keep-alive\n\n")
+            await response.write_eof()
+        except ConnectionResetError:
+            pass
+        return response
+
+    async def handle_cancel(self, request: web.Request) -> web.Response:
+        job = self._get_job(request)
+        if job['status'] in self.TERMINAL_STATUSES:
+            raise self._error(web.HTTPConflict, f"任务已结束 ({job['status']})，无法取消。")
+        if job['status'] == 'queued':
+            self.pending.remove(job)
+            self._set_status(job, 'cancelled', "任务在排队时被取消。")
+            return web.json_response(self._view(job))
+        if not job['cancel_requested']:
+            job['cancel_requested'] = True
+            self.store.request_cancel(job['job_id'])
+            self._publish(job, 'cancel_requested')
+        return web.json_response(self._view(job), status=202)
+
+    async def handle_artifact(self, request: web.Request) -> web.StreamResponse:
+        job = self._get_job(request)
+        path = job['artifacts'].get(request.match_info['name'])
+        if not path or not os.path.isfile(path):
+            raise self._error(web.HTTPNotFound, "产物不存在。")
+        return web.FileResponse(path, headers={'Content-Disposition': f'attachment; filename="{os.path.basename(path)}"'})
+
+def create_server(slots: Optional[Dict[str, int]] = None, max_queued: int = Config.API_MAX_QUEUED) -> JobAPIServer:
+    slots = dict(Config.API_SLOTS if slots is None else slots)
+    pool = AsyncWorkerPool(size=sum(slots.values()), preload_modules=Config.API_WORKER_PRELOAD_MODULES)
+    return JobAPIServer(pool, slots=slots, max_queued=max_queued)
+
+def run_forever(host: str = Config.API_HOST, port: int = Config.API_PORT, slots: Optional[Dict[str, int]] = None, max_queued: int = Config.API_MAX_QUEUED):
+    server = create_server(slots, max_queued)
+    print(f"任务接口服务已启动: http://{host}:{port}")
+    web.run_app(server.create_app(), host=host, port=port, print=None)
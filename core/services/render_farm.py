@@ -0,0 +1,79 @@
+import os
+import time
+import socket
+import threading
+import traceback
+from typing import Any, Dict, Optional
+
+from .video_service import VideoCreationService
+from ..utils import progress, telemetry
+from ..utils.farm_queue import FarmQueue
+from ..config import Config
+
+class RenderFarmWorker:
+    def __init__(self, farm: FarmQueue, worker_id: Optional[str] = None, heartbeat_interval: float = Config.FARM_HEARTBEAT_INTERVAL,
+                 poll_interval: float = Config.FARM_POLL_INTERVAL):
+        self.farm = farm
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+
+    def run(self, max_jobs: Optional[int] = None, exit_when_idle: bool = False) -> int:
+        completed = 0
+        print(f"渲染节点 {self.worker_id} 已启动，任务目录: {self.farm.root}")
+        while max_jobs is None or completed < max_jobs:
+            self.farm.requeue_expired()
+            claimed = self.farm.claim(self.worker_id)
+            if claimed is None:
+                if exit_when_idle and not self.farm.count('running'):
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            if self.run_job(*claimed):
+                completed += 1
+        print(f"渲染节点 {self.worker_id} 退出，共完成 {completed} 个任务。")
+        return completed
+
+    def run_job(self, running_path: str, job: Dict[str, Any]) -> bool:
+        lease_lost = threading.Event()
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(self.heartbeat_interval):
+                if not self.farm.heartbeat(running_path):
+                    lease_lost.set()
+                    return
+
+        beater = threading.Thread(target=heartbeat, daemon=True)
+        beater.start()
+        progress.set_cancel_check(lease_lost.is_set)
+        print(f"节点 {self.worker_id} 开始处理任务 {job['name']}（第 {job['attempts']} 次尝试）")
+        start = time.perf_counter()
+        try:
+            os.makedirs(os.path.dirname(job['params']['video_output']), exist_ok=True)
+            job['result'] = VideoCreationService.run_generation_workflow(job['params'])
+            status = 'done'
+        except progress.JobCancelled:
+            print(f"任务 {job['name']} 的租约已被其他节点接管，放弃本次渲染。")
+            return False
+        except Exception as e:
+            job['error'] = f"{e}\n{traceback.format_exc()}"
+            status = 'failed'
+        finally:
+            stop.set()
+            beater.join()
+            progress.set_cancel_check(None)
+
+        job['worker'] = self.worker_id
+        job['elapsed'] = time.perf_counter() - start
+        telemetry.event('farm', 'job', job['elapsed'], labels={'status': status}, values={'attempts': job['attempts']})
+        if not self.farm.complete(running_path, job, status):
+            print(f"任务 {job['name']} 的租约已失效，结果未写回。")
+            return False
+        print(f"节点 {self.worker_id} 完成任务 {job['name']}: {'成功' if status == 'done' else '失败'}，耗时 {job['elapsed']:.2f}s")
+        return status == 'done'
+
+def run_worker_process(root: str, lease_seconds: float = Config.FARM_LEASE_SECONDS, heartbeat_interval: float = Config.FARM_HEARTBEAT_INTERVAL,
+                       poll_interval: float = Config.FARM_POLL_INTERVAL, exit_when_idle: bool = False) -> int:
+    farm = FarmQueue(root, lease_seconds)
+    return RenderFarmWorker(farm, heartbeat_interval=heartbeat_interval, poll_interval=poll_interval).run(exit_when_idle=exit_when_idle)
@@ -0,0 +1,146 @@
+import io
+import queue
+import socket
+import threading
+import subprocess
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .video_service import VideoCreationService
+from ..utils.lazy_import import lazy_module
+
+Image = lazy_module("PIL.Image")
+
+class StreamingVideoEncoder:
+    FRAME_RATE = 5
+
+    def __init__(self, background_image: str, font_path: str, output_file: str, use_gpu: bool, bgm_file: Optional[str],
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.background_image = background_image
+        self.font_path = font_path
+        self.output_file = output_file
+        self.use_gpu = use_gpu
+        self.bgm_file = bgm_file
+        self.progress_callback = progress_callback
+        self.stats: Dict[str, Any] = {}
+        self.frame_ms = 1000 / self.FRAME_RATE
+
+        self._cues: List[Tuple[int, int, str]] = []
+        self._safe_until_ms = 0.0
+        self._total_ms: Optional[float] = None
+        self._cond = threading.Condition()
+        self._audio_queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._server: Optional[socket.socket] = None
+        self._encoder: Optional[threading.Thread] = None
+        self._result = False
+
+    def start(self):
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(('127.0.0.1', 0))
+        self._server.listen(1)
+        port = self._server.getsockname()[1]
+
+        command = ['ffmpeg', '-y', '-f', 'image2pipe', '-framerate', str(self.FRAME_RATE), '-i', f'tcp://127.0.0.1:{port}', '-f', 'mp3']
+        audio_filters, audio_maps = VideoCreationService._append_audio_inputs(command, 'pipe:0', self.bgm_file, 1)
+        if audio_filters:
+            command.extend(['-filter_complex', ";".join(audio_filters)])
+        command.extend(['-map', '0:v', *audio_maps])
+        if self.use_gpu:
+            command.extend(VideoCreationService._video_codec_args(True))
+        else:
+            command.extend(['-c:v', 'libx264', '-preset', 'fast', '-tune', 'stillimage', '-crf', '18'])
+        command.extend([*VideoCreationService.AUDIO_CODEC_ARGS, '-shortest', '-pix_fmt', 'yuv420p', self.output_file])
+
+        def run():
+            self._result = VideoCreationService._run_ffmpeg(command, None, self.stats, stage='stream', progress_callback=self.progress_callback, input_feeder=self._feed)
+        self._encoder = threading.Thread(target=run, daemon=True)
+        self._encoder.start()
+
+    def add_audio(self, data: bytes):
+        if data:
+            self._audio_queue.put(bytes(data))
+
+    def add_cues(self, cues: List[Tuple[int, int, str]]):
+        if not cues:
+            return
+        with self._cond:
+            self._cues.extend(cues)
+            self._safe_until_ms = max(self._safe_until_ms, cues[-1][0])
+            self._cond.notify_all()
+
+    def finish(self, total_ms: float) -> bool:
+        with self._cond:
+            self._total_ms = total_ms
+            self._cond.notify_all()
+        self._audio_queue.put(None)
+        self._encoder.join()
+        self._server.close()
+        return self._result
+
+    def abort(self):
+        with self._cond:
+            self._total_ms = 0
+            self._cond.notify_all()
+        self._audio_queue.put(None)
+        if self._server:
+            self._server.close()
+
+    def _feed(self, process: subprocess.Popen):
+        frame_writer = threading.Thread(target=self._write_frames, daemon=True)
+        frame_writer.start()
+        try:
+            while True:
+                data = self._audio_queue.get()
+                if data is None:
+                    break
+                process.stdin.buffer.write(data)
+                process.stdin.buffer.flush()
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+        frame_writer.join()
+
+    def _write_frames(self):
+        background = Image.open(self.background_image).convert('RGB')
+        font = VideoCreationService._load_subtitle_font(self.font_path, background.height)
+        rendered: Dict[str, bytes] = {}
+
+        def frame_bytes(text: str) -> bytes:
+            if text not in rendered:
+                buffer = io.BytesIO()
+                if text:
+                    VideoCreationService.render_subtitle_frame(background, text, font, buffer)
+                else:
+                    background.save(buffer, 'JPEG', quality=95)
+                rendered[text] = buffer.getvalue()
+            return rendered[text]
+
+        try:
+            connection, _ = self._server.accept()
+        except OSError:
+            return
+        frame_index, cue_index = 0, 0
+        try:
+            with connection:
+                while True:
+                    with self._cond:
+                        while self._total_ms is None and frame_index * self.frame_ms >= self._safe_until_ms:
+                            self._cond.wait()
+                        limit_ms = self._total_ms if self._total_ms is not None else self._safe_until_ms
+                        cues = list(self._cues)
+                    if frame_index * self.frame_ms >= limit_ms:
+                        break
+                    while frame_index * self.frame_ms < limit_ms:
+                        frame_ms = frame_index * self.frame_ms
+                        while cue_index < len(cues) and cues[cue_index][1] <= frame_ms:
+                            cue_index += 1
+                        text = cues[cue_index][2] if cue_index < len(cues) and cues[cue_index][0] <= frame_ms else ""
+                        connection.sendall(frame_bytes(text))
+                        frame_index += 1
+        except OSError:
+            pass
+        finally:
+            self._server.close()
@@ -0,0 +1,37 @@
+import asyncio
+
+from PyQt5.QtCore import QObject, pyqtSignal, QThread
+
+class AsyncioRunner(QThread):
+    def __init__(self):
+        super().__init__()
+        self.loop = asyncio.new_event_loop()
+
+    def run(self):
+        try:
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_forever()
+        except Exception as e:
+            print(f"AsyncioRunner 发生错误: {e}")
+
+    def schedule(self, coro):
+        if self.isRunning():
+            return asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return None
+
+    def stop_loop(self):
+        if self.isRunning():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.wait(2000)
+
+class TaskSignals(QObject):
+    voices_ready = pyqtSignal(object)
+    voices_error = pyqtSignal(str)
+    tts_finished = pyqtSignal(str, str)
+    tts_error = pyqtSignal(str)
+    task_progress = pyqtSignal(str)
+    tts_job_progress = pyqtSignal(str, str)
+    tts_job_finished = pyqtSignal(str, str, str)
+    tts_job_error = pyqtSignal(str, str)
+    tts_queue_changed = pyqtSignal(int, int)
+    video_finished = pyqtSignal(str)
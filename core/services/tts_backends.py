@@ -0,0 +1,186 @@
+import json
+import time
+import base64
+import asyncio
+from abc import ABC, abstractmethod
+from urllib.parse import urlparse
+from typing import Any, AsyncIterator, Dict, List
+
+from ..config import Config
+from ..utils import telemetry
+from ..utils.lazy_import import lazy_module
+from ..utils.rate_limiter import HostRateLimiter
+
+aiohttp = lazy_module("aiohttp")
+edge_tts = lazy_module("edge_tts")
+
+class TTSBackendError(Exception):
+    pass
+
+class TTSNoAudioError(TTSBackendError):
+    pass
+
+class TTSTransientError(TTSBackendError):
+    pass
+
+class TTSBackend(ABC):
+    name = "base"
+    version = "0"
+    host = ""
+    audio_bitrate_bps = 48_000
+
+    @property
+    def engine_id(self) -> str:
+        return f"{self.name}-{self.version}"
+
+    @abstractmethod
+    def stream(self, text: str, voice: str, rate: str, volume: str, pitch: str) -> AsyncIterator[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        pass
+
+class EdgeTTSBackend(TTSBackend):
+    name = "edge-tts"
+
+    @property
+    def version(self) -> str:
+        return edge_tts.__version__
+
+    @property
+    def host(self) -> str:
+        return urlparse(edge_tts.constants.WSS_URL).hostname
+
+    @staticmethod
+    def _transient_errors() -> tuple:
+        return (aiohttp.ClientError, asyncio.TimeoutError, edge_tts.exceptions.WebSocketError, edge_tts.exceptions.UnexpectedResponse)
+
+    async def stream(self, text: str, voice: str, rate: str, volume: str, pitch: str) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            async for chunk in edge_tts.Communicate(text, voice, rate=rate, volume=volume, pitch=pitch).stream():
+                yield chunk
+        except edge_tts.exceptions.NoAudioReceived as e:
+            raise TTSNoAudioError(str(e)) from e
+        except self._transient_errors() as e:
+            raise TTSTransientError(f"{type(e).__name__}: {e}") from e
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        try:
+            return await edge_tts.list_voices()
+        except self._transient_errors() as e:
+            raise TTSTransientError(f"{type(e).__name__}: {e}") from e
+
+class StandinTTSBackend(TTSBackend):
+    name = "standin"
+    version = "1"
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+        self.host = urlparse(self.base_url).netloc
+
+    @staticmethod
+    def _status_error(status: int, detail: str = "") -> TTSBackendError:
+        error_class = TTSTransientError if status == 429 or status >= 500 else TTSBackendError
+        return error_class(f"模拟TTS服务返回错误状态 {status}{': ' + detail if detail else ''}")
+
+    async def stream(self, text: str, voice: str, rate: str, volume: str, pitch: str) -> AsyncIterator[Dict[str, Any]]:
+        payload = {'text': text, 'voice': voice, 'rate': rate, 'volume': volume, 'pitch': pitch}
+        received_audio = False
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(f"{self.base_url}/synthesize", json=payload) as response:
+                    if response.status != 200:
+                        raise self._status_error(response.status, await response.text())
+                    async for line in response.content:
+                        if not line.strip():
+                            continue
+                        chunk = json.loads(line)
+                        if chunk["type"] == "error":
+                            raise TTSTransientError(f"模拟TTS服务合成失败: {chunk.get('message')}")
+                        if chunk["type"] == "audio":
+                            chunk["data"] = base64.b64decode(chunk["data"])
+                            received_audio = True
+                        yield chunk
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TTSTransientError(f"{type(e).__name__}: {e}") from e
+        if not received_audio:
+            raise TTSNoAudioError("模拟TTS服务未返回音频。")
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{self.base_url}/voices") as response:
+                    if response.status != 200:
+                        raise self._status_error(response.status)
+                    return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TTSTransientError(f"{type(e).__name__}: {e}") from e
+
+class BackendWrapper(TTSBackend):
+    def __init__(self, backend: TTSBackend):
+        self.backend = backend
+        self.name = backend.name
+
+    @property
+    def version(self) -> str:
+        return self.backend.version
+
+    @property
+    def host(self) -> str:
+        return self.backend.host
+
+    @property
+    def audio_bitrate_bps(self) -> int:
+        return self.backend.audio_bitrate_bps
+
+class InstrumentedBackend(BackendWrapper):
+
+    async def stream(self, text: str, voice: str, rate: str, volume: str, pitch: str) -> AsyncIterator[Dict[str, Any]]:
+        with telemetry.span('tts', 'request', labels={'backend': self.name}) as record:
+            start = time.perf_counter()
+            audio_bytes = 0
+            record['values']['chars'] = len(text)
+            async for chunk in self.backend.stream(text, voice, rate, volume, pitch):
+                if chunk["type"] == "audio":
+                    if not audio_bytes:
+                        record['values']['first_byte_seconds'] = time.perf_counter() - start
+                    audio_bytes += len(chunk["data"])
+                    record['bytes_written'] = audio_bytes
+                yield chunk
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        with telemetry.span('tts', 'list_voices', labels={'backend': self.name}):
+            return await self.backend.list_voices()
+
+class RateLimitedBackend(BackendWrapper):
+    def __init__(self, backend: TTSBackend, limiter: HostRateLimiter):
+        super().__init__(backend)
+        self.limiter = limiter
+
+    async def _acquire(self):
+        start = time.perf_counter()
+        await self.limiter.acquire(self.host)
+        telemetry.event('tts', 'rate_limit_wait', time.perf_counter() - start, labels={'tts_host': self.host})
+
+    async def stream(self, text: str, voice: str, rate: str, volume: str, pitch: str) -> AsyncIterator[Dict[str, Any]]:
+        await self._acquire()
+        async for chunk in self.backend.stream(text, voice, rate, volume, pitch):
+            yield chunk
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        await self._acquire()
+        return await self.backend.list_voices()
+
+_host_limiter = HostRateLimiter(Config.TTS_RATE_LIMIT_PER_HOST, Config.TTS_RATE_LIMIT_BURST)
+
+def create_backend(name: str = None) -> TTSBackend:
+    name = name or Config.TTS_BACKEND
+    if name == "edge":
+        backend = EdgeTTSBackend()
+    elif name == "standin":
+        backend = StandinTTSBackend(Config.TTS_STANDIN_URL)
+    else:
+        raise ValueError(f"未知的TTS后端: {name}")
+    backend = InstrumentedBackend(backend)
+    return RateLimitedBackend(backend, _host_limiter) if Config.TTS_RATE_LIMIT_PER_HOST > 0 else backend
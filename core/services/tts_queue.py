@@ -0,0 +1,77 @@
+import time
+import asyncio
+import itertools
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .tts_service import TTSService
+from .task_signals import TaskSignals
+from ..utils import telemetry
+from ..config import Config
+
+class TTSJobQueue:
+    def __init__(self, service: TTSService, signals: TaskSignals, concurrency: int = Config.TTS_QUEUE_CONCURRENCY,
+                 max_retries: int = Config.TTS_MAX_RETRIES, base_delay: float = Config.TTS_RETRY_BASE_DELAY, max_delay: float = Config.TTS_RETRY_MAX_DELAY):
+        self.service = service
+        self.signals = signals
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._running: Dict[str, asyncio.Future] = {}
+
+    def submit(self, text: str, voice: str, rate: str, volume: str, pitch: str, generate_srt: bool, audio_path: str,
+               concurrency: int = 1, incremental: bool = False) -> str:
+        job_id = str(next(self._ids))
+        job = {'job_id': job_id, 'status': 'queued', 'attempts': 0, 'submitted_at': time.time(), 'text': text, 'voice': voice, 'rate': rate, 'volume': volume, 'pitch': pitch,
+               'generate_srt': generate_srt, 'audio_path': audio_path, 'concurrency': concurrency, 'incremental': incremental}
+        self.jobs[job_id] = job
+        self.service.runner.schedule(self._enqueue(job))
+        return job_id
+
+    def set_concurrency(self, concurrency: int):
+        self.concurrency = max(1, concurrency)
+        self.service.runner.schedule(self._redispatch())
+
+    def pending_paths(self) -> List[str]:
+        return [job['audio_path'] for job in self.jobs.values() if job['status'] in ('queued', 'running')]
+
+    async def _enqueue(self, job: Dict[str, Any]):
+        self._pending.append(job)
+        self._dispatch()
+
+    async def _redispatch(self):
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._pending and len(self._running) < self.concurrency:
+            job = self._pending.popleft()
+            job['status'] = 'running'
+            self._running[job['job_id']] = asyncio.ensure_future(self._run_job(job))
+        self.signals.tts_queue_changed.emit(len(self._running), len(self._pending))
+
+    async def _run_job(self, job: Dict[str, Any]):
+        job_id = job['job_id']
+
+        def progress(message: str):
+            self.signals.tts_job_progress.emit(job_id, message)
+
+        started_at = time.time()
+        try:
+            audio_path, srt_path = await self.service.synthesize_with_retry(
+                job['text'], job['voice'], job['rate'], job['volume'], job['pitch'], job['generate_srt'], job['audio_path'],
+                job['concurrency'], job['incremental'], progress, lambda attempt: job.update(attempts=attempt),
+                self.max_retries, self.base_delay, self.max_delay)
+            job['status'] = 'finished'
+            self.signals.tts_job_finished.emit(job_id, audio_path, srt_path)
+        except Exception as e:
+            job['status'] = 'failed'
+            self.signals.tts_job_error.emit(job_id, f"音频生成失败: {e}")
+        finally:
+            telemetry.event('tts', 'job', time.time() - started_at, labels={'status': job['status']},
+                            values={'queue_wait_seconds': started_at - job['submitted_at'], 'attempts': job['attempts']})
+            self._running.pop(job_id, None)
+            self._dispatch()
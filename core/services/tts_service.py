@@ -1,83 +1,368 @@
+from __future__ import annotations
+
 import os
+import re
+import json
+import random
+import shutil
 import asyncio
-import edge_tts
-from PyQt5.QtCore import QObject, pyqtSignal, QThread
+import tempfile
+import time
+import unicodedata
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from ..utils.data_manager import DataManager
+from ..utils.content_cache import ContentCache
+from ..utils import telemetry, word_timing
+from ..utils.lazy_import import lazy_module
+from ..utils.progress import format_seconds, raise_if_cancelled
+from .video_service import VideoCreationService
+from .streaming_video import StreamingVideoEncoder
+from .voice_catalog import VoiceCatalog
+from .tts_backends import TTSBackend, TTSNoAudioError, TTSTransientError, create_backend
 from ..config import Config
 
-class AsyncioRunner(QThread):
-    def run(self):
-        try:
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            self.loop.run_forever()
-        except Exception as e:
-            print(f"AsyncioRunner 发生错误: {e}")
+if TYPE_CHECKING:
+    from .task_signals import AsyncioRunner, TaskSignals
 
-    def schedule(self, coro):
-        if self.isRunning() and hasattr(self, 'loop'):
-            return asyncio.run_coroutine_threadsafe(coro, self.loop)
-        return None
+edge_tts = lazy_module("edge_tts")
 
-    def stop_loop(self):
-        if self.isRunning() and hasattr(self, 'loop'):
-            self.loop.call_soon_threadsafe(self.loop.stop)
-            self.wait(2000)
+class EncoderSink:
+    def __init__(self, encoder: StreamingVideoEncoder, sub_maker: edge_tts.SubMaker, bitrate_bps: int):
+        self.encoder = encoder
+        self.sub_maker = sub_maker
+        self.bitrate_bps = bitrate_bps
+        self.audio_bytes = 0
 
-class TaskSignals(QObject):
-    voices_ready = pyqtSignal(list)
-    voices_error = pyqtSignal(str)
-    tts_finished = pyqtSignal(str, str)
-    tts_error = pyqtSignal(str)
-    task_progress = pyqtSignal(str)
+    def write(self, data: bytes):
+        self.encoder.add_audio(data)
+        self.audio_bytes += len(data)
+
+    def feed(self, boundary: Dict[str, Any]):
+        self.sub_maker.feed(boundary)
+        start_ms = boundary["offset"] // 10_000
+        self.encoder.add_cues(VideoCreationService.segment_cue(start_ms, start_ms + boundary["duration"] // 10_000, boundary["text"], 12, 2))
+
+    @property
+    def duration_ms(self) -> float:
+        return self.audio_bytes * 8 * 1000 / self.bitrate_bps
 
 class TTSService:
-    def __init__(self, runner: AsyncioRunner, signals: TaskSignals):
+    SENTENCE_PATTERN = re.compile(r"[。！？!?；;]*[^。！？!?；;\n]+?(?:[。！？!?；;]+[”’）)]*|\.(?=\s)|\n+|$)")
+
+    def __init__(self, runner: Optional[AsyncioRunner] = None, signals: Optional[TaskSignals] = None, backend: Optional[TTSBackend] = None):
         self.runner = runner
         self.signals = signals
+        self.backend = backend or create_backend()
+        self.cache = ContentCache(Config.TTS_CACHE_DIR, Config.TTS_CACHE_MAX_BYTES)
 
     def fetch_voices(self):
         self.runner.schedule(self._async_fetch_voices())
 
-    def run_tts(self, text: str, voice: str, rate: str, volume: str, pitch: str, generate_srt: bool, audio_path: str):
-        self.runner.schedule(self._async_run_tts(text, voice, rate, volume, pitch, generate_srt, audio_path))
+    def run_tts(self, text: str, voice: str, rate: str, volume: str, pitch: str, generate_srt: bool, audio_path: str, concurrency: int = 1, incremental: bool = False):
+        self.runner.schedule(self._async_run_tts(text, voice, rate, volume, pitch, generate_srt, audio_path, concurrency, incremental))
 
-    async def _async_fetch_voices(self):
-        cached_voices = DataManager.load_json(Config.VOICES_CACHE_FILE)
-        if cached_voices:
-            self.signals.voices_ready.emit(cached_voices)
-            return
+    def run_text_to_video(self, text: str, voice: str, rate: str, volume: str, pitch: str, params: Dict[str, Any], concurrency: int = 1):
+        self.runner.schedule(self._async_run_text_to_video(text, voice, rate, volume, pitch, params, concurrency))
+
+    @staticmethod
+    def split_sentences(text: str, max_chars: int = Config.TTS_CHUNK_MAX_CHARS) -> List[str]:
+        chunks, current = [], ""
+        for match in TTSService.SENTENCE_PATTERN.finditer(text):
+            sentence = match.group(0)
+            if not sentence.strip():
+                continue
+            if current and len(current) + len(sentence) > max_chars:
+                chunks.append(current)
+                current = ""
+            current += sentence
+        if current.strip():
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def backoff_delay(attempt: int, base_delay: float = Config.TTS_RETRY_BASE_DELAY, max_delay: float = Config.TTS_RETRY_MAX_DELAY) -> float:
+        return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+    @staticmethod
+    async def synthesize_chunked(chunks: List[str], stream_factory: Callable[[str], AsyncIterator[Dict[str, Any]]], concurrency: int, audio_file, sub_maker: edge_tts.SubMaker, on_chunk_done: Optional[Callable[[int, int], None]] = None,
+                                 bitrate_bps: int = TTSBackend.audio_bitrate_bps) -> int:
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def synthesize(chunk_text: str):
+            async with semaphore:
+                audio, boundaries = bytearray(), []
+                async for chunk in stream_factory(chunk_text):
+                    raise_if_cancelled()
+                    if chunk["type"] == "audio":
+                        audio.extend(chunk["data"])
+                    elif chunk["type"] in ("WordBoundary", "SentenceBoundary"):
+                        boundaries.append(chunk)
+                return bytes(audio), boundaries
 
+        tasks = [asyncio.ensure_future(synthesize(chunk_text)) for chunk_text in chunks]
+        total_bytes = 0
         try:
+            for index, task in enumerate(tasks):
+                audio, boundaries = await task
+                base_offset = total_bytes * 8 * edge_tts.constants.TICKS_PER_SECOND // bitrate_bps
+                for boundary in boundaries:
+                    sub_maker.feed({**boundary, "offset": boundary["offset"] + base_offset})
+                audio_file.write(audio)
+                total_bytes += len(audio)
+                if on_chunk_done:
+                    on_chunk_done(index + 1, len(tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+        return total_bytes
+
+    async def _revalidate_voices(self, catalog: Optional[VoiceCatalog]) -> VoiceCatalog:
+        fresh = VoiceCatalog(await self.backend.list_voices(), time.time())
+        if catalog is not None and fresh.digest == catalog.digest:
+            catalog.fetched_at = fresh.fetched_at
+            catalog.save(Config.VOICES_CACHE_FILE)
+            return catalog
+        fresh.save(Config.VOICES_CACHE_FILE)
+        self.signals.voices_ready.emit(fresh)
+        return fresh
+
+    async def _async_fetch_voices(self):
+        catalog = VoiceCatalog.load(Config.VOICES_CACHE_FILE)
+        if catalog:
+            self.signals.voices_ready.emit(catalog)
+        else:
             self.signals.task_progress.emit("正在从网络获取可用语音列表...")
-            voices = await edge_tts.list_voices()
-            DataManager.save_json(voices, Config.VOICES_CACHE_FILE)
-            self.signals.voices_ready.emit(voices)
-        except Exception as e:
-            self.signals.voices_error.emit(f"无法加载语音列表: {e}")
 
-    async def _async_run_tts(self, text: str, voice: str, rate: str, volume: str, pitch: str, generate_srt: bool, audio_path: str):
+        while True:
+            if catalog is None or catalog.is_stale(Config.VOICES_CACHE_TTL):
+                try:
+                    catalog = await self._revalidate_voices(catalog)
+                except Exception as e:
+                    if catalog is None:
+                        self.signals.voices_error.emit(f"无法加载语音列表: {e}")
+                        return
+                    print(f"后台刷新语音列表失败，继续使用缓存: {e}")
+                    await asyncio.sleep(Config.VOICES_REFRESH_RETRY_INTERVAL)
+                    continue
+            await asyncio.sleep(max(Config.VOICES_CACHE_TTL - catalog.age(), 1))
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return "\n".join(" ".join(line.split()) for line in unicodedata.normalize("NFC", text).strip().splitlines() if line.strip())
+
+    def cache_key(self, text: str, voice: str, rate: str, volume: str, pitch: str, scope: str = 'tts') -> str:
+        return ContentCache.make_key(scope, self.backend.engine_id, TTSService.normalize_text(text), voice, rate, volume, pitch)
+
+    @staticmethod
+    def _cue_boundaries(sub_maker: edge_tts.SubMaker) -> List[Dict[str, Any]]:
+        return [{"type": sub_maker.type or "SentenceBoundary", "offset": (cue.start // timedelta(microseconds=1)) * 10,
+                 "duration": ((cue.end - cue.start) // timedelta(microseconds=1)) * 10, "text": cue.content} for cue in sub_maker.cues]
+
+    def _sentence_stream_factory(self, voice: str, rate: str, volume: str, pitch: str, counts: Dict[str, int]) -> Callable[[str], AsyncIterator[Dict[str, Any]]]:
+        async def stream(sentence: str):
+            key = self.cache_key(sentence, voice, rate, volume, pitch, scope='tts_sentence')
+            cached = self.load_cached(key)
+            if cached:
+                counts['reused'] += 1
+                with open(cached[0], 'rb') as f:
+                    yield {"type": "audio", "data": f.read()}
+                for boundary in TTSService._cue_boundaries(cached[1]):
+                    yield boundary
+                return
+
+            counts['synthesized'] += 1
+            audio, sub_maker = bytearray(), edge_tts.SubMaker()
+            try:
+                async for chunk in self.backend.stream(sentence, voice, rate, volume, pitch):
+                    if chunk["type"] == "audio":
+                        audio.extend(chunk["data"])
+                    elif chunk["type"] in ("WordBoundary", "SentenceBoundary"):
+                        sub_maker.feed(chunk)
+                    yield chunk
+            except TTSNoAudioError:
+                return
+
+            with tempfile.TemporaryDirectory() as temp_dir:
+                segment_path = os.path.join(temp_dir, "segment.mp3")
+                with open(segment_path, 'wb') as f:
+                    f.write(audio)
+                try:
+                    self.store_cached(key, segment_path, sub_maker)
+                except OSError as e:
+                    print(f"警告: 写入句子缓存失败: {e}")
+        return stream
+
+    def load_cached(self, key: str) -> Optional[Tuple[str, edge_tts.SubMaker]]:
+        metadata_path = self.cache.path_for(key, '.json')
+        metadata = DataManager.load_json(metadata_path)
+        if not metadata:
+            self.cache.record_lookup(False)
+            return None
+        audio_path = self.cache.get(key, '.mp3')
+        if not audio_path:
+            return None
+        os.utime(metadata_path, None)
+        sub_maker = edge_tts.SubMaker()
+        for start_us, end_us, content in metadata['cues']:
+            sub_maker.feed({"type": metadata['type'], "offset": start_us * 10, "duration": (end_us - start_us) * 10, "text": content})
+        return audio_path, sub_maker
+
+    def store_cached(self, key: str, audio_path: str, sub_maker: edge_tts.SubMaker):
+        metadata = {'type': sub_maker.type or "SentenceBoundary",
+                    'cues': [[cue.start // timedelta(microseconds=1), cue.end // timedelta(microseconds=1), cue.content] for cue in sub_maker.cues]}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metadata_path = os.path.join(temp_dir, "boundaries.json")
+            with open(metadata_path, 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, ensure_ascii=False)
+            self.cache.put(key, '.json', metadata_path)
+        self.cache.put(key, '.mp3', audio_path)
+
+    def _write_srt(self, sub_maker: edge_tts.SubMaker, audio_path: str, progress: Callable[[str], None]) -> str:
+        progress("正在生成字幕文件...")
+        srt_name = os.path.basename(audio_path).replace("audio_", "subtitles_").rsplit('.', 1)[0] + ".srt"
+        srt_path = os.path.join(os.path.dirname(audio_path), srt_name)
+        with open(srt_path, "w", encoding="utf-8") as srt_file:
+            srt_file.write(sub_maker.get_srt())
+        return srt_path
+
+    def _write_timing_sidecar(self, sub_maker: edge_tts.SubMaker, audio_path: str, srt_path: str):
+        entries = ((cue.start // timedelta(milliseconds=1), cue.end // timedelta(milliseconds=1), cue.content) for cue in sub_maker.cues)
         try:
-            self.signals.task_progress.emit("正在初始化TTS引擎...")
-            communicate = edge_tts.Communicate(text, voice, rate=rate, volume=volume, pitch=pitch)
+            word_timing.write_sidecar(audio_path, sub_maker.type or "SentenceBoundary", entries, srt_path)
+        except OSError as e:
+            print(f"警告: 写入时间戳文件失败: {e}")
+
+    async def synthesize_with_retry(self, text: str, voice: str, rate: str, volume: str, pitch: str, generate_srt: bool, audio_path: str,
+                                    concurrency: int = 1, incremental: bool = False, progress: Optional[Callable[[str], None]] = None,
+                                    on_attempt: Optional[Callable[[int], None]] = None, max_retries: int = Config.TTS_MAX_RETRIES,
+                                    base_delay: float = Config.TTS_RETRY_BASE_DELAY, max_delay: float = Config.TTS_RETRY_MAX_DELAY) -> Tuple[str, str]:
+        progress = progress or (lambda message: None)
+        attempt = 0
+        while True:
+            raise_if_cancelled()
+            attempt += 1
+            if on_attempt:
+                on_attempt(attempt)
+            try:
+                return await self.synthesize_to_file(text, voice, rate, volume, pitch, generate_srt, audio_path, concurrency, incremental, progress)
+            except TTSTransientError as e:
+                if attempt > max_retries:
+                    raise
+                delay = self.backoff_delay(attempt - 1, base_delay, max_delay)
+                progress(f"网络错误（{e}），{delay:.1f} 秒后进行第 {attempt} 次重试...")
+                telemetry.event('tts', 'retry', labels={'backend': self.backend.name}, values={'delay_seconds': delay})
+                await asyncio.sleep(delay)
+
+    async def synthesize_to_file(self, text: str, voice: str, rate: str, volume: str, pitch: str, generate_srt: bool, audio_path: str,
+                                 concurrency: int = 1, incremental: bool = False, progress: Optional[Callable[[str], None]] = None) -> Tuple[str, str]:
+        progress = progress or (lambda message: None)
+        with telemetry.span('tts', 'synthesize', labels={'backend': self.backend.name}, values={'chars': len(text)}) as span_record:
+            key = self.cache_key(text, voice, rate, volume, pitch)
+            cached = self.load_cached(key)
+            if cached:
+                shutil.copyfile(cached[0], audio_path)
+                srt_path = self._write_srt(cached[1], audio_path, progress) if generate_srt else ""
+                self._write_timing_sidecar(cached[1], audio_path, srt_path)
+                self._report_cache_stats(hit=True)
+                span_record['labels']['mode'] = 'cached'
+                span_record['bytes_written'] = os.path.getsize(audio_path)
+                return audio_path, srt_path
+
+            progress("正在初始化TTS引擎...")
             sub_maker = edge_tts.SubMaker()
             srt_path = ""
+            chunks = TTSService.split_sentences(text) if concurrency > 1 else []
 
-            self.signals.task_progress.emit("正在生成音频流...")
+            span_record['labels']['mode'] = 'incremental' if incremental else 'chunked' if len(chunks) > 1 else 'single'
             with open(audio_path, "wb") as audio_file:
-                async for chunk in communicate.stream():
-                    if chunk["type"] == "audio":
-                        audio_file.write(chunk["data"])
-                    elif chunk["type"] in ("WordBoundary", "SentenceBoundary"):
-                        sub_maker.feed(chunk)
+                if incremental:
+                    sentences = TTSService.split_sentences(text, 1)
+                    counts = {'reused': 0, 'synthesized': 0}
+                    progress(f"正在按句增量生成音频 (共 {len(sentences)} 句)...")
+                    await TTSService.synthesize_chunked(
+                        sentences, self._sentence_stream_factory(voice, rate, volume, pitch, counts), concurrency, audio_file, sub_maker,
+                        lambda done, total: progress(f"正在按句增量生成音频 ({done}/{total})..."), self.backend.audio_bitrate_bps)
+                    print(f"按句增量合成: 复用 {counts['reused']} 句，重新合成 {counts['synthesized']} 句。")
+                elif len(chunks) > 1:
+                    progress(f"正在分段并行生成音频 (共 {len(chunks)} 段，并发 {concurrency})...")
+                    await TTSService.synthesize_chunked(
+                        chunks, lambda chunk_text: self.backend.stream(chunk_text, voice, rate, volume, pitch),
+                        concurrency, audio_file, sub_maker,
+                        lambda done, total: progress(f"正在分段并行生成音频 ({done}/{total})..."), self.backend.audio_bitrate_bps)
+                else:
+                    progress("正在生成音频流...")
+                    async for chunk in self.backend.stream(text, voice, rate, volume, pitch):
+                        raise_if_cancelled()
+                        if chunk["type"] == "audio":
+                            audio_file.write(chunk["data"])
+                        elif chunk["type"] in ("WordBoundary", "SentenceBoundary"):
+                            sub_maker.feed(chunk)
+
+            try:
+                self.store_cached(key, audio_path, sub_maker)
+            except OSError as e:
+                print(f"警告: 写入TTS缓存失败: {e}")
 
             if generate_srt:
-                self.signals.task_progress.emit("正在生成字幕文件...")
-                srt_name = os.path.basename(audio_path).replace("audio_", "subtitles_").rsplit('.', 1)[0] + ".srt"
-                srt_path = os.path.join(os.path.dirname(audio_path), srt_name)
-                with open(srt_path, "w", encoding="utf-8") as srt_file:
-                    srt_file.write(sub_maker.get_srt())
+                srt_path = self._write_srt(sub_maker, audio_path, progress)
+            self._write_timing_sidecar(sub_maker, audio_path, srt_path)
+
+            self._report_cache_stats(hit=False)
+            span_record['bytes_written'] = os.path.getsize(audio_path)
+            return audio_path, srt_path
 
+    async def _async_run_tts(self, text: str, voice: str, rate: str, volume: str, pitch: str, generate_srt: bool, audio_path: str, concurrency: int = 1, incremental: bool = False):
+        try:
+            audio_path, srt_path = await self.synthesize_to_file(text, voice, rate, volume, pitch, generate_srt, audio_path, concurrency, incremental, self.signals.task_progress.emit)
             self.signals.tts_finished.emit(audio_path, srt_path)
         except Exception as e:
-            self.signals.tts_error.emit(f"音频生成失败: {e}")
\ No newline at end of file
+            self.signals.tts_error.emit(f"音频生成失败: {e}")
+
+    async def _async_run_text_to_video(self, text: str, voice: str, rate: str, volume: str, pitch: str, params: Dict[str, Any], concurrency: int = 1):
+        loop = asyncio.get_running_loop()
+        encoder = None
+
+        def on_progress(fields: Dict[str, Any]):
+            speed = f" | 速度 {fields['speed']:.2f}x" if fields.get('speed') else ""
+            self.signals.task_progress.emit(f"正在边合成边编码 | 已编码 {format_seconds(fields.get('out_time'))}{speed}")
+
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                cover_future = loop.run_in_executor(None, VideoCreationService.render_workflow_cover, params) if params['cover_title'] else None
+                self.signals.task_progress.emit("正在准备视频背景...")
+                bg_output = await loop.run_in_executor(None, VideoCreationService.get_video_background, params['avatar'], params['font'], temp_dir, params['author'], params['subtext'])
+                if not bg_output:
+                    raise RuntimeError("生成视频背景图失败")
+
+                encoder = StreamingVideoEncoder(bg_output, params['font'], params['video_output'], params['use_gpu'], params['bgm'], on_progress)
+                encoder.start()
+                sink = EncoderSink(encoder, edge_tts.SubMaker(), self.backend.audio_bitrate_bps)
+                chunks = TTSService.split_sentences(text) if concurrency > 1 else []
+                self.signals.task_progress.emit("正在边合成边编码...")
+                if len(chunks) > 1:
+                    await TTSService.synthesize_chunked(
+                        chunks, lambda chunk_text: self.backend.stream(chunk_text, voice, rate, volume, pitch), concurrency, sink, sink, bitrate_bps=self.backend.audio_bitrate_bps)
+                else:
+                    async for chunk in self.backend.stream(text, voice, rate, volume, pitch):
+                        if chunk["type"] == "audio":
+                            sink.write(chunk["data"])
+                        elif chunk["type"] in ("WordBoundary", "SentenceBoundary"):
+                            sink.feed(chunk)
+
+                self.signals.task_progress.emit("语音合成完成，正在完成视频编码...")
+                if not await loop.run_in_executor(None, encoder.finish, sink.duration_ms):
+                    raise RuntimeError("FFmpeg合成视频失败, 请检查控制台错误日志。")
+                if cover_future:
+                    await cover_future
+
+            print(f"文本生成视频完成: 音频时长 {sink.duration_ms / 1000:.1f}s，编码统计: {encoder.stats}")
+            self.signals.video_finished.emit(params['video_output'])
+        except Exception as e:
+            if encoder:
+                encoder.abort()
+            self.signals.tts_error.emit(f"文本生成视频失败: {e}")
+
+    def _report_cache_stats(self, hit: bool):
+        stats = self.cache.stats()
+        print(f"TTS缓存{'命中' if hit else '未命中'}。累计命中 {stats['hits']} 次，未命中 {stats['misses']} 次。")
\ No newline at end of file
@@ -0,0 +1,82 @@
+import re
+import json
+import math
+import base64
+import random
+import asyncio
+import argparse
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+TICKS_PER_SECOND = 10_000_000
+SILENT_FRAME = bytes([0xFF, 0xF3, 0x64, 0xC0]) + bytes(140)
+FRAME_MS = 24
+SENTENCE_PATTERN = re.compile(r'[^。！？!?；;\n]+[。！？!?；;]*')
+
+STANDIN_VOICES: List[Dict[str, Any]] = [
+    {"Name": f"Standin Voice ({short_name})", "ShortName": short_name, "Gender": gender, "Locale": short_name.rsplit('-', 1)[0],
+     "FriendlyName": f"Standin {short_name} Online", "Status": "GA", "SuggestedCodec": "audio-24khz-48kbitrate-mono-mp3",
+     "VoiceTag": {"ContentCategories": ["General"], "VoicePersonalities": ["Friendly"]}}
+    for short_name, gender in [("zh-CN-StandinXiaoNeural", "Female"), ("zh-CN-StandinYunNeural", "Male"),
+                               ("en-US-StandinAvaNeural", "Female"), ("en-US-StandinGuyNeural", "Male")]
+]
+
+def _parse_percent(value: Optional[str]) -> float:
+    try:
+        return float(str(value).strip().rstrip('%'))
+    except (TypeError, ValueError):
+        return 0.0
+
+def create_app(speed: float = 1.0, chars_per_second: float = 4.5, first_byte_ms: int = 200, failure_rate: float = 0.0, seed: Optional[int] = None) -> web.Application:
+    rng = random.Random(seed)
+
+    async def synthesize(request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        text = payload.get('text', '')
+        if rng.random() < failure_rate:
+            return web.Response(status=503, text="模拟的服务端故障")
+        fail_midway = rng.random() < failure_rate
+
+        cps = chars_per_second * max(0.1, 1 + _parse_percent(payload.get('rate')) / 100)
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        await asyncio.sleep(first_byte_ms / 1000)
+
+        audio_frames = 0
+        sentences = [s for s in SENTENCE_PATTERN.findall(text) if s.strip()]
+        for index, sentence in enumerate(sentences):
+            if fail_midway and index == len(sentences) // 2:
+                await response.write((json.dumps({"type": "error", "message": "模拟的合成中断"}) + "\n").encode('utf-8'))
+                break
+            frames = max(1, math.ceil(len(sentence.strip()) / cps * 1000 / FRAME_MS))
+            await asyncio.sleep(frames * FRAME_MS / 1000 / speed)
+            boundary = {"type": "SentenceBoundary", "offset": audio_frames * FRAME_MS * 10_000, "duration": frames * FRAME_MS * 10_000, "text": sentence.strip()}
+            audio = {"type": "audio", "data": base64.b64encode(SILENT_FRAME * frames).decode('ascii')}
+            await response.write("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in (boundary, audio)).encode('utf-8'))
+            audio_frames += frames
+        await response.write_eof()
+        return response
+
+    async def voices(request: web.Request) -> web.Response:
+        return web.json_response(STANDIN_VOICES)
+
+    app = web.Application()
+    app.router.add_post("/synthesize", synthesize)
+    app.router.add_get("/voices", voices)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟TTS服务，输出确定性的音频与句子边界事件，用于离线压测")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=1.0, help="合成速度（相对实时的倍数）")
+    parser.add_argument("--chars-per-second", type=float, default=4.5, help="语速：每秒音频对应的字数")
+    parser.add_argument("--first-byte-ms", type=int, default=200, help="首包延迟（毫秒）")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="请求失败概率（拒绝请求与中途失败各按此概率注入）")
+    parser.add_argument("--seed", type=int, help="随机种子，用于复现故障注入")
+    args = parser.parse_args()
+    web.run_app(create_app(args.speed, args.chars_per_second, args.first_byte_ms, args.failure_rate, args.seed), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,59 @@
+from __future__ import annotations
+
 import os
 import re
-import pysrt
 import platform
+import shutil
 import traceback
 import subprocess
 import tempfile
-from datetime import timedelta
-from typing import Dict, Any, Optional
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+import contextlib
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+
+from ..config import Config
+from ..utils import progress, telemetry, word_timing
+from ..utils.stage_graph import StageGraph
+from ..utils.asset_cache import AssetCache
+from ..utils.content_cache import ContentCache
+from ..utils.job_store import JobStore
+from ..utils.lazy_import import lazy_module, load_module
+
+pysrt = lazy_module("pysrt")
+Image = lazy_module("PIL.Image")
+ImageDraw = lazy_module("PIL.ImageDraw")
+ImageFont = lazy_module("PIL.ImageFont")
+ImageFilter = lazy_module("PIL.ImageFilter")
 
 class VideoCreationService:
+    SUBTITLE_FONT_SIZE = 42
+    SUBTITLE_MARGIN_V = 80
+    SUBTITLE_PLAY_RES_Y = 288
+    SUBTITLE_PUNCTUATION = '，。！？、,.:;!?'
+    STILL_FRAME_MAX_HOLD_MS = 1000
+    SEGMENT_FRAME_RATE = 25
+    MIN_SEGMENT_MS = 2000
+    BGM_VOLUME = 0.15
+    AUDIO_CODEC_ARGS = ['-c:a', 'aac', '-b:a', '192k']
+    TEMPLATE_VERSION = 1
+    _render_cache: Optional[ContentCache] = None
+    _audio_cache: Optional[ContentCache] = None
+
+    @staticmethod
+    def get_render_cache() -> ContentCache:
+        if VideoCreationService._render_cache is None:
+            VideoCreationService._render_cache = ContentCache(Config.RENDER_CACHE_DIR, Config.RENDER_CACHE_MAX_BYTES)
+        return VideoCreationService._render_cache
+
+    @staticmethod
+    def get_audio_cache() -> ContentCache:
+        if VideoCreationService._audio_cache is None:
+            VideoCreationService._audio_cache = ContentCache(Config.AUDIO_CACHE_DIR, Config.AUDIO_CACHE_MAX_BYTES)
+        return VideoCreationService._audio_cache
+
     @staticmethod
     def create_video_background(avatar_path: str, font_path: str, output_path: str, author_name: str, sub_text: str, width: int = 1920, height: int = 1080) -> bool:
         try:
@@ -17,20 +61,16 @@ class VideoCreationService:
             draw = ImageDraw.Draw(img)
 
             try:
-                avatar = Image.open(avatar_path).convert("RGBA")
                 avatar_size = 200
-                avatar = avatar.resize((avatar_size, avatar_size), Image.Resampling.LANCZOS)
-                mask = Image.new('L', (avatar_size, avatar_size), 0)
-                draw_mask = ImageDraw.Draw(mask)
-                draw_mask.ellipse((0, 0, avatar_size, avatar_size), fill=255)
+                avatar = AssetCache.get_circular_avatar(avatar_path, avatar_size)
                 avatar_x = (width - avatar_size) // 2
                 avatar_y = 150
-                img.paste(avatar, (avatar_x, avatar_y), mask)
+                img.paste(avatar, (avatar_x, avatar_y), avatar)
             except (FileNotFoundError, IOError) as e:
                 print(f"警告: 加载头像文件 '{avatar_path}' 失败: {e}。将跳过头像绘制。")
 
             try:
-                font = ImageFont.truetype(font_path, size=36)
+                font = AssetCache.get_font(font_path, 36)
             except IOError:
                 print(f"错误: 无法加载字体文件 '{font_path}'。")
                 return False
@@ -61,9 +101,9 @@ class VideoCreationService:
             scale_factor = width / 540.0
 
             try:
-                title_font = ImageFont.truetype(font_path, size=int(80 * scale_factor))
-                subtitle_font = ImageFont.truetype(font_path, size=int(40 * scale_factor))
-                author_font = ImageFont.truetype(font_path, size=int(40 * scale_factor))
+                title_font = AssetCache.get_font(font_path, int(80 * scale_factor))
+                subtitle_font = AssetCache.get_font(font_path, int(40 * scale_factor))
+                author_font = AssetCache.get_font(font_path, int(40 * scale_factor))
             except IOError:
                 print(f"错误: 无法加载字体文件 '{font_path}'。")
                 return False
@@ -86,14 +126,11 @@ class VideoCreationService:
             content_draw.line((line_x1, line_y, line_x2, line_y), fill=text_fill_color, width=int(2 * scale_factor))
 
             try:
-                avatar_rgba = Image.open(avatar_path).convert("RGBA")
                 avatar_size = int(130 * scale_factor)
-                avatar_rgba = avatar_rgba.resize((avatar_size, avatar_size), Image.Resampling.LANCZOS)
-                mask = Image.new('L', (avatar_size, avatar_size), 0)
-                ImageDraw.Draw(mask).ellipse((0, 0, avatar_size, avatar_size), fill=255)
+                avatar_rgba = AssetCache.get_circular_avatar(avatar_path, avatar_size)
                 avatar_x = content_width - avatar_size - int(60 * scale_factor)
                 avatar_y = line_y + int(20 * scale_factor)
-                content_img.paste(avatar_rgba, (avatar_x, avatar_y), mask)
+                content_img.paste(avatar_rgba, (avatar_x, avatar_y), avatar_rgba)
             except (FileNotFoundError, IOError):
                 print(f"警告: 未找到头像文件 '{avatar_path}'。将跳过头像绘制。")
                 avatar_size, avatar_y = 0, 0
@@ -115,88 +152,136 @@ class VideoCreationService:
             return False
 
     @staticmethod
-    def process_subtitles(input_srt_path: str, output_srt_path: str, max_chars_per_line: int, max_lines_per_sub: int) -> bool:
-        if not os.path.exists(input_srt_path):
-            print(f"错误: 字幕文件 '{input_srt_path}' 不存在。")
+    def get_video_background(avatar_path: str, font_path: str, work_dir: str, author_name: str, sub_text: str, width: int = 1920, height: int = 1080) -> Optional[str]:
+        cache = VideoCreationService.get_render_cache()
+        key = ContentCache.make_key('background', VideoCreationService.TEMPLATE_VERSION, ContentCache.hash_file(avatar_path), ContentCache.hash_file(font_path), author_name, sub_text, width, height)
+        cached_path = cache.get(key, '.jpg')
+        if cached_path:
+            print("命中渲染缓存，复用视频背景图。")
+            return cached_path
+
+        output_path = os.path.join(work_dir, "background.jpg")
+        if not VideoCreationService.create_video_background(avatar_path, font_path, output_path, author_name, sub_text, width, height):
+            return None
+        try:
+            return cache.put(key, '.jpg', output_path)
+        except OSError as e:
+            print(f"警告: 写入渲染缓存失败: {e}")
+            return output_path
+
+    @staticmethod
+    def get_cover_image(title: str, subtitle: str, author_name: str, avatar_path: str, font_path: str, output_path: str, width: int = 900, height: int = 1200) -> bool:
+        cache = VideoCreationService.get_render_cache()
+        key = ContentCache.make_key('cover', VideoCreationService.TEMPLATE_VERSION, ContentCache.hash_file(avatar_path), ContentCache.hash_file(font_path), title, subtitle, author_name, width, height)
+        cached_path = cache.get(key, '.jpg')
+        if cached_path:
+            try:
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                shutil.copyfile(cached_path, output_path)
+                print("命中渲染缓存，复用封面图。")
+                return True
+            except OSError as e:
+                print(f"警告: 复制缓存封面图失败: {e}，将重新生成。")
+
+        if not VideoCreationService.create_cover_image(title, subtitle, author_name, avatar_path, font_path, output_path, width, height):
             return False
         try:
-            subs = pysrt.open(input_srt_path, encoding='utf-8')
-            char_timestamps = []
-            full_text_list = []
-            for sub in subs:
-                text = sub.text_without_tags.strip().replace('\n', ' ')
-                if not text: continue
+            cache.put(key, '.jpg', output_path)
+        except OSError as e:
+            print(f"警告: 写入渲染缓存失败: {e}")
+        return True
 
-                duration_ms = sub.end.ordinal - sub.start.ordinal
-                time_per_char = duration_ms / len(text) if len(text) > 0 else 0
+    @staticmethod
+    def _collect_timed_text(entries: Iterable[Tuple[int, int, str]]) -> Tuple[str, array]:
+        char_times = array('i')
+        full_text_list = []
+        for start_ms, end_ms, text in entries:
+            text = text.strip().replace('\n', ' ')
+            if not text: continue
+
+            time_per_char = (end_ms - start_ms) / len(text)
+            char_times.extend(start_ms + int(i * time_per_char) for i in range(len(text)))
+            full_text_list.append(text)
+        return "".join(full_text_list), char_times
 
-                for i, char in enumerate(text):
-                    char_time = pysrt.SubRipTime.from_ordinal(sub.start.ordinal + int(i * time_per_char))
-                    char_timestamps.append(char_time)
+    @staticmethod
+    def _segment_timed_text(full_text: str, char_times: array, max_chars_per_line: int, max_lines_per_sub: int) -> List[Tuple[int, int, str]]:
+        punctuation_marks = VideoCreationService.SUBTITLE_PUNCTUATION
+        clauses = re.split(f'([{punctuation_marks}])', full_text)
+
+        final_lines = []
+        for i in range(0, len(clauses), 2):
+            clause = (clauses[i] + (clauses[i + 1] if i + 1 < len(clauses) else '')).strip()
+            for pos in range(0, len(clause), max_chars_per_line):
+                final_lines.append(clause[pos:pos + max_chars_per_line])
+
+        cues = []
+        char_offset, total_chars = 0, len(char_times)
+        for i in range(0, len(final_lines), max_lines_per_sub):
+            text_block_lines = final_lines[i : i + max_lines_per_sub]
+            if len(text_block_lines) > 1 and len(text_block_lines[-1]) == 1 and text_block_lines[-1] in punctuation_marks:
+                punctuation = text_block_lines.pop()
+                text_block_lines[-1] += punctuation
+
+            new_text = '\n'.join(text_block_lines).strip()
+            if not new_text: continue
+
+            cleaned_text = new_text.lstrip(punctuation_marks)
+            text_length_for_sub = sum(len(line) for line in text_block_lines)
+
+            if not cleaned_text:
+                char_offset += text_length_for_sub
+                continue
 
-                full_text_list.append(text)
+            start_char_idx, end_char_idx = char_offset, char_offset + text_length_for_sub - 1
+            if start_char_idx >= total_chars or end_char_idx >= total_chars:
+                continue
 
-            full_text = "".join(full_text_list)
-            if not full_text:
-                print("警告: 字幕文件内容为空。")
-                with open(output_srt_path, 'w', encoding='utf-8') as f: pass
-                return True
+            start_ms, end_ms = char_times[start_char_idx], char_times[end_char_idx]
+            if end_ms < start_ms:
+                end_ms = start_ms + 100
 
-            clauses = re.split(r'([，。！？、,.:;!?])', full_text)
-            semantic_clauses = [clauses[i] + (clauses[i+1] if i + 1 < len(clauses) else '') for i in range(0, len(clauses), 2)]
-
-            final_lines = []
-            for clause in semantic_clauses:
-                clause = clause.strip()
-                if not clause: continue
-                while len(clause) > max_chars_per_line:
-                    final_lines.append(clause[:max_chars_per_line])
-                    clause = clause[max_chars_per_line:]
-                if clause:
-                    final_lines.append(clause)
-
-            new_subs = pysrt.SubRipFile()
-            char_offset = 0
-            punctuation_marks = '，。！？、,.:;!?'
-
-            for i in range(0, len(final_lines), max_lines_per_sub):
-                text_block_lines = final_lines[i : i + max_lines_per_sub]
-                if len(text_block_lines) > 1 and len(text_block_lines[-1]) == 1 and text_block_lines[-1] in punctuation_marks:
-                    punctuation = text_block_lines.pop()
-                    text_block_lines[-1] += punctuation
-
-                new_text = '\n'.join(text_block_lines).strip()
-                if not new_text: continue
-
-                cleaned_text = new_text.lstrip(punctuation_marks)
-                text_length_for_sub = len("".join(text_block_lines))
-
-                if not cleaned_text:
-                    char_offset += text_length_for_sub
-                    continue
+            lines = cleaned_text.split('\n')
+            if len(lines) == 2:
+                combined = "".join(lines)
+                cleaned_text = combined if len(combined) <= max_chars_per_line else f"{combined[:max_chars_per_line]}\n{combined[max_chars_per_line:]}"
 
-                start_char_idx, end_char_idx = char_offset, char_offset + text_length_for_sub - 1
+            cues.append((start_ms, end_ms, cleaned_text))
+            char_offset += text_length_for_sub
+        return cues
 
-                if start_char_idx >= len(char_timestamps) or end_char_idx >= len(char_timestamps):
-                    continue
+    @staticmethod
+    def segment_cue(start_ms: int, end_ms: int, text: str, max_chars_per_line: int, max_lines_per_sub: int) -> List[Tuple[int, int, str]]:
+        full_text, char_times = VideoCreationService._collect_timed_text([(start_ms, end_ms, text)])
+        return VideoCreationService._segment_timed_text(full_text, char_times, max_chars_per_line, max_lines_per_sub) if full_text else []
 
-                start_time, end_time = char_timestamps[start_char_idx], char_timestamps[end_char_idx]
-                if end_time < start_time:
-                    end_time = start_time + timedelta(milliseconds=100)
+    @staticmethod
+    def _format_srt_time(ms: int) -> str:
+        ms = max(ms, 0)
+        return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
 
-                new_subs.append(pysrt.SubRipItem(index=len(new_subs) + 1, start=start_time, end=end_time, text=cleaned_text))
-                char_offset += text_length_for_sub
+    @staticmethod
+    def _save_cues(cues: List[Tuple[int, int, str]], output_srt_path: str) -> None:
+        fmt = VideoCreationService._format_srt_time
+        with open(output_srt_path, 'w', encoding='utf-8', newline='') as f:
+            f.write("".join(f"{index}\n{fmt(start_ms)} --> {fmt(end_ms)}\n{text}\n\n" for index, (start_ms, end_ms, text) in enumerate(cues, 1)).replace('\n', os.linesep))
 
-            for sub in new_subs:
-                lines = sub.text.split('\n')
-                if len(lines) == 2:
-                    combined = "".join(lines)
-                    if len(combined) <= max_chars_per_line:
-                        sub.text = combined
-                    else:
-                        sub.text = f"{combined[:max_chars_per_line]}\n{combined[max_chars_per_line:]}"
+    @staticmethod
+    def process_subtitles(input_srt_path: str, output_srt_path: str, max_chars_per_line: int, max_lines_per_sub: int, timing_entries: Optional[List[Tuple[int, int, str]]] = None) -> bool:
+        if timing_entries is None and not os.path.exists(input_srt_path):
+            print(f"错误: 字幕文件 '{input_srt_path}' 不存在。")
+            return False
+        try:
+            if timing_entries is None:
+                timing_entries = ((sub.start.ordinal, sub.end.ordinal, sub.text_without_tags) for sub in pysrt.open(input_srt_path, encoding='utf-8'))
+            full_text, char_times = VideoCreationService._collect_timed_text(timing_entries)
+            if not full_text:
+                print("警告: 字幕文件内容为空。")
+                with open(output_srt_path, 'w', encoding='utf-8') as f: pass
+                return True
 
-            new_subs.save(output_srt_path, encoding='utf-8')
+            cues = VideoCreationService._segment_timed_text(full_text, char_times, max_chars_per_line, max_lines_per_sub)
+            VideoCreationService._save_cues(cues, output_srt_path)
             return True
         except Exception as e:
             print(f"处理字幕时发生严重错误: {e}\n{traceback.format_exc()}")
@@ -209,76 +294,514 @@ class VideoCreationService:
         return path
 
     @staticmethod
-    def create_video_with_ffmpeg(background_image: str, audio_file: str, srt_file: str, font_path: str, output_file: str, use_gpu: bool, bgm_file: Optional[str]) -> bool:
-        for file_path, name in [(background_image, "背景图片"), (audio_file, "音频文件"), (srt_file, "字幕文件"), (font_path, "字体文件")]:
-            if not os.path.exists(file_path):
-                print(f"错误: {name} '{file_path}' 不存在。合成中止。")
-                return False
+    def _quote_concat_path(path: str) -> str:
+        return "'" + path.replace('\\', '/').replace("'", "'\\''") + "'"
+
+    @staticmethod
+    def _append_audio_inputs(command: list, audio_file: str, bgm_file: Optional[str], audio_index: int) -> Tuple[List[str], List[str]]:
+        command.extend(['-i', audio_file])
+        if bgm_file and os.path.exists(bgm_file):
+            command.extend(['-stream_loop', '-1', '-i', bgm_file])
+            return [f"[{audio_index + 1}:a]volume={VideoCreationService.BGM_VOLUME}[bgm];[{audio_index}:a][bgm]amix=inputs=2:duration=first[a]"], ['-map', '[a]']
+        return [], ['-map', f'{audio_index}:a']
+
+    @staticmethod
+    def _audio_codec_args(copy_audio: bool) -> List[str]:
+        return ['-c:a', 'copy'] if copy_audio else list(VideoCreationService.AUDIO_CODEC_ARGS)
+
+    @staticmethod
+    def create_audio_track(audio_file: str, bgm_file: Optional[str], output_file: str) -> bool:
+        if not os.path.exists(audio_file):
+            print(f"错误: 音频文件 '{audio_file}' 不存在。")
+            return False
+        command = ['ffmpeg', '-y']
+        audio_filters, audio_maps = VideoCreationService._append_audio_inputs(command, audio_file, bgm_file, 0)
+        if audio_filters:
+            command.extend(['-filter_complex', ";".join(audio_filters)])
+        command.extend([*audio_maps, '-vn', *VideoCreationService.AUDIO_CODEC_ARGS, output_file])
+        return VideoCreationService._run_ffmpeg(command, VideoCreationService._probe_duration(audio_file), stage='audio')
 
+    @staticmethod
+    def get_audio_track(audio_file: str, bgm_file: Optional[str], work_dir: str) -> Optional[str]:
+        cache = VideoCreationService.get_audio_cache()
+        bgm_hash = ContentCache.hash_file(bgm_file)
+        key = ContentCache.make_key('audio_track', ContentCache.hash_file(audio_file), bgm_hash,
+                                    VideoCreationService.BGM_VOLUME if bgm_hash != "missing" else None, VideoCreationService.AUDIO_CODEC_ARGS)
+        cached_path = cache.get(key, '.m4a')
+        if cached_path:
+            print("命中音频缓存，复用已混音的音轨。")
+            return cached_path
+
+        output_path = os.path.join(work_dir, "audio_track.m4a")
+        if not VideoCreationService.create_audio_track(audio_file, bgm_file, output_path):
+            return None
+        try:
+            return cache.put(key, '.m4a', output_path)
+        except OSError as e:
+            print(f"警告: 写入音频缓存失败: {e}")
+            return output_path
+
+    @staticmethod
+    def _parse_progress_value(value: Optional[str]) -> Optional[float]:
+        try:
+            return float(value.strip().rstrip('x')) if value else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _run_ffmpeg(command: list, total_duration: Optional[float] = None, stats: Optional[Dict[str, Any]] = None, stage: str = 'encode', progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                    input_feeder: Optional[Callable[[subprocess.Popen], None]] = None) -> bool:
+        command = [command[0], '-progress', 'pipe:1', '-nostats', *command[1:]]
+        popen_kwargs = {'stdout': subprocess.PIPE, 'stderr': subprocess.PIPE, 'text': True, 'encoding': 'utf-8', 'errors': 'ignore'}
+        if input_feeder:
+            popen_kwargs['stdin'] = subprocess.PIPE
+        if platform.system() == "Windows":
+            popen_kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+
+        start = time.perf_counter()
+        try:
+            process = subprocess.Popen(command, **popen_kwargs)
+        except FileNotFoundError:
+            print("错误: 'ffmpeg' 命令未找到。请确保FFmpeg已安装并添加到系统PATH环境变量中。")
+            return False
+
+        stderr_lines: List[str] = []
+        stderr_reader = threading.Thread(target=lambda: stderr_lines.extend(process.stderr), daemon=True)
+        stderr_reader.start()
+        feeder = threading.Thread(target=input_feeder, args=(process,), daemon=True) if input_feeder else None
+        if feeder:
+            feeder.start()
+
+        block: Dict[str, str] = {}
+        last_emit = 0.0
+        last_speed: Optional[float] = None
+        cancelled = False
+        for line in process.stdout:
+            key, sep, value = line.strip().partition('=')
+            if not sep:
+                continue
+            block[key] = value
+            if key != 'progress':
+                continue
+
+            out_time_us = VideoCreationService._parse_progress_value(block.get('out_time_us') or block.get('out_time_ms'))
+            out_time = out_time_us / 1_000_000 if out_time_us is not None and out_time_us >= 0 else None
+            now = time.perf_counter()
+            elapsed = now - start
+            if value == 'end' or now - last_emit >= 0.5:
+                last_emit = now
+                percent = 100.0 if value == 'end' else (min(out_time / total_duration * 100, 100.0) if out_time and total_duration else None)
+                eta = elapsed * (100 - percent) / percent if percent else None
+                fields = {'stage': stage, 'out_time': out_time, 'duration': total_duration, 'percent': percent, 'eta': eta,
+                          'frame': VideoCreationService._parse_progress_value(block.get('frame')),
+                          'fps': VideoCreationService._parse_progress_value(block.get('fps')),
+                          'speed': VideoCreationService._parse_progress_value(block.get('speed'))}
+                last_speed = fields['speed'] or last_speed
+                if progress_callback:
+                    progress_callback(fields)
+                else:
+                    progress.emit('ffmpeg_progress', **fields)
+            if stats is not None:
+                stats['out_time'] = out_time
+                stats['frames'] = VideoCreationService._parse_progress_value(block.get('frame'))
+                stats['avg_fps'] = VideoCreationService._parse_progress_value(block.get('fps'))
+            block = {}
+            if progress.cancel_requested():
+                cancelled = True
+                process.terminate()
+                break
+
+        returncode = process.wait()
+        stderr_reader.join()
+        if feeder:
+            feeder.join()
+        wall_time = time.perf_counter() - start
+        output_file = command[-1]
+        output_bytes = os.path.getsize(output_file) if returncode == 0 and os.path.exists(output_file) else 0
+        status = 'cancelled' if cancelled else 'ok' if returncode == 0 else 'error'
+        telemetry.event('video', 'ffmpeg', wall_time, output_bytes, labels={'stage': re.sub(r'_\d+$', '', stage), 'status': status},
+                        values={'speed': last_speed, 'media_seconds': total_duration})
+        if cancelled:
+            raise progress.JobCancelled("任务已取消，FFmpeg 编码已停止。")
+        if returncode != 0:
+            print(f"FFmpeg 命令执行失败。返回码: {returncode}\n命令: {' '.join(command)}\n错误输出:\n{''.join(stderr_lines)}")
+            return False
+
+        if stats is not None:
+            media_duration = total_duration or stats.get('out_time')
+            stats.update({
+                'stage': stage,
+                'wall_time': wall_time,
+                'media_duration': media_duration,
+                'realtime_factor': media_duration / wall_time if media_duration and wall_time > 0 else None,
+                'output_bytes': output_bytes,
+                'output_bitrate_kbps': output_bytes * 8 / media_duration / 1000 if media_duration else None,
+            })
+        return True
+
+    @staticmethod
+    def _probe_duration(media_file: str) -> Optional[float]:
+        run_kwargs = {'capture_output': True, 'text': True, 'encoding': 'utf-8', 'errors': 'ignore'}
+        if platform.system() == "Windows":
+            run_kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+        try:
+            stderr = subprocess.run(['ffmpeg', '-hide_banner', '-i', media_file], **run_kwargs).stderr
+        except FileNotFoundError:
+            return None
+        match = re.search(r'Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)', stderr)
+        if not match:
+            return None
+        return int(match.group(1)) * 3600 + int(match.group(2)) * 60 + float(match.group(3))
+
+    @staticmethod
+    def _subtitle_filter(srt_file: str, font_path: str) -> str:
         sanitized_font_dir = VideoCreationService._escape_ffmpeg_path(os.path.dirname(os.path.abspath(font_path)))
         sanitized_srt_file = VideoCreationService._escape_ffmpeg_path(os.path.abspath(srt_file))
 
         try:
-            internal_font_name = ImageFont.truetype(font_path, size=10).getname()[0]
+            internal_font_name = AssetCache.get_font(font_path, 10).getname()[0]
         except Exception:
             internal_font_name = os.path.splitext(os.path.basename(font_path))[0]
 
-        subtitle_style = f"force_style='FontName={internal_font_name},FontSize=42,Alignment=2,MarginV=80,PrimaryColour=&HFFFFFF,Bold=1,Shadow=0.8'"
-        subtitle_filter = f"subtitles='{sanitized_srt_file}':fontsdir='{sanitized_font_dir}':{subtitle_style}"
+        subtitle_style = f"force_style='FontName={internal_font_name},FontSize={VideoCreationService.SUBTITLE_FONT_SIZE},Alignment=2,MarginV={VideoCreationService.SUBTITLE_MARGIN_V},PrimaryColour=&HFFFFFF,Bold=1,Shadow=0.8'"
+        return f"subtitles='{sanitized_srt_file}':fontsdir='{sanitized_font_dir}':{subtitle_style}"
 
-        command = ['ffmpeg', '-y', '-loop', '1', '-i', background_image, '-i', audio_file]
-        maps, filter_complex_parts = [], [f"[0:v]{subtitle_filter}[v]"]
-        maps.extend(['-map', '[v]'])
+    @staticmethod
+    def _video_codec_args(use_gpu: bool) -> List[str]:
+        if use_gpu:
+            return ['-c:v', 'h264_nvenc', '-preset', 'fast', '-cq', '24']
+        return ['-c:v', 'libx264', '-preset', 'fast', '-crf', '18']
 
-        if bgm_file and os.path.exists(bgm_file):
-            command.extend(['-stream_loop', '-1', '-i', bgm_file])
-            filter_complex_parts.append("[2:a]volume=0.15[bgm];[1:a][bgm]amix=inputs=2:duration=first[a]")
-            maps.extend(['-map', '[a]'])
-        else:
-            maps.extend(['-map', '1:a'])
+    @staticmethod
+    def create_video_with_ffmpeg(background_image: str, audio_file: str, srt_file: str, font_path: str, output_file: str, use_gpu: bool, bgm_file: Optional[str], stats: Optional[Dict[str, Any]] = None, segments: int = 1, segment_seconds: Optional[float] = None, copy_audio: bool = False, work_dir: Optional[str] = None) -> bool:
+        for file_path, name in [(background_image, "背景图片"), (audio_file, "音频文件"), (srt_file, "字幕文件"), (font_path, "字体文件")]:
+            if not os.path.exists(file_path):
+                print(f"错误: {name} '{file_path}' 不存在。合成中止。")
+                return False
 
-        command.extend(['-filter_complex', ";".join(filter_complex_parts), *maps])
+        if segments > 1 or segment_seconds:
+            return VideoCreationService._create_video_segmented(background_image, audio_file, srt_file, font_path, output_file, use_gpu, bgm_file, stats, segments, segment_seconds, copy_audio, work_dir)
 
-        if use_gpu:
-            command.extend(['-c:v', 'h264_nvenc', '-preset', 'fast', '-cq', '24'])
-        else:
-            command.extend(['-c:v', 'libx264', '-preset', 'fast', '-crf', '18'])
+        command = ['ffmpeg', '-y', '-loop', '1', '-i', background_image]
+        audio_filters, audio_maps = VideoCreationService._append_audio_inputs(command, audio_file, bgm_file, 1)
+        subtitle_filter = VideoCreationService._subtitle_filter(srt_file, font_path)
+        command.extend(['-filter_complex', ";".join([f"[0:v]{subtitle_filter}[v]", *audio_filters]), '-map', '[v]', *audio_maps])
+        command.extend(VideoCreationService._video_codec_args(use_gpu))
+        command.extend([*VideoCreationService._audio_codec_args(copy_audio), '-shortest', '-pix_fmt', 'yuv420p', output_file])
+        return VideoCreationService._run_ffmpeg(command, VideoCreationService._probe_duration(audio_file), stats)
 
-        command.extend(['-c:a', 'aac', '-b:a', '192k', '-shortest', '-pix_fmt', 'yuv420p', output_file])
+    @staticmethod
+    def _plan_segments(cues: List[Tuple[int, int, str]], duration_ms: int, segments: int, segment_seconds: Optional[float]) -> List[int]:
+        frame_ms = 1000 // VideoCreationService.SEGMENT_FRAME_RATE
+        total_ms = -(-duration_ms // frame_ms) * frame_ms
+        if segment_seconds:
+            segments = max(1, round(total_ms / (segment_seconds * 1000)))
+        segments = max(1, min(segments, total_ms // VideoCreationService.MIN_SEGMENT_MS))
+
+        candidates = [cues[i][1] for i in range(len(cues) - 1) if cues[i + 1][0] >= cues[i][1]]
+        boundaries = [0]
+        for k in range(1, segments):
+            ideal = total_ms * k // segments
+            split = min(candidates, key=lambda t: abs(t - ideal)) if candidates else ideal
+            split = round(split / frame_ms) * frame_ms
+            if split - boundaries[-1] >= VideoCreationService.MIN_SEGMENT_MS and total_ms - split >= VideoCreationService.MIN_SEGMENT_MS:
+                boundaries.append(split)
+        boundaries.append(total_ms)
+        return boundaries
 
-        try:
-            run_kwargs = {'check': True, 'capture_output': True, 'text': True, 'encoding': 'utf-8', 'errors': 'ignore'}
-            if platform.system() == "Windows":
-                run_kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
-            subprocess.run(command, **run_kwargs)
-            return True
-        except FileNotFoundError:
-            print("错误: 'ffmpeg' 命令未找到。请确保FFmpeg已安装并添加到系统PATH环境变量中。")
-            return False
-        except subprocess.CalledProcessError as e:
-            print(f"FFmpeg 命令执行失败。返回码: {e.returncode}\n命令: {' '.join(command)}\n错误输出:\n{e.stderr}")
+    @staticmethod
+    def _create_video_segmented(background_image: str, audio_file: str, srt_file: str, font_path: str, output_file: str, use_gpu: bool, bgm_file: Optional[str], stats: Optional[Dict[str, Any]], segments: int, segment_seconds: Optional[float], copy_audio: bool, work_dir: Optional[str] = None) -> bool:
+        audio_duration = VideoCreationService._probe_duration(audio_file)
+        if not audio_duration:
+            print("错误: 无法获取音频时长，无法进行分段编码。")
             return False
 
+        subs = pysrt.open(srt_file, encoding='utf-8')
+        cues = [(sub.start.ordinal, sub.end.ordinal, sub.text) for sub in subs if sub.end.ordinal > sub.start.ordinal]
+        boundaries = VideoCreationService._plan_segments(cues, int(audio_duration * 1000), segments, segment_seconds)
+        segment_count = len(boundaries) - 1
+        workers = min(segment_count, os.cpu_count() or 1)
+        threads_per_encoder = str(max(1, (os.cpu_count() or 1) // workers))
+        print(f"分段编码: 共 {segment_count} 段，{workers} 路并行。")
+
+        start = time.perf_counter()
+        lock = threading.Lock()
+        segment_done = [0.0] * segment_count
+        last_emit = [0.0]
+
+        def make_progress_callback(index: int) -> Callable[[Dict[str, Any]], None]:
+            def callback(fields: Dict[str, Any]):
+                with lock:
+                    segment_seconds_total = (boundaries[index + 1] - boundaries[index]) / 1000
+                    segment_done[index] = segment_seconds_total if fields['percent'] == 100.0 else min(fields['out_time'] or 0.0, segment_seconds_total)
+                    now = time.perf_counter()
+                    if now - last_emit[0] < 0.5 and fields['percent'] != 100.0:
+                        return
+                    last_emit[0] = now
+                    done, elapsed = sum(segment_done), now - start
+                    percent = min(done / audio_duration * 100, 100.0)
+                    progress.emit('ffmpeg_progress', stage='segments', out_time=done, duration=audio_duration, percent=percent,
+                                  eta=elapsed * (100 - percent) / percent if percent else None, frame=None, fps=None,
+                                  speed=done / elapsed if elapsed > 0 else None)
+            return callback
+
+        if work_dir:
+            os.makedirs(work_dir, exist_ok=True)
+        encoder_key = ContentCache.make_key('segment', ContentCache.hash_file(background_image), ContentCache.hash_file(font_path), VideoCreationService._video_codec_args(use_gpu))
+        with (contextlib.nullcontext(work_dir) if work_dir else tempfile.TemporaryDirectory()) as segment_dir:
+            def encode_segment(index: int) -> bool:
+                seg_start, seg_end = boundaries[index], boundaries[index + 1]
+                seg_cues = [(max(s, seg_start) - seg_start, min(e, seg_end) - seg_start, text) for s, e, text in cues if s < seg_end and e > seg_start]
+                seg_output = os.path.join(segment_dir, f"segment_{index:04d}.mp4")
+                done_marker = seg_output + ".done"
+                segment_key = ContentCache.make_key(encoder_key, seg_start, seg_end, seg_cues)
+                if work_dir and os.path.exists(seg_output) and os.path.exists(done_marker):
+                    with open(done_marker, 'r', encoding='utf-8') as f:
+                        if f.read() == segment_key:
+                            print(f"分段 {index} 已在之前的运行中编码完成，跳过。")
+                            make_progress_callback(index)({'percent': 100.0, 'out_time': None})
+                            return True
+                progress.raise_if_cancelled()
+                seg_srt = os.path.join(segment_dir, f"segment_{index:04d}.srt")
+                VideoCreationService._save_cues(seg_cues, seg_srt)
+                frame_count = (seg_end - seg_start) * VideoCreationService.SEGMENT_FRAME_RATE // 1000
+                command = ['ffmpeg', '-y', '-loop', '1', '-framerate', str(VideoCreationService.SEGMENT_FRAME_RATE), '-i', background_image,
+                           '-vf', VideoCreationService._subtitle_filter(seg_srt, font_path), '-frames:v', str(frame_count), '-an',
+                           *VideoCreationService._video_codec_args(use_gpu), '-threads', threads_per_encoder, '-pix_fmt', 'yuv420p',
+                           seg_output]
+                encoded = VideoCreationService._run_ffmpeg(command, (seg_end - seg_start) / 1000, stage=f'segment_{index}', progress_callback=make_progress_callback(index))
+                if encoded and work_dir:
+                    with open(done_marker, 'w', encoding='utf-8') as f:
+                        f.write(segment_key)
+                return encoded
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(encode_segment, range(segment_count)))
+            if not all(results):
+                print("错误: 部分视频分段编码失败。")
+                return False
+
+            concat_list = os.path.join(segment_dir, "segments.txt")
+            with open(concat_list, 'w', encoding='utf-8') as f:
+                for index in range(segment_count):
+                    f.write(f"file {VideoCreationService._quote_concat_path(os.path.join(segment_dir, f'segment_{index:04d}.mp4'))}\n")
+
+            command = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', concat_list]
+            audio_filters, audio_maps = VideoCreationService._append_audio_inputs(command, audio_file, bgm_file, 1)
+            if audio_filters:
+                command.extend(['-filter_complex', ";".join(audio_filters)])
+            command.extend(['-map', '0:v', *audio_maps, '-c:v', 'copy', *VideoCreationService._audio_codec_args(copy_audio), '-shortest', output_file])
+            mux_stats: Dict[str, Any] = {}
+            if not VideoCreationService._run_ffmpeg(command, audio_duration, mux_stats, stage='mux'):
+                return False
+
+        if stats is not None:
+            wall_time = time.perf_counter() - start
+            stats.update(mux_stats)
+            stats.update({'stage': 'segments', 'segments': segment_count, 'wall_time': wall_time, 'mux_wall_time': mux_stats.get('wall_time'),
+                          'realtime_factor': audio_duration / wall_time if wall_time > 0 else None})
+        return True
+
     @staticmethod
-    def run_generation_workflow(params: Dict[str, Any]) -> str:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            bg_output = os.path.join(temp_dir, "background.jpg")
-            if not VideoCreationService.create_video_background(params['avatar'], params['font'], bg_output, params['author'], params['subtext']):
-                raise RuntimeError("生成视频背景图失败")
+    def _load_subtitle_font(font_path: str, frame_height: int) -> ImageFont.FreeTypeFont:
+        line_height = int(VideoCreationService.SUBTITLE_FONT_SIZE * frame_height / VideoCreationService.SUBTITLE_PLAY_RES_Y)
+        ascent, descent = AssetCache.get_font(font_path, line_height).getmetrics()
+        return AssetCache.get_font(font_path, max(1, line_height * line_height // (ascent + descent)))
 
-            if params['cover_title']:
-                cover_basename = f"cover_{os.path.splitext(os.path.basename(params['video_output']))[0]}.jpg"
-                cover_output_path = os.path.join(os.path.dirname(params['video_output']), cover_basename)
-                if not VideoCreationService.create_cover_image(params['cover_title'], params['cover_subtitle'], params['author'], params['avatar'], params['font'], cover_output_path):
-                    print("警告: 封面图生成失败，将继续。")
+    @staticmethod
+    def render_subtitle_frame(background: Image.Image, text: str, font: ImageFont.FreeTypeFont, output_path: str) -> None:
+        frame = background.copy()
+        draw = ImageDraw.Draw(frame)
+        scale = frame.height / VideoCreationService.SUBTITLE_PLAY_RES_Y
+        outline = max(1, round(scale))
+        shadow = max(1, round(0.8 * scale))
+        bbox = draw.multiline_textbbox((0, 0), text, font=font, align='center', stroke_width=outline)
+        x = (frame.width - (bbox[2] - bbox[0])) // 2 - bbox[0]
+        y = frame.height - int(VideoCreationService.SUBTITLE_MARGIN_V * scale) - (bbox[3] - bbox[1]) - bbox[1]
+        draw.multiline_text((x + shadow, y + shadow), text, font=font, fill='black', align='center', stroke_width=outline, stroke_fill='black')
+        draw.multiline_text((x, y), text, font=font, fill='white', align='center', stroke_width=outline, stroke_fill='black')
+        frame.save(output_path, 'JPEG', quality=95)
+
+    @staticmethod
+    def create_video_with_still_frames(background_image: str, audio_file: str, srt_file: str, font_path: str, output_file: str, use_gpu: bool, bgm_file: Optional[str], stats: Optional[Dict[str, Any]] = None, frame_rate: Optional[int] = None, copy_audio: bool = False) -> bool:
+        for file_path, name in [(background_image, "背景图片"), (audio_file, "音频文件"), (srt_file, "字幕文件"), (font_path, "字体文件")]:
+            if not os.path.exists(file_path):
+                print(f"错误: {name} '{file_path}' 不存在。合成中止。")
+                return False
+
+        try:
+            background = Image.open(background_image).convert('RGB')
+            font = VideoCreationService._load_subtitle_font(font_path, background.height)
+            subs = pysrt.open(srt_file, encoding='utf-8')
+        except Exception as e:
+            print(f"准备静态帧素材时发生错误: {e}")
+            return False
+
+        with tempfile.TemporaryDirectory() as frame_dir:
+            background_frame = os.path.abspath(background_image)
+            frames_by_text: Dict[str, str] = {}
+            timeline: List[Tuple[str, int]] = []
+            cursor = 0
+            for sub in subs:
+                start, end = max(sub.start.ordinal, cursor), sub.end.ordinal
+                if end <= start or not sub.text.strip():
+                    continue
+                if start > cursor:
+                    timeline.append((background_frame, start - cursor))
+                frame_path = frames_by_text.get(sub.text)
+                if frame_path is None:
+                    frame_path = os.path.join(frame_dir, f"frame_{len(frames_by_text):05d}.jpg")
+                    VideoCreationService.render_subtitle_frame(background, sub.text, font, frame_path)
+                    frames_by_text[sub.text] = frame_path
+                timeline.append((frame_path, end - start))
+                cursor = end
+
+            audio_duration = VideoCreationService._probe_duration(audio_file)
+            total_ms = int((audio_duration or 0) * 1000)
+            timeline.append((background_frame, max(total_ms - cursor, 1000)))
+
+            concat_list = os.path.join(frame_dir, "frames.txt")
+            with open(concat_list, 'w', encoding='utf-8') as f:
+                for frame_path, duration_ms in timeline:
+                    while duration_ms > 0:
+                        hold_ms = min(duration_ms, VideoCreationService.STILL_FRAME_MAX_HOLD_MS)
+                        f.write(f"file {VideoCreationService._quote_concat_path(frame_path)}\nduration {hold_ms / 1000:.3f}\n")
+                        duration_ms -= hold_ms
+                f.write(f"file {VideoCreationService._quote_concat_path(timeline[-1][0])}\n")
+            print(f"已生成 {len(frames_by_text)} 张字幕帧，时间轴共 {len(timeline)} 段。")
+
+            command = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', concat_list]
+            audio_filters, audio_maps = VideoCreationService._append_audio_inputs(command, audio_file, bgm_file, 1)
+            if audio_filters:
+                command.extend(['-filter_complex', ";".join(audio_filters)])
+            command.extend(['-map', '0:v', *audio_maps])
+            command.extend(['-r', str(frame_rate)] if frame_rate else ['-vsync', 'vfr'])
+
+            if use_gpu:
+                command.extend(['-c:v', 'h264_nvenc', '-preset', 'fast', '-cq', '24'])
             else:
-                print("未提供封面标题，跳过封面生成。")
+                command.extend(['-c:v', 'libx264', '-preset', 'fast', '-tune', 'stillimage', '-crf', '18'])
 
-            srt_processed_output = os.path.join(temp_dir, "subtitles_processed.srt")
-            if not VideoCreationService.process_subtitles(params['srt'], srt_processed_output, 12, 2):
-                raise RuntimeError("处理字幕文件失败")
+            command.extend([*VideoCreationService._audio_codec_args(copy_audio), '-shortest', '-pix_fmt', 'yuv420p', output_file])
+            return VideoCreationService._run_ffmpeg(command, audio_duration, stats)
 
-            if not VideoCreationService.create_video_with_ffmpeg(bg_output, params['audio'], srt_processed_output, params['font'], params['video_output'], params['use_gpu'], params['bgm']):
-                raise RuntimeError("FFmpeg合成视频失败, 请检查控制台错误日志。")
+    @staticmethod
+    def render_workflow_cover(params: Dict[str, Any]) -> str:
+        cover_basename = f"cover_{os.path.splitext(os.path.basename(params['video_output']))[0]}.jpg"
+        cover_output_path = os.path.join(os.path.dirname(params['video_output']), cover_basename)
+        if not VideoCreationService.get_cover_image(params['cover_title'], params['cover_subtitle'], params['author'], params['avatar'], params['font'], cover_output_path):
+            print("警告: 封面图生成失败，将继续。")
+            return ''
+        return cover_output_path
+
+    @staticmethod
+    def run_generation_workflow(params: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
+        for module_name in Config.RENDER_MODULES:
+            load_module(module_name)
+        store = JobStore() if job_id else None
+        if store:
+            store.update_job(job_id, 'running')
+            progress.set_cancel_check(store.cancel_checker(job_id))
+        try:
+            result = VideoCreationService._run_workflow_stages(params, store, job_id)
+        except progress.JobCancelled:
+            if store:
+                store.update_job(job_id, 'cancelled')
+                print("任务已取消，已完成的阶段将在恢复时跳过。")
+            raise
+        except Exception as e:
+            if store:
+                store.update_job(job_id, 'failed', str(e))
+            raise
+        finally:
+            progress.set_cancel_check(None)
+        if store:
+            store.update_job(job_id, 'finished')
+            store.remove_work_dir(job_id)
+        return result
+
+    @staticmethod
+    def _workflow_stage_keys(params: Dict[str, Any]) -> Dict[str, str]:
+        avatar_hash, font_hash = ContentCache.hash_file(params['avatar']), ContentCache.hash_file(params['font'])
+        audio_hash = ContentCache.hash_file(params['audio'])
+        keys = {
+            'background': ContentCache.make_key('background', VideoCreationService.TEMPLATE_VERSION, avatar_hash, font_hash, params['author'], params['subtext']),
+            'subtitles': ContentCache.make_key('subtitles', ContentCache.hash_file(params['srt']), audio_hash, ContentCache.hash_file(word_timing.sidecar_path(params['audio']))),
+            'audio': ContentCache.make_key('audio', audio_hash, ContentCache.hash_file(params['bgm'])),
+            'cover': ContentCache.make_key('cover', VideoCreationService.TEMPLATE_VERSION, avatar_hash, font_hash, params['cover_title'], params['cover_subtitle'], params['author'], params['video_output']),
+        }
+        keys['encode'] = ContentCache.make_key('encode', keys['background'], keys['subtitles'], keys['audio'], font_hash, params['video_output'], params['use_gpu'],
+                                               params.get('still_frames'), params.get('segments'), params.get('segment_seconds'))
+        return keys
 
-        return params['video_output']
\ No newline at end of file
+    @staticmethod
+    def _run_workflow_stages(params: Dict[str, Any], store: Optional[JobStore], job_id: Optional[str]) -> Dict[str, Any]:
+        encode_stats: Dict[str, Any] = {}
+        stage_keys = VideoCreationService._workflow_stage_keys(params) if store else {}
+
+        def tracked(name: str, func: Callable[[], Any]) -> Callable[[], Any]:
+            if not store:
+                return func
+            return lambda: store.run_stage(job_id, name, stage_keys[name], func)
+
+        with (contextlib.nullcontext(store.work_dir(job_id)) if store else tempfile.TemporaryDirectory()) as temp_dir:
+            srt_processed_output = os.path.join(temp_dir, "subtitles_processed.srt")
+
+            def background_stage() -> str:
+                bg_output = VideoCreationService.get_video_background(params['avatar'], params['font'], temp_dir, params['author'], params['subtext'])
+                if not bg_output:
+                    raise RuntimeError("生成视频背景图失败")
+                return bg_output
+
+            def subtitles_stage() -> str:
+                timing_entries = word_timing.load_for_subtitles(params['audio'], params['srt'])
+                if timing_entries is not None:
+                    print("检测到TTS时间戳文件，直接使用语音边界时间生成字幕。")
+                if not VideoCreationService.process_subtitles(params['srt'], srt_processed_output, 12, 2, timing_entries):
+                    raise RuntimeError("处理字幕文件失败")
+                return srt_processed_output
+
+            def audio_stage() -> str:
+                audio_track = VideoCreationService.get_audio_track(params['audio'], params['bgm'], temp_dir)
+                if not audio_track:
+                    raise RuntimeError("生成音轨失败")
+                return audio_track
+
+            def cover_stage() -> str:
+                return VideoCreationService.render_workflow_cover(params)
+
+            def encode_stage() -> str:
+                compose_args = (graph.results['background'], graph.results['audio'], graph.results['subtitles'], params['font'], params['video_output'], params['use_gpu'], None, encode_stats)
+                if params.get('still_frames'):
+                    composed = VideoCreationService.create_video_with_still_frames(*compose_args, copy_audio=True)
+                else:
+                    composed = VideoCreationService.create_video_with_ffmpeg(*compose_args, segments=params.get('segments') or 1, segment_seconds=params.get('segment_seconds'), copy_audio=True,
+                                                                       work_dir=os.path.join(temp_dir, "segments") if store else None)
+                if not composed:
+                    raise RuntimeError("FFmpeg合成视频失败, 请检查控制台错误日志。")
+                return params['video_output']
+
+            graph = StageGraph(service='video')
+            graph.add('background', tracked('background', background_stage))
+            graph.add('subtitles', tracked('subtitles', subtitles_stage))
+            graph.add('audio', tracked('audio', audio_stage))
+            if params['cover_title']:
+                graph.add('cover', tracked('cover', cover_stage))
+            else:
+                print("未提供封面标题，跳过封面生成。")
+            graph.add('encode', tracked('encode', encode_stage), deps=('background', 'subtitles', 'audio'))
+            graph.run()
+
+        stage_report = graph.report()
+        for name, timing in stage_report['stages'].items():
+            print(f"阶段 {name}: {timing['start']:.2f}s -> {timing['end']:.2f}s，耗时 {timing['duration']:.2f}s")
+        print(f"关键路径: {' -> '.join(stage_report['critical_path'])}，总耗时 {stage_report['wall_time']:.2f}s")
+
+        cache_stats = VideoCreationService.get_render_cache().stats()
+        print(f"渲染缓存统计: 命中 {cache_stats['hits']} 次，未命中 {cache_stats['misses']} 次。")
+        audio_cache_stats = VideoCreationService.get_audio_cache().stats()
+        print(f"音频缓存统计: 命中 {audio_cache_stats['hits']} 次，未命中 {audio_cache_stats['misses']} 次。")
+        if encode_stats.get('realtime_factor'):
+            print(f"编码统计: 实时倍率 {encode_stats['realtime_factor']:.2f}x，输出码率 {encode_stats['output_bitrate_kbps']:.0f} kbps。")
+
+        return {'video_output': params['video_output'], 'cover_output': graph.results.get('cover') or '', 'encode_stats': encode_stats, 'stage_timings': stage_report}
\ No newline at end of file
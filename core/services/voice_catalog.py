@@ -0,0 +1,93 @@
+import time
+import bisect
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Set
+
+from ..utils.data_manager import DataManager
+
+class VoiceCatalog:
+    FORMAT_VERSION = 1
+
+    def __init__(self, voices: List[Dict[str, Any]], fetched_at: float = 0.0, digest: Optional[str] = None):
+        self.voices = sorted(voices, key=lambda v: v['ShortName'])
+        self.fetched_at = fetched_at
+        self.digest = digest or VoiceCatalog.compute_digest(self.voices)
+
+        self.by_language: Dict[str, List[int]] = {}
+        self.by_locale: Dict[str, List[int]] = {}
+        self.by_gender: Dict[str, List[int]] = {}
+        self.by_name: Dict[str, int] = {}
+        for row, voice in enumerate(self.voices):
+            locale = voice.get('Locale', '')
+            self.by_language.setdefault(locale.split('-')[0], []).append(row)
+            self.by_locale.setdefault(locale, []).append(row)
+            self.by_gender.setdefault(voice.get('Gender', ''), []).append(row)
+            self.by_name[voice['ShortName']] = row
+
+        name_index = sorted((voice['ShortName'].lower(), row) for row, voice in enumerate(self.voices))
+        self._sorted_names = [name for name, _ in name_index]
+        self._sorted_rows = [row for _, row in name_index]
+        self._search_keys = [" ".join([voice['ShortName'], voice.get('FriendlyName', ''), voice.get('Locale', '')]).lower() for voice in self.voices]
+
+    @staticmethod
+    def compute_digest(voices: List[Dict[str, Any]]) -> str:
+        payload = json.dumps(sorted(voices, key=lambda v: v['ShortName']), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.voices)
+
+    def languages(self) -> List[str]:
+        return sorted(self.by_language)
+
+    def genders(self) -> List[str]:
+        return sorted(self.by_gender)
+
+    def voice(self, short_name: str) -> Optional[Dict[str, Any]]:
+        row = self.by_name.get(short_name)
+        return self.voices[row] if row is not None else None
+
+    def filter_rows(self, language: str = "all", gender: str = "all", locale: str = "all") -> Set[int]:
+        rows: Optional[Set[int]] = None
+        for value, index in ((language, self.by_language), (locale, self.by_locale), (gender, self.by_gender)):
+            if value == "all":
+                continue
+            matched = set(index.get(value, ()))
+            rows = matched if rows is None else rows & matched
+        return set(range(len(self.voices))) if rows is None else rows
+
+    def prefix_rows(self, prefix: str) -> Set[int]:
+        prefix = prefix.strip().lower()
+        start = bisect.bisect_left(self._sorted_names, prefix)
+        end = bisect.bisect_left(self._sorted_names, prefix + "\uffff")
+        return set(self._sorted_rows[start:end])
+
+    def search_rows(self, query: str) -> Set[int]:
+        query = query.strip().lower()
+        if not query:
+            return set(range(len(self.voices)))
+        if '-' in query:
+            return self.prefix_rows(query)
+        return {row for row, key in enumerate(self._search_keys) if query in key}
+
+    def query(self, language: str = "all", gender: str = "all", text: str = "") -> List[Dict[str, Any]]:
+        return [self.voices[row] for row in sorted(self.filter_rows(language, gender) & self.search_rows(text))]
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def is_stale(self, ttl: float) -> bool:
+        return self.age() >= ttl
+
+    def save(self, path: str) -> bool:
+        return DataManager.save_json({'version': VoiceCatalog.FORMAT_VERSION, 'fetched_at': self.fetched_at, 'digest': self.digest, 'voices': self.voices}, path)
+
+    @staticmethod
+    def load(path: str) -> Optional["VoiceCatalog"]:
+        data = DataManager.load_json(path)
+        if isinstance(data, list):
+            return VoiceCatalog(data) if data else None
+        if not data or data.get('version') != VoiceCatalog.FORMAT_VERSION or not data.get('voices'):
+            return None
+        return VoiceCatalog(data['voices'], data.get('fetched_at', 0.0), data.get('digest'))
@@ -6,50 +6,57 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 from PyQt5.QtGui import QIcon
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5.QtCore import Qt, QUrl, pyqtSlot
+from PyQt5.QtCore import Qt, QUrl, QTimer, pyqtSlot
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QPushButton, QComboBox, QLabel, QSlider, QCheckBox,
     QFileDialog, QStatusBar, QGroupBox, QFormLayout, QMessageBox,
-    QLineEdit
+    QLineEdit, QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 )
-from PIL import Image
-
-try:
-    from selenium import webdriver
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
 
 from ..config import Config
 from ..utils.data_manager import DataManager
+from ..utils.lazy_import import module_available
 from ..app_controller import AppController
-from .video_preview import VideoPreviewDialog
 from .custom_widgets import PlainTextEdit
+from .voice_model import VoiceListModel, VoiceFilterProxyModel
 
 class VideoWorkflowApp(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.voices: List[Dict] = []
+        self.voice_catalog = None
         self.translations: Dict[str, str] = {}
         self.last_audio_file: Optional[str] = None
         self.last_srt_file: Optional[str] = None
         self.last_video_file: Optional[str] = None
         self.config: Dict = {}
-        self.player = QMediaPlayer()
+        self._player = None
+        self._started = False
 
         self.controller = AppController(self)
 
         self.ffmpeg_available = shutil.which('ffmpeg') is not None
-        self.selenium_available = SELENIUM_AVAILABLE
+        self.selenium_available = module_available("selenium")
 
         self._init_window()
         self._ensure_assets_dirs()
         self._init_ui()
         self._load_and_apply_config()
         self._connect_signals()
-        self.controller.start_app()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._started:
+            self._started = True
+            QTimer.singleShot(0, self.controller.start_app)
+
+    @property
+    def player(self):
+        if self._player is None:
+            from PyQt5.QtMultimedia import QMediaPlayer
+            self._player = QMediaPlayer()
+            self._player.stateChanged.connect(self.on_player_state_changed)
+        return self._player
 
     def _init_window(self):
         self.setWindowTitle(f"{Config.APP_NAME}")
@@ -117,10 +124,17 @@ class VideoWorkflowApp(QMainWindow):
         voice_layout.setSpacing(10)
         self.lang_combo = QComboBox()
         self.gender_combo = QComboBox()
+        self.voice_search_edit = QLineEdit()
+        self.voice_search_edit.setPlaceholderText("输入名称或地区搜索，如 Xiaoxiao / zh-CN")
+        self.voice_model = VoiceListModel(self)
+        self.voice_proxy = VoiceFilterProxyModel(self)
+        self.voice_proxy.setSourceModel(self.voice_model)
         self.voice_combo = QComboBox()
+        self.voice_combo.setModel(self.voice_proxy)
         self.voice_combo.setEnabled(False)
         voice_layout.addRow("语言:", self.lang_combo)
         voice_layout.addRow("性别:", self.gender_combo)
+        voice_layout.addRow("搜索:", self.voice_search_edit)
         voice_layout.addRow("语音:", self.voice_combo)
         voice_group.setLayout(voice_layout)
         right_col_layout.addWidget(voice_group)
@@ -170,16 +184,35 @@ class VideoWorkflowApp(QMainWindow):
         action_layout = QHBoxLayout()
         action_layout.setContentsMargins(15, 15, 15, 15)
         self.srt_checkbox = QCheckBox("生成字幕(.srt)")
+        self.incremental_tts_checkbox = QCheckBox("按句增量合成")
+        self.incremental_tts_checkbox.setToolTip("按句缓存音频，修改文本后只重新合成改动过的句子")
+        self.tts_concurrency_spinbox = QSpinBox()
+        self.tts_concurrency_spinbox.setRange(1, 16)
+        self.tts_concurrency_spinbox.setPrefix("并行合成: ")
+        self.tts_concurrency_spinbox.setToolTip("长文本按句子切分后并发合成再按顺序拼接，1 表示整段一次性合成")
+        self.tts_queue_spinbox = QSpinBox()
+        self.tts_queue_spinbox.setRange(1, 8)
+        self.tts_queue_spinbox.setPrefix("同时任务: ")
+        self.tts_queue_spinbox.setToolTip("配音队列中同时进行合成的任务数")
+        self.tts_queue_label = QLabel("配音队列: 进行中 0 / 等待 0")
         self.generate_button = QPushButton("生成音频")
         self.generate_button.setObjectName("generate_button")
         self.generate_button.setEnabled(False)
+        self.batch_audio_button = QPushButton("批量配音")
+        self.batch_audio_button.setToolTip("选择多个文本文件，每个文件生成一个音频，加入配音队列")
+        self.batch_audio_button.setEnabled(False)
         self.playback_button = QPushButton("播放")
         self.playback_button.setEnabled(False)
         self.pause_button = QPushButton("暂停播放")
         self.pause_button.setEnabled(False)
         action_layout.addWidget(self.srt_checkbox)
+        action_layout.addWidget(self.incremental_tts_checkbox)
+        action_layout.addWidget(self.tts_concurrency_spinbox)
+        action_layout.addWidget(self.tts_queue_spinbox)
         action_layout.addStretch()
+        action_layout.addWidget(self.tts_queue_label)
         action_layout.addWidget(self.generate_button)
+        action_layout.addWidget(self.batch_audio_button)
         action_layout.addWidget(self.playback_button)
         action_layout.addWidget(self.pause_button)
         action_group.setLayout(action_layout)
@@ -245,13 +278,25 @@ class VideoWorkflowApp(QMainWindow):
         video_action_layout = QHBoxLayout()
         self.gpu_checkbox = QCheckBox("开启GPU加速")
         self.gpu_checkbox.setToolTip("需要正确安装NVIDIA驱动和支持NVENC的FFmpeg版本")
+        self.still_frame_checkbox = QCheckBox("静态帧快速模式")
+        self.still_frame_checkbox.setToolTip("按字幕逐条预渲染画面并以极低帧率编码，适合静态画面的口播视频，大幅缩短合成时间")
+        self.segments_spinbox = QSpinBox()
+        self.segments_spinbox.setRange(1, 64)
+        self.segments_spinbox.setPrefix("分段并行: ")
+        self.segments_spinbox.setToolTip("按字幕边界将视频切成多段并行编码后无损拼接，1 表示不分段")
         self.generate_video_button = QPushButton("生成视频")
         self.generate_video_button.setObjectName("generate_video_button")
+        self.text_to_video_button = QPushButton("一键成片")
+        self.text_to_video_button.setToolTip("直接用文本框中的文案边合成语音边编码视频，无需先生成音频")
+        self.text_to_video_button.setEnabled(False)
         self.preview_video_button = QPushButton("预览视频")
         self.preview_video_button.setEnabled(False)
         video_action_layout.addWidget(self.gpu_checkbox)
+        video_action_layout.addWidget(self.still_frame_checkbox)
+        video_action_layout.addWidget(self.segments_spinbox)
         video_action_layout.addStretch()
         video_action_layout.addWidget(self.generate_video_button)
+        video_action_layout.addWidget(self.text_to_video_button)
         video_action_layout.addWidget(self.preview_video_button)
 
         video_main_layout.addLayout(params_grid)
@@ -259,6 +304,32 @@ class VideoWorkflowApp(QMainWindow):
         self.video_group.setLayout(video_main_layout)
 
         main_layout.addWidget(self.video_group, 1)
+
+        jobs_group = QGroupBox("8. 任务列表")
+        jobs_layout = QVBoxLayout()
+        jobs_layout.setContentsMargins(15, 25, 15, 15)
+        self.jobs_table = QTableWidget(0, 3)
+        self.jobs_table.setHorizontalHeaderLabels(["任务", "状态", "进度"])
+        self.jobs_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.jobs_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.jobs_table.horizontalHeader().setStretchLastSection(True)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.jobs_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.jobs_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.jobs_table.setMaximumHeight(120)
+        jobs_layout.addWidget(self.jobs_table)
+        jobs_button_layout = QHBoxLayout()
+        self.cancel_job_button = QPushButton("取消所选任务")
+        self.cancel_job_button.setToolTip("排队中的任务直接移出队列；运行中的视频任务会在当前步骤安全停止，之后可恢复")
+        self.resume_jobs_button = QPushButton("恢复未完成任务")
+        self.resume_jobs_button.setToolTip("重新提交上次中断、失败或取消的视频任务，已完成的步骤和分段将被跳过")
+        jobs_button_layout.addWidget(self.cancel_job_button)
+        jobs_button_layout.addWidget(self.resume_jobs_button)
+        jobs_button_layout.addStretch()
+        jobs_layout.addLayout(jobs_button_layout)
+        jobs_group.setLayout(jobs_layout)
+        main_layout.addWidget(jobs_group)
         main_layout.addStretch()
 
         if not self.ffmpeg_available:
@@ -282,6 +353,7 @@ class VideoWorkflowApp(QMainWindow):
 
         self.lang_combo.currentIndexChanged.connect(self._filter_voices)
         self.gender_combo.currentIndexChanged.connect(self._filter_voices)
+        self.voice_search_edit.textChanged.connect(self._filter_voices)
 
         self.rate_slider.valueChanged.connect(lambda v: self.rate_label.setText(f"{v:+}%"))
         self.volume_slider.valueChanged.connect(lambda v: self.volume_label.setText(f"{v:+}%"))
@@ -291,9 +363,10 @@ class VideoWorkflowApp(QMainWindow):
         self.open_dir_button.clicked.connect(self.open_output_directory)
 
         self.generate_button.clicked.connect(self.controller.on_generate_audio_clicked)
+        self.batch_audio_button.clicked.connect(self.controller.on_batch_audio_clicked)
+        self.tts_queue_spinbox.valueChanged.connect(self.controller.tts_queue.set_concurrency)
         self.playback_button.clicked.connect(self.play_last_audio)
         self.pause_button.clicked.connect(self.pause_audio)
-        self.player.stateChanged.connect(self.on_player_state_changed)
 
         self.avatar_button.clicked.connect(lambda: self.select_asset_file('avatar'))
         self.font_button.clicked.connect(lambda: self.select_asset_file('font'))
@@ -302,7 +375,10 @@ class VideoWorkflowApp(QMainWindow):
         self.bgm_button.clicked.connect(lambda: self.select_external_file('bgm'))
 
         self.generate_video_button.clicked.connect(self.controller.on_generate_video_clicked)
+        self.text_to_video_button.clicked.connect(self.controller.on_text_to_video_clicked)
         self.preview_video_button.clicked.connect(self.show_video_preview)
+        self.cancel_job_button.clicked.connect(self.controller.on_cancel_job_clicked)
+        self.resume_jobs_button.clicked.connect(self.controller.on_resume_jobs_clicked)
 
     def _create_slider_box(self, slider: QSlider, label: QLabel) -> QWidget:
         box = QWidget()
@@ -328,12 +404,16 @@ class VideoWorkflowApp(QMainWindow):
         self.volume_slider.setValue(self.config.get("volume", 0))
         self.pitch_slider.setValue(self.config.get("pitch", 0))
         self.srt_checkbox.setChecked(self.config.get("generate_srt", True))
+        self.tts_concurrency_spinbox.setValue(self.config.get("tts_concurrency", 1))
+        self.incremental_tts_checkbox.setChecked(self.config.get("tts_incremental", False))
+        self.tts_queue_spinbox.setValue(self.config.get("tts_queue_concurrency", Config.TTS_QUEUE_CONCURRENCY))
         self.output_path_edit.setText(self.config.get("output_path", Config.OUTPUT_DIR))
         self.avatar_edit.setText(os.path.abspath(self.config.get("avatar_path", Config.DEFAULT_AVATAR_PATH)))
         self.font_edit.setText(os.path.abspath(self.config.get("font_path", Config.DEFAULT_FONT_PATH)))
 
         if not os.path.exists(self.avatar_edit.text()) and "avatar.png" in self.avatar_edit.text():
             try:
+                from PIL import Image
                 Image.new('RGB', (100, 100), 'gray').save(self.avatar_edit.text())
             except Exception as e:
                 print(f"创建默认头像失败: {e}")
@@ -345,22 +425,27 @@ class VideoWorkflowApp(QMainWindow):
         bgm_path = self.config.get("bgm_path", Config.DEFAULT_BGM_PATH if os.path.exists(Config.DEFAULT_BGM_PATH) else "")
         self.bgm_edit.setText(os.path.abspath(bgm_path) if bgm_path else "")
         self.gpu_checkbox.setChecked(self.config.get("use_gpu", False))
+        self.still_frame_checkbox.setChecked(self.config.get("still_frames", False))
+        self.segments_spinbox.setValue(self.config.get("segments", 1))
 
     def _save_config(self):
         config_data = {
             "language": self.lang_combo.currentData(), "gender": self.gender_combo.currentData(), "voice": self.voice_combo.currentData(),
             "rate": self.rate_slider.value(), "volume": self.volume_slider.value(), "pitch": self.pitch_slider.value(),
-            "generate_srt": self.srt_checkbox.isChecked(), "output_path": self.output_path_edit.text(),
+            "generate_srt": self.srt_checkbox.isChecked(), "tts_concurrency": self.tts_concurrency_spinbox.value(), "tts_incremental": self.incremental_tts_checkbox.isChecked(), "tts_queue_concurrency": self.tts_queue_spinbox.value(), "output_path": self.output_path_edit.text(),
             "avatar_path": self.avatar_edit.text(), "font_path": self.font_edit.text(), "author_name": self.author_edit.text(),
             "sub_text": self.subtext_edit.text(), "cover_title": self.cover_title_edit.text(), "cover_subtitle": self.cover_subtitle_edit.text(),
-            "bgm_path": self.bgm_edit.text(), "use_gpu": self.gpu_checkbox.isChecked(),
+            "bgm_path": self.bgm_edit.text(), "use_gpu": self.gpu_checkbox.isChecked(), "still_frames": self.still_frame_checkbox.isChecked(),
+            "segments": self.segments_spinbox.value(),
         }
         if not DataManager.save_json(config_data, Config.CONFIG_FILE):
             self.update_status("保存配置失败", 5000)
 
     def set_ui_enabled(self, enabled: bool):
         self.generate_button.setEnabled(enabled and self.voice_combo.count() > 0)
+        self.batch_audio_button.setEnabled(enabled and self.voice_combo.count() > 0)
         self.generate_video_button.setEnabled(enabled and self.ffmpeg_available)
+        self.text_to_video_button.setEnabled(enabled and self.ffmpeg_available and self.voice_combo.count() > 0)
         self.preview_video_button.setEnabled(enabled and self.last_video_file is not None)
 
         if self.selenium_available:
@@ -373,19 +458,21 @@ class VideoWorkflowApp(QMainWindow):
             self.playback_button.setEnabled(False)
             self.pause_button.setEnabled(False)
         else:
-            self.on_player_state_changed(self.player.state())
+            self.on_player_state_changed(self._player.state() if self._player else 0)
 
-    @pyqtSlot(list)
-    def on_voices_loaded(self, voices: List[Dict]):
-        self.voices = sorted(voices, key=lambda v: v['ShortName'])
+    @pyqtSlot(object)
+    def on_voices_loaded(self, catalog):
+        is_refresh = self.voice_catalog is not None
+        selection = {"language": self.lang_combo.currentData(), "gender": self.gender_combo.currentData(), "voice": self.voice_combo.currentData()} if is_refresh else None
+        self.voice_catalog = catalog
         self._create_and_load_translation_map()
 
-        self.lang_combo.clear()
-        self.gender_combo.clear()
-        self.translate_lang_combo.clear()
+        for combo in (self.lang_combo, self.gender_combo, self.translate_lang_combo):
+            combo.blockSignals(True)
+            combo.clear()
 
-        all_langs = sorted(list(set(v['Locale'].split('-')[0] for v in self.voices)))
-        all_genders = sorted(list(set(v['Gender'] for v in self.voices)))
+        all_langs = catalog.languages()
+        all_genders = catalog.genders()
 
         self.lang_combo.addItem(self.translations.get("all", "全部"), "all")
         for lang_code in all_langs:
@@ -396,10 +483,16 @@ class VideoWorkflowApp(QMainWindow):
         for gender_key in all_genders:
             self.gender_combo.addItem(self.translations.get(gender_key, gender_key), gender_key)
 
+        for combo in (self.lang_combo, self.gender_combo, self.translate_lang_combo):
+            combo.blockSignals(False)
+        self.voice_model.set_catalog(catalog, self.translations)
+
         self.voice_combo.setEnabled(True)
         self.generate_button.setEnabled(True)
-        self.update_status("语音列表加载完成。", 5000)
-        self._apply_voice_config()
+        self.batch_audio_button.setEnabled(True)
+        self.text_to_video_button.setEnabled(self.ffmpeg_available)
+        self.update_status("语音列表已在后台更新。" if is_refresh else "语音列表加载完成。", 5000)
+        self._apply_voice_config(selection)
 
     @pyqtSlot(str)
     def on_task_error(self, error_msg: str):
@@ -407,9 +500,9 @@ class VideoWorkflowApp(QMainWindow):
         self.update_status(f"错误: {error_msg}", 10000)
         QMessageBox.critical(self, "错误", str(error_msg))
 
-    def get_tts_parameters(self) -> Optional[Dict]:
+    def get_tts_parameters(self, require_text: bool = True) -> Optional[Dict]:
         text = self.text_edit.toPlainText().strip()
-        if not text:
+        if require_text and not text:
             QMessageBox.warning(self, "警告", "请输入文本！")
             return None
 
@@ -426,18 +519,20 @@ class VideoWorkflowApp(QMainWindow):
         return {
             "text": text, "voice": voice, "output_dir": output_dir,
             "rate": f"{self.rate_slider.value():+}%", "volume": f"{self.volume_slider.value():+}%",
-            "pitch": f"{self.pitch_slider.value():+}Hz", "generate_srt": self.srt_checkbox.isChecked()
+            "pitch": f"{self.pitch_slider.value():+}Hz", "generate_srt": self.srt_checkbox.isChecked(),
+            "concurrency": self.tts_concurrency_spinbox.value(), "incremental": self.incremental_tts_checkbox.isChecked()
         }
 
-    def get_video_parameters(self) -> Optional[Dict]:
+    def get_video_parameters(self, require_media: bool = True) -> Optional[Dict]:
         params = {
             'avatar': self.avatar_edit.text(), 'font': self.font_edit.text(), 'audio': self.audio_edit.text(),
             'srt': self.srt_edit.text(), 'author': self.author_edit.text(), 'subtext': self.subtext_edit.text(),
             'cover_title': self.cover_title_edit.text(), 'cover_subtitle': self.cover_subtitle_edit.text(),
-            'bgm': self.bgm_edit.text(), 'use_gpu': self.gpu_checkbox.isChecked()
+            'bgm': self.bgm_edit.text(), 'use_gpu': self.gpu_checkbox.isChecked(),
+            'still_frames': self.still_frame_checkbox.isChecked(), 'segments': self.segments_spinbox.value()
         }
 
-        required_fields = ['avatar', 'font', 'audio', 'srt']
+        required_fields = ['avatar', 'font', 'audio', 'srt'] if require_media else ['avatar', 'font']
         for key, value in params.items():
             if key in required_fields and not value:
                 QMessageBox.warning(self, "参数缺失", f"请为视频生成提供 '{key}' 的有效值！")
@@ -504,18 +599,19 @@ class VideoWorkflowApp(QMainWindow):
 
     def update_audio_player_source(self):
         if self.last_audio_file:
+            from PyQt5.QtMultimedia import QMediaContent
             self.player.setMedia(QMediaContent(QUrl.fromLocalFile(self.last_audio_file)))
 
     def play_last_audio(self):
-        if self.last_audio_file and self.player.state() != QMediaPlayer.PlayingState:
+        if self.last_audio_file and self.player.state() != self.player.PlayingState:
             self.player.play()
 
     def pause_audio(self):
-        if self.player.state() == QMediaPlayer.PlayingState:
-            self.player.pause()
+        if self._player and self._player.state() == self._player.PlayingState:
+            self._player.pause()
 
-    def on_player_state_changed(self, state: QMediaPlayer.State):
-        is_playing = state == QMediaPlayer.PlayingState
+    def on_player_state_changed(self, state: int):
+        is_playing = self._player is not None and state == self._player.PlayingState
         self.playback_button.setEnabled(not is_playing and self.last_audio_file is not None)
         self.pause_button.setEnabled(is_playing)
 
@@ -536,31 +632,24 @@ class VideoWorkflowApp(QMainWindow):
 
     def show_video_preview(self):
         if self.last_video_file and os.path.exists(self.last_video_file):
+            from .video_preview import VideoPreviewDialog
             VideoPreviewDialog(self.last_video_file, self).exec_()
         else:
             QMessageBox.warning(self, "无法预览", "未找到可预览的视频文件。请先生成一个视频。")
 
     def _filter_voices(self):
+        current_voice = self.voice_combo.currentData()
         self.voice_combo.blockSignals(True)
-        self.voice_combo.clear()
-        selected_lang, selected_gender = self.lang_combo.currentData(), self.gender_combo.currentData()
-
-        filtered = [
-            v for v in self.voices
-            if (selected_lang == "all" or v['Locale'].startswith(selected_lang)) and
-               (selected_gender == "all" or v['Gender'] == selected_gender)
-        ]
-
-        for voice in filtered:
-            gender_cn = self.translations.get(voice['Gender'], voice['Gender'])
-            self.voice_combo.addItem(f"{voice['ShortName']} ({gender_cn}, {voice['Locale']})", voice['ShortName'])
-
+        self.voice_proxy.set_filters(self.lang_combo.currentData(), self.gender_combo.currentData(), self.voice_search_edit.text())
+        index = self.voice_combo.findData(current_voice) if current_voice else -1
+        self.voice_combo.setCurrentIndex(index if index > -1 else (0 if self.voice_combo.count() else -1))
         self.voice_combo.blockSignals(False)
 
-    def _apply_voice_config(self):
+    def _apply_voice_config(self, selection: Optional[Dict[str, Any]] = None):
+        selection = selection or self.config
         for combo, key in [(self.lang_combo, "language"), (self.gender_combo, "gender")]:
             combo.blockSignals(True)
-            value_to_set = self.config.get(key, "all")
+            value_to_set = selection.get(key, "all")
             index = combo.findData(value_to_set)
             if index > -1:
                 combo.setCurrentIndex(index)
@@ -568,12 +657,16 @@ class VideoWorkflowApp(QMainWindow):
 
         self._filter_voices()
 
-        voice_to_set = self.config.get("voice")
+        voice_to_set = selection.get("voice")
         if voice_to_set:
             index = self.voice_combo.findData(voice_to_set)
             if index > -1:
                 self.voice_combo.setCurrentIndex(index)
 
+    def select_batch_text_files(self) -> List[str]:
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "选择要批量配音的文本文件", "", "文本文件 (*.txt);;所有文件 (*)")
+        return file_paths
+
     def load_text_from_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "从文件加载文本", "", "文本文件 (*.txt);;所有文件 (*)")
         if file_path:
@@ -584,6 +677,22 @@ class VideoWorkflowApp(QMainWindow):
             except Exception as e:
                 self.on_task_error(f"无法读取文件: {e}")
 
+    def update_job_list(self, jobs: List[Dict[str, Any]]):
+        status_names = {'queued': "排队中", 'running': "运行中"}
+        selected_job_id = self.selected_job_id()
+        self.jobs_table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            for column, text in enumerate([job['title'], status_names.get(job['status'], job['status']), job['message']]):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.UserRole, job['job_id'])
+                self.jobs_table.setItem(row, column, item)
+            if job['job_id'] == selected_job_id:
+                self.jobs_table.selectRow(row)
+
+    def selected_job_id(self) -> Optional[str]:
+        items = self.jobs_table.selectedItems()
+        return items[0].data(Qt.UserRole) if items else None
+
     @pyqtSlot(str)
     def update_status(self, message: str, timeout: int = 0):
         self.status_bar.showMessage(message, timeout)
@@ -601,6 +710,7 @@ class VideoWorkflowApp(QMainWindow):
     def closeEvent(self, event):
         self._save_config()
         self.controller.stop_app()
-        self.player.stop()
+        if self._player:
+            self._player.stop()
 
         super().closeEvent(event)
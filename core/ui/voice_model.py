@@ -0,0 +1,44 @@
+from typing import Any, Dict, Optional, Set
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+
+from ..services.voice_catalog import VoiceCatalog
+
+class VoiceListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.catalog: Optional[VoiceCatalog] = None
+        self.translations: Dict[str, str] = {}
+
+    def set_catalog(self, catalog: VoiceCatalog, translations: Dict[str, str]):
+        self.beginResetModel()
+        self.catalog = catalog
+        self.translations = translations
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() or self.catalog is None else len(self.catalog)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or self.catalog is None:
+            return None
+        voice = self.catalog.voices[index.row()]
+        if role == Qt.DisplayRole:
+            gender = self.translations.get(voice['Gender'], voice['Gender'])
+            return f"{voice['ShortName']} ({gender}, {voice['Locale']})"
+        if role == Qt.UserRole:
+            return voice['ShortName']
+        return None
+
+class VoiceFilterProxyModel(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: Optional[Set[int]] = None
+
+    def set_filters(self, language: str = "all", gender: str = "all", text: str = ""):
+        catalog = self.sourceModel().catalog if self.sourceModel() else None
+        self._rows = catalog.filter_rows(language or "all", gender or "all") & catalog.search_rows(text) if catalog else None
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        return self._rows is None or source_row in self._rows
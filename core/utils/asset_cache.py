@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from typing import Dict
+
+from .lazy_import import lazy_module
+
+Image = lazy_module("PIL.Image")
+ImageDraw = lazy_module("PIL.ImageDraw")
+ImageFont = lazy_module("PIL.ImageFont")
+
+@lru_cache(maxsize=32)
+def _load_font(path: str, size: int, mtime_ns: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(path, size=size)
+
+@lru_cache(maxsize=8)
+def _load_circular_avatar(path: str, size: int, mtime_ns: int) -> Image.Image:
+    avatar = Image.open(path).convert("RGBA").resize((size, size), Image.Resampling.LANCZOS)
+    mask = Image.new('L', (size, size), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, size, size), fill=255)
+    avatar.putalpha(mask)
+    return avatar
+
+class AssetCache:
+    @staticmethod
+    def _mtime(path: str) -> int:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return 0
+
+    @staticmethod
+    def get_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+        return _load_font(os.path.abspath(path), int(size), AssetCache._mtime(path))
+
+    @staticmethod
+    def get_circular_avatar(path: str, size: int) -> Image.Image:
+        return _load_circular_avatar(os.path.abspath(path), int(size), AssetCache._mtime(path))
+
+    @staticmethod
+    def clear():
+        _load_font.cache_clear()
+        _load_circular_avatar.cache_clear()
+
+    @staticmethod
+    def stats() -> Dict[str, Dict[str, int]]:
+        stats = {}
+        for name, func in [('fonts', _load_font), ('avatars', _load_circular_avatar)]:
+            info = func.cache_info()
+            stats[name] = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+        return stats
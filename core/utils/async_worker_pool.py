@@ -0,0 +1,148 @@
+import pickle
+import asyncio
+import multiprocessing
+from typing import Any, Callable, List, Optional, Tuple
+
+from .message_channel import HEADER, channel_pair
+from .pool_worker import pool_worker_main
+from ..config import Config
+
+class _AsyncPoolWorker:
+    def __init__(self, process: multiprocessing.Process, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.process = process
+        self.reader = reader
+        self.writer = writer
+        self.retiring = False
+
+    async def recv(self) -> Any:
+        header = await self.reader.readexactly(HEADER.size)
+        return pickle.loads(await self.reader.readexactly(HEADER.unpack(header)[0]))
+
+    async def send(self, message: Any):
+        payload = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+        self.writer.write(HEADER.pack(len(payload)) + payload)
+        await self.writer.drain()
+
+    def close(self, graceful: bool = False):
+        if graceful:
+            self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=1)
+        self.writer.close()
+
+class AsyncWorkerPool:
+    def __init__(self, size: int = Config.WORKER_POOL_SIZE, max_tasks: int = Config.WORKER_MAX_TASKS, max_memory_growth: int = Config.WORKER_MAX_MEMORY_GROWTH,
+                 preload_modules: Optional[List[str]] = None, start_method: str = Config.API_WORKER_START_METHOD):
+        self.size = max(1, size)
+        self.max_tasks = max_tasks
+        self.max_memory_growth = max_memory_growth
+        self.preload_modules = Config.WORKER_PRELOAD_MODULES if preload_modules is None else preload_modules
+        self.context = multiprocessing.get_context(start_method)
+        self.workers: List[_AsyncPoolWorker] = []
+        self.busy = 0
+        self.running = False
+        self._spawning = 0
+        self._idle: Optional[asyncio.Queue] = None
+
+    async def start(self):
+        self._idle = asyncio.Queue()
+        self.running = True
+        await asyncio.gather(*(self._spawn_with_retry() for _ in range(self.size)))
+
+    async def shutdown(self):
+        self.running = False
+        workers, self.workers = self.workers, []
+        for worker in workers:
+            try:
+                await worker.send(None)
+            except (OSError, RuntimeError):
+                pass
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(None, worker.close, True) for worker in workers))
+
+    async def run(self, task_id: str, target_func: Callable, args: tuple = (), kwargs: Optional[dict] = None,
+                  on_message: Optional[Callable[[str, Any], None]] = None) -> Tuple[str, Any]:
+        while True:
+            worker = await self._idle.get()
+            if worker is not None:
+                break
+            if not self.workers and not self._spawning:
+                self._idle.put_nowait(None)
+                return 'error', "工作进程无法启动，任务未执行。"
+        self.busy += 1
+        finished = False
+        outcome: Tuple[str, Any] = ('error', '子进程意外终止。')
+        try:
+            try:
+                await worker.send((task_id, target_func, args, kwargs or {}))
+            except (TypeError, AttributeError, pickle.PicklingError) as e:
+                finished = True
+                return 'error', f"提交任务到工作进程失败: {e}"
+            while True:
+                message = await worker.recv()
+                kind = message[0]
+                if kind == 'retire':
+                    worker.retiring = True
+                    print(f"工作进程 {worker.process.pid} 将被回收: {message[1]}")
+                elif kind == 'finished':
+                    finished = True
+                    outcome = (message[2], message[3])
+                    break
+                elif on_message and message[1] == task_id:
+                    on_message(kind, message[2])
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+        finally:
+            self.busy -= 1
+            await self._release(worker, finished and not worker.retiring)
+        return outcome
+
+    async def _spawn_with_retry(self):
+        self._spawning += 1
+        try:
+            for attempt in range(Config.WORKER_SPAWN_RETRIES + 1):
+                if not self.running or await self._spawn_worker():
+                    return
+                if attempt < Config.WORKER_SPAWN_RETRIES:
+                    delay = Config.WORKER_SPAWN_RETRY_DELAY * 2 ** attempt
+                    print(f"工作进程启动失败，{delay:.1f} 秒后重试...")
+                    await asyncio.sleep(delay)
+            print(f"工作进程连续 {Config.WORKER_SPAWN_RETRIES + 1} 次启动失败，放弃重试。")
+        finally:
+            self._spawning -= 1
+        self._idle.put_nowait(None)
+
+    async def _spawn_worker(self) -> bool:
+        parent_sock, child_sock = channel_pair()
+        process = self.context.Process(target=pool_worker_main, args=(child_sock, self.preload_modules, self.max_tasks, self.max_memory_growth), daemon=True)
+        try:
+            process.start()
+        except OSError as e:
+            print(f"无法创建工作进程: {e}")
+            parent_sock.close()
+            return False
+        finally:
+            child_sock.close()
+        reader, writer = await asyncio.open_connection(sock=parent_sock)
+        worker = _AsyncPoolWorker(process, reader, writer)
+        try:
+            message = await worker.recv()
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            message = None
+        if not message or message[0] != 'ready' or not self.running:
+            await asyncio.get_running_loop().run_in_executor(None, worker.close)
+            return False
+        self.workers.append(worker)
+        self._idle.put_nowait(worker)
+        return True
+
+    async def _release(self, worker: _AsyncPoolWorker, healthy: bool):
+        if healthy and self.running:
+            self._idle.put_nowait(worker)
+            return
+        if worker in self.workers:
+            self.workers.remove(worker)
+        await asyncio.get_running_loop().run_in_executor(None, worker.close, worker.retiring)
+        if self.running:
+            asyncio.ensure_future(self._spawn_with_retry())
@@ -0,0 +1,61 @@
+import pickle
+import socket
+from typing import Any, Optional
+
+from PyQt5.QtCore import QObject, QSocketNotifier, pyqtSignal, pyqtSlot
+
+from .message_channel import HEADER, MessageChannel
+
+class ChannelReader(QObject):
+    message = pyqtSignal(object)
+    closed = pyqtSignal()
+
+    def __init__(self, sock: socket.socket, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.channel = MessageChannel(sock)
+        self._buffer = bytearray()
+        self._open = True
+        sock.setblocking(False)
+        self.notifier = QSocketNotifier(sock.fileno(), QSocketNotifier.Read, self)
+        self.notifier.activated.connect(self._on_readable)
+
+    def send(self, message: Any):
+        self.channel.sock.setblocking(True)
+        try:
+            self.channel.send(message)
+        finally:
+            self.channel.sock.setblocking(False)
+
+    def close(self):
+        if self._open:
+            self._open = False
+            self.notifier.setEnabled(False)
+            self.channel.close()
+
+    @pyqtSlot()
+    def _on_readable(self):
+        eof = False
+        while self._open:
+            try:
+                data = self.channel.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                eof = True
+                break
+            if not data:
+                eof = True
+                break
+            self._buffer.extend(data)
+
+        while self._open and len(self._buffer) >= HEADER.size:
+            size = HEADER.unpack_from(self._buffer)[0]
+            if len(self._buffer) < HEADER.size + size:
+                break
+            payload = bytes(self._buffer[HEADER.size:HEADER.size + size])
+            del self._buffer[:HEADER.size + size]
+            self.message.emit(pickle.loads(payload))
+
+        if eof and self._open:
+            self.close()
+            self.closed.emit()
@@ -2,9 +2,9 @@ import os
 import sys
 import zipfile
 import platform
-import requests
 import subprocess
-from PyQt5.QtWidgets import QMessageBox
+
+from . import telemetry
 
 class ChromedriverDownloader:
     def __init__(self, status_callback=print, error_callback=None):
@@ -15,6 +15,7 @@ class ChromedriverDownloader:
 
     def _default_error_handler(self, message):
         print(f"ERROR: {message}")
+        from PyQt5.QtWidgets import QMessageBox
         QMessageBox.critical(None, "ChromeDriver 错误", message)
 
     def _get_driver_filename(self):
@@ -46,8 +47,11 @@ class ChromedriverDownloader:
         return None
 
     def ensure_chromedriver(self):
+        import requests
+
         driver_path = self.driver_filename
         if os.path.exists(driver_path):
+            telemetry.event('chromedriver', 'ensure', labels={'result': 'present'})
             return True, "ChromeDriver 已存在。"
 
         self.status_callback("ChromeDriver 未找到，正在尝试自动下载...")
@@ -62,9 +66,11 @@ class ChromedriverDownloader:
 
         try:
             self.status_callback("正在从官方源获取版本信息...")
-            response = requests.get(self.versions_url, timeout=15)
-            response.raise_for_status()
-            versions_data = response.json()
+            with telemetry.span('chromedriver', 'versions_fetch') as record:
+                response = requests.get(self.versions_url, timeout=15)
+                response.raise_for_status()
+                record['bytes_written'] = len(response.content)
+                versions_data = response.json()
 
             best_match = next(
                 (v for v in reversed(versions_data['versions']) if v['version'].startswith(chrome_major_version)),
@@ -98,12 +104,14 @@ class ChromedriverDownloader:
             zip_filename = "chromedriver.zip"
 
             self.status_callback(f"开始下载: {os.path.basename(download_url)}...")
-            response = requests.get(download_url, stream=True, timeout=300)
-            response.raise_for_status()
-
-            with open(zip_filename, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            with telemetry.span('chromedriver', 'download', labels={'platform': plat}) as record:
+                response = requests.get(download_url, stream=True, timeout=300)
+                response.raise_for_status()
+                record['bytes_written'] = 0
+                with open(zip_filename, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        f.write(chunk)
+                        record['bytes_written'] += len(chunk)
 
             self.status_callback("下载完成，正在解压...")
             with zipfile.ZipFile(zip_filename, 'r') as zip_ref:
@@ -122,11 +130,13 @@ class ChromedriverDownloader:
                 os.chmod(self.driver_filename, 0o755)
 
             os.remove(zip_filename)
+            telemetry.event('chromedriver', 'ensure', labels={'result': 'downloaded'})
             self.status_callback("Chromedriver 已成功准备就绪。")
             return True, f"{self.driver_filename} 已成功准备就绪。"
 
         except Exception as e:
             msg = f"下载或解压过程中发生错误: {e}"
+            telemetry.event('chromedriver', 'ensure', labels={'result': 'failed'})
             self.error_callback(msg)
             if os.path.exists(zip_filename):
                 os.remove(zip_filename)
@@ -0,0 +1,104 @@
+import os
+import shutil
+import hashlib
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+from . import telemetry
+
+class ContentCache:
+    _file_digests: Dict[Tuple[str, int, int], str] = {}
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_file(path: Optional[str]) -> str:
+        if not path or not os.path.isfile(path):
+            return "missing"
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        digest = ContentCache._file_digests.get(memo_key)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(block)
+            digest = sha.hexdigest()
+            ContentCache._file_digests[memo_key] = digest
+        return digest
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        sha = hashlib.sha256()
+        for part in parts:
+            data = part if isinstance(part, bytes) else repr(part).encode('utf-8')
+            sha.update(len(data).to_bytes(8, 'little'))
+            sha.update(data)
+        return sha.hexdigest()
+
+    def path_for(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}{suffix}")
+
+    def get(self, key: str, suffix: str) -> Optional[str]:
+        path = self.path_for(key, suffix)
+        try:
+            os.utime(path, None)
+        except OSError:
+            self.record_lookup(False)
+            return None
+        self.record_lookup(True)
+        return path
+
+    def record_lookup(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        telemetry.event('cache', 'lookup', labels={'cache': os.path.basename(self.cache_dir), 'result': 'hit' if hit else 'miss'})
+
+    def put(self, key: str, suffix: str, source_path: str) -> str:
+        path = self.path_for(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix=suffix, dir=os.path.dirname(path))
+        os.close(fd)
+        try:
+            shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+        return path
+
+    def evict(self) -> int:
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
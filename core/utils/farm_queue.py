@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import telemetry
+from ..config import Config
+
+class FarmQueue:
+    DIRS = ('queue', 'running', 'done', 'failed', 'tmp')
+    SEPARATOR = '__'
+
+    def __init__(self, root: str, lease_seconds: float = Config.FARM_LEASE_SECONDS, max_attempts: int = Config.FARM_MAX_ATTEMPTS):
+        self.root = os.path.abspath(root)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for name in self.DIRS:
+            os.makedirs(self._path(name), exist_ok=True)
+
+    def _path(self, *parts: str) -> str:
+        return os.path.join(self.root, *parts)
+
+    def _write_json(self, path: str, data: Dict[str, Any]):
+        tmp_path = self._path('tmp', f"{os.path.basename(path)}.{uuid.uuid4().hex}")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_json(path: str) -> Dict[str, Any]:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _list(self, directory: str) -> List[str]:
+        return sorted(name for name in os.listdir(self._path(directory)) if name.endswith('.json'))
+
+    def _parse_running(self, name: str) -> Tuple[str, str, str]:
+        job_id, _, rest = name[:-5].partition(self.SEPARATOR)
+        worker_id, _, claim = rest.rpartition(self.SEPARATOR)
+        return job_id, worker_id, claim
+
+    def submit(self, params: Dict[str, Any], name: Optional[str] = None) -> str:
+        job_id = f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+        self._write_json(self._path('queue', f"{job_id}.json"),
+                         {'job_id': job_id, 'name': name or job_id, 'params': params, 'submitted_at': time.time(), 'attempts': 0, 'history': []})
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        for name in self._list('queue'):
+            job_id = name[:-5]
+            claim = uuid.uuid4().hex[:8]
+            running_path = self._path('running', f"{job_id}{self.SEPARATOR}{worker_id}{self.SEPARATOR}{claim}.json")
+            try:
+                os.utime(self._path('queue', name), None)
+                os.rename(self._path('queue', name), running_path)
+            except FileNotFoundError:
+                continue
+            try:
+                job = self._read_json(running_path)
+            except (OSError, ValueError) as e:
+                print(f"任务文件 {name} 无法读取，已移入失败目录: {e}")
+                self._move(running_path, 'failed', f"{job_id}.json")
+                continue
+
+            now = time.time()
+            job['attempts'] += 1
+            job['history'].append({'worker': worker_id, 'claim': claim, 'claimed_at': now})
+            if job['attempts'] > self.max_attempts:
+                job['error'] = f"已尝试 {self.max_attempts} 次仍未完成，可能是节点反复崩溃，不再重试。"
+                self.complete(running_path, job, 'failed')
+                continue
+            self._write_json(running_path, job)
+            telemetry.event('farm', 'claim', values={'queue_wait_seconds': now - job['submitted_at'], 'attempts': job['attempts']})
+            return running_path, job
+        return None
+
+    def heartbeat(self, running_path: str) -> bool:
+        try:
+            os.utime(running_path, None)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _move(self, path: str, directory: str, name: str) -> Optional[str]:
+        target = self._path(directory, name)
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            return None
+        return target
+
+    def complete(self, running_path: str, job: Dict[str, Any], status: str) -> bool:
+        target = self._move(running_path, status, f"{job['job_id']}.json")
+        if target is None:
+            return False
+        job['status'] = status
+        job['finished_at'] = time.time()
+        self._write_json(target, job)
+        return True
+
+    def requeue_expired(self) -> List[str]:
+        requeued = []
+        now = time.time()
+        for name in self._list('running'):
+            path = self._path('running', name)
+            try:
+                age = now - os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+            if age < self.lease_seconds:
+                continue
+            job_id, worker_id, claim = self._parse_running(name)
+            tmp_path = self._move(path, 'tmp', f"{name}.{uuid.uuid4().hex}")
+            if tmp_path is None:
+                continue
+            try:
+                job = self._read_json(tmp_path)
+            except (OSError, ValueError) as e:
+                print(f"任务文件 {name} 无法读取，已移入失败目录: {e}")
+                self._move(tmp_path, 'failed', f"{job_id}.json")
+                continue
+
+            entry = next((entry for entry in job['history'] if entry.get('claim') == claim), None)
+            if entry is None:
+                job['attempts'] += 1
+                entry = {'worker': worker_id, 'claim': claim}
+                job['history'].append(entry)
+            entry['lost_at'] = now
+            if job['attempts'] >= self.max_attempts:
+                job['error'] = f"已尝试 {self.max_attempts} 次仍未完成，可能是节点反复崩溃，不再重试。"
+                self.complete(tmp_path, job, 'failed')
+                print(f"节点 {worker_id} 的任务 {job_id} 租约过期，已达到最大尝试次数，移入失败目录。")
+                continue
+            self._write_json(tmp_path, job)
+            self._move(tmp_path, 'queue', f"{job_id}.json")
+            print(f"节点 {worker_id} 的任务 {job_id} 已 {age:.0f}s 无心跳，租约过期，已重新排队。")
+            telemetry.event('farm', 'requeue', values={'lease_age_seconds': age, 'attempts': job['attempts']})
+            requeued.append(job_id)
+        return requeued
+
+    def retry_failed(self) -> List[str]:
+        retried = []
+        for name in self._list('failed'):
+            path = self._path('failed', name)
+            try:
+                job = self._read_json(path)
+            except (OSError, ValueError):
+                continue
+            job.update(attempts=0, status=None, error=None)
+            self._write_json(path, job)
+            if self._move(path, 'queue', name):
+                retried.append(job['job_id'])
+        return retried
+
+    def count(self, directory: str) -> int:
+        return len(self._list(directory))
+
+    def status(self) -> Dict[str, Any]:
+        now = time.time()
+        running = []
+        for name in self._list('running'):
+            job_id, worker_id, _ = self._parse_running(name)
+            try:
+                running.append({'job_id': job_id, 'worker': worker_id, 'heartbeat_age': now - os.stat(self._path('running', name)).st_mtime})
+            except FileNotFoundError:
+                pass
+        status: Dict[str, Any] = {directory: self.count(directory) for directory in ('queue', 'running', 'done', 'failed')}
+        status['running_jobs'] = running
+        return status
+
+    def results(self, directory: str = 'done') -> List[Dict[str, Any]]:
+        jobs = []
+        for name in self._list(directory):
+            try:
+                jobs.append(self._read_json(self._path(directory, name)))
+            except (OSError, ValueError):
+                pass
+        return jobs
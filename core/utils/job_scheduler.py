@@ -0,0 +1,104 @@
+import time
+import itertools
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from . import telemetry
+from .worker_pool import WorkerPool, PooledTask
+from ..config import Config
+
+class JobScheduler(QObject):
+    PRIORITY_INTERACTIVE = 10
+    PRIORITY_NORMAL = 0
+
+    job_progress = pyqtSignal(str, str)
+    job_event = pyqtSignal(str, dict)
+    job_finished = pyqtSignal(str, str, object)
+    jobs_changed = pyqtSignal()
+
+    def __init__(self, pool: WorkerPool, slots: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.pool = pool
+        self.slots = dict(Config.SCHEDULER_SLOTS if slots is None else slots)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, PooledTask] = {}
+        self._seq = itertools.count(1)
+
+    def submit(self, kind: str, title: str, target_func: Callable, args: tuple = (), kwargs: Optional[Dict[str, Any]] = None,
+               resources: Optional[Dict[str, int]] = None, priority: int = PRIORITY_NORMAL) -> str:
+        seq = next(self._seq)
+        job_id = f"{kind}#{seq}"
+        self.jobs[job_id] = {
+            'job_id': job_id, 'kind': kind, 'title': title, 'priority': priority, 'resources': dict(resources or {}), 'seq': seq,
+            'status': 'queued', 'message': "等待资源...", 'submitted_at': time.time(), 'started_at': None, 'finished_at': None,
+            'target_func': target_func, 'args': args, 'kwargs': kwargs or {},
+        }
+        self._schedule()
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job['status'] != 'queued':
+            return False
+        job.update(status='cancelled', finished_at=time.time())
+        self.job_finished.emit(job_id, 'cancelled', "任务已取消")
+        del self.jobs[job_id]
+        self._schedule()
+        return True
+
+    def active_jobs(self) -> List[Dict[str, Any]]:
+        return sorted((job for job in self.jobs.values() if job['status'] in ('queued', 'running')),
+                      key=lambda job: (job['status'] != 'running', -job['priority'], job['seq']))
+
+    def resources_in_use(self) -> Counter:
+        in_use = Counter()
+        for job in self.jobs.values():
+            if job['status'] == 'running':
+                in_use.update(job['resources'])
+        return in_use
+
+    def _fits(self, job: Dict[str, Any], in_use: Counter) -> bool:
+        return all(in_use[name] + count <= self.slots.get(name, 1) for name, count in job['resources'].items())
+
+    def _schedule(self):
+        in_use = self.resources_in_use()
+        queued = sorted((job for job in self.jobs.values() if job['status'] == 'queued'), key=lambda job: (-job['priority'], job['seq']))
+        for job in queued:
+            if self._fits(job, in_use):
+                in_use.update(job['resources'])
+                self._start(job)
+        self.jobs_changed.emit()
+
+    def _start(self, job: Dict[str, Any]):
+        job_id = job['job_id']
+        job.update(status='running', started_at=time.time(), message="正在启动...")
+        task = self.pool.submit(job_id, job['target_func'], *job['args'], **job['kwargs'])
+        task.progress.connect(lambda message: self._on_progress(job_id, message))
+        task.progress_event.connect(lambda event: self.job_event.emit(job_id, event))
+        task.finished.connect(self._on_finished)
+        self._tasks[job_id] = task
+
+    def set_message(self, job_id: str, message: str):
+        job = self.jobs.get(job_id)
+        if job and job['status'] == 'running':
+            job['message'] = message
+            self.jobs_changed.emit()
+
+    def _on_progress(self, job_id: str, message: str):
+        self.set_message(job_id, message.strip().splitlines()[-1] if message.strip() else message)
+        self.job_progress.emit(job_id, message)
+
+    @pyqtSlot(str, str, object)
+    def _on_finished(self, job_id: str, status: str, result: Any):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        job.update(status={'success': 'finished', 'cancelled': 'cancelled'}.get(status, 'failed'), finished_at=time.time())
+        telemetry.event('scheduler', 'job', job['finished_at'] - job['started_at'], labels={'kind': job['kind'], 'status': job['status']},
+                        values={'queue_wait_seconds': job['started_at'] - job['submitted_at']})
+        self._tasks.pop(job_id, None)
+        self.job_finished.emit(job_id, status, result)
+        del self.jobs[job_id]
+        self._schedule()
@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from . import progress
+from ..config import Config
+
+class JobStore:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, title TEXT NOT NULL, params TEXT NOT NULL, status TEXT NOT NULL,
+            cancel_requested INTEGER NOT NULL DEFAULT 0, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL);
+        CREATE TABLE IF NOT EXISTS stages (
+            job_id TEXT NOT NULL, stage TEXT NOT NULL, status TEXT NOT NULL, inputs_key TEXT, outputs TEXT,
+            started_at REAL, finished_at REAL, PRIMARY KEY (job_id, stage));
+    """
+
+    def __init__(self, path: str = Config.JOB_STORE_FILE, jobs_dir: str = Config.JOBS_DIR):
+        self.path = path
+        self.jobs_dir = jobs_dir
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create_job(self, kind: str, title: str, params: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT INTO jobs (job_id, kind, title, params, status, created_at, updated_at) VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                         (job_id, kind, title, json.dumps(params, ensure_ascii=False), now, now))
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._job_from_row(row) if row else None
+
+    def list_jobs(self, statuses: Iterable[str] = (), kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        query, args = "SELECT * FROM jobs WHERE 1 = 1", []
+        statuses = list(statuses)
+        if statuses:
+            query += f" AND status IN ({', '.join('?' * len(statuses))})"
+            args.extend(statuses)
+        if kind:
+            query += " AND kind = ?"
+            args.append(kind)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY created_at", args).fetchall()
+        return [self._job_from_row(row) for row in rows]
+
+    @staticmethod
+    def _job_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        return job
+
+    def update_job(self, job_id: str, status: str, error: Optional[str] = None):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?", (status, error, time.time(), job_id))
+
+    def requeue(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = 'queued', cancel_requested = 0, error = NULL, updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+
+    def request_cancel(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+
+    def cancel_checker(self, job_id: str, interval: float = 0.5) -> Callable[[], bool]:
+        state = {'checked_at': 0.0, 'cancelled': False}
+
+        def check() -> bool:
+            now = time.monotonic()
+            if not state['cancelled'] and now - state['checked_at'] >= interval:
+                state['checked_at'] = now
+                with self._connect() as conn:
+                    row = conn.execute("SELECT cancel_requested FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                state['cancelled'] = bool(row and row['cancel_requested'])
+            return state['cancelled']
+        return check
+
+    def work_dir(self, job_id: str) -> str:
+        path = os.path.join(self.jobs_dir, job_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def remove_work_dir(self, job_id: str):
+        shutil.rmtree(os.path.join(self.jobs_dir, job_id), ignore_errors=True)
+
+    def get_stage(self, job_id: str, stage: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM stages WHERE job_id = ? AND stage = ?", (job_id, stage)).fetchone()
+        if not row:
+            return None
+        record = dict(row)
+        record['outputs'] = json.loads(record['outputs']) if record['outputs'] else None
+        return record
+
+    def _set_stage(self, job_id: str, stage: str, status: str, inputs_key: str, outputs: Any = None, started_at: Optional[float] = None):
+        with self._connect() as conn:
+            if started_at is not None:
+                conn.execute("INSERT OR REPLACE INTO stages (job_id, stage, status, inputs_key, outputs, started_at) VALUES (?, ?, ?, ?, NULL, ?)",
+                             (job_id, stage, status, inputs_key, started_at))
+            else:
+                conn.execute("UPDATE stages SET status = ?, outputs = ?, finished_at = ? WHERE job_id = ? AND stage = ?",
+                             (status, json.dumps(outputs, ensure_ascii=False) if outputs is not None else None, time.time(), job_id, stage))
+
+    def run_stage(self, job_id: str, stage: str, inputs_key: str, func: Callable[[], Any]) -> Any:
+        record = self.get_stage(job_id, stage)
+        if record and record['status'] == 'completed' and record['inputs_key'] == inputs_key and all(os.path.exists(p) for p in record['outputs']['files']):
+            print(f"阶段 {stage} 已在之前的运行中完成，跳过。")
+            return record['outputs']['result']
+
+        self._set_stage(job_id, stage, 'running', inputs_key, started_at=time.time())
+        try:
+            result = func()
+        except progress.JobCancelled:
+            self._set_stage(job_id, stage, 'cancelled', inputs_key)
+            raise
+        except Exception as e:
+            self._set_stage(job_id, stage, 'failed', inputs_key, {'error': str(e)})
+            raise
+        files = [result] if isinstance(result, str) and os.path.exists(result) else []
+        self._set_stage(job_id, stage, 'completed', inputs_key, {'result': result, 'files': files})
+        return result
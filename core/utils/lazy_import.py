@@ -0,0 +1,33 @@
+import sys
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Any
+
+def module_available(name: str) -> bool:
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+class _LazyModule(ModuleType):
+    def __getattr__(self, attr: str) -> Any:
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+def lazy_module(name: str) -> ModuleType:
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+    return _LazyModule(name)
+
+def is_loaded(name: str) -> bool:
+    return name in sys.modules
+
+def load_module(name: str) -> ModuleType:
+    return importlib.import_module(name)
@@ -0,0 +1,41 @@
+import pickle
+import socket
+import struct
+import threading
+from typing import Any, Optional, Tuple
+
+HEADER = struct.Struct('!I')
+
+def channel_pair() -> Tuple[socket.socket, socket.socket]:
+    return socket.socketpair()
+
+class MessageChannel:
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._send_lock = threading.Lock()
+
+    def send(self, message: Any):
+        payload = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+        with self._send_lock:
+            self.sock.sendall(HEADER.pack(len(payload)) + payload)
+
+    def _recv_exact(self, size: int) -> Optional[bytes]:
+        buffer = bytearray()
+        while len(buffer) < size:
+            data = self.sock.recv(size - len(buffer))
+            if not data:
+                return None
+            buffer.extend(data)
+        return bytes(buffer)
+
+    def recv(self) -> Any:
+        header = self._recv_exact(HEADER.size)
+        if header is None:
+            raise EOFError
+        payload = self._recv_exact(HEADER.unpack(header)[0])
+        if payload is None:
+            raise EOFError
+        return pickle.loads(payload)
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+import pickle
+import socket
+import traceback
+from typing import List, Optional
+
+from . import progress, telemetry
+from .message_channel import MessageChannel
+from .lazy_import import load_module
+
+def _rss_bytes() -> int:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    except ImportError:
+        return 0
+
+def pool_worker_main(sock: socket.socket, preload_modules: List[str], max_tasks: int, max_memory_growth: int):
+    start = time.perf_counter()
+    for module_name in preload_modules:
+        try:
+            load_module(module_name)
+        except ImportError:
+            pass
+
+    channel = MessageChannel(sock)
+    current_task: List[Optional[str]] = [None]
+
+    def send(*message):
+        try:
+            channel.send(message)
+        except OSError:
+            pass
+
+    def progress_emitter(message: str):
+        send('progress', current_task[0], message)
+
+    original_print = print
+    def redirected_print(*p_args, **p_kwargs):
+        progress_emitter(" ".join(map(str, p_args)))
+        original_print(*p_args, **p_kwargs)
+
+    __builtins__['print'] = redirected_print
+    progress.set_emitter(lambda event: send('event', current_task[0], event))
+
+    baseline_rss = _rss_bytes()
+    send('ready', os.getpid(), time.perf_counter() - start)
+    telemetry.event('worker', 'ready', time.perf_counter() - start, values={'rss_bytes': baseline_rss})
+
+    tasks_done = 0
+    while True:
+        try:
+            message = channel.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+        task_id, target_func, args, kwargs = message
+        current_task[0] = task_id
+        telemetry.set_context(task_id=task_id)
+        task_start = time.perf_counter()
+        try:
+            progress_emitter(f"进程 {os.getpid()} 已启动，准备执行任务: {task_id}")
+            outcome = ('success', target_func(*args, **kwargs))
+        except progress.JobCancelled as e:
+            outcome = ('cancelled', str(e))
+        except Exception as e:
+            error_msg = f"子进程任务 '{task_id}' 发生严重错误: {e}\n{traceback.format_exc()}"
+            progress_emitter(error_msg)
+            outcome = ('error', error_msg)
+
+        tasks_done += 1
+        growth = _rss_bytes() - baseline_rss
+        telemetry.event('worker', 'task', time.perf_counter() - task_start, labels={'kind': task_id.split('#')[0], 'status': outcome[0]},
+                        values={'rss_growth_bytes': growth})
+        telemetry.set_context(task_id=None)
+        retire_reason = None
+        if max_tasks and tasks_done >= max_tasks:
+            retire_reason = f"已执行 {tasks_done} 个任务"
+        elif max_memory_growth and baseline_rss and growth > max_memory_growth:
+            retire_reason = f"内存增长 {growth / 1024 / 1024:.0f}MB"
+        if retire_reason:
+            send('retire', retire_reason)
+
+        try:
+            channel.send(('finished', task_id, *outcome))
+        except (TypeError, AttributeError, ValueError, pickle.PicklingError) as e:
+            send('finished', task_id, 'error', f"子进程任务 '{task_id}' 的结果无法传回主进程: {e}")
+        except OSError:
+            break
+        current_task[0] = None
+        if retire_reason:
+            break
+    channel.close()
@@ -0,0 +1,41 @@
+from typing import Any, Callable, Dict, Optional
+
+_emitter: Optional[Callable[[Dict[str, Any]], None]] = None
+_cancel_check: Optional[Callable[[], bool]] = None
+
+class JobCancelled(Exception):
+    pass
+
+def set_emitter(emitter: Optional[Callable[[Dict[str, Any]], None]]):
+    global _emitter
+    _emitter = emitter
+
+def emit(event_type: str, **fields: Any):
+    if _emitter is None:
+        return
+    try:
+        _emitter({'type': event_type, **fields})
+    except Exception:
+        pass
+
+def set_cancel_check(check: Optional[Callable[[], bool]]):
+    global _cancel_check
+    _cancel_check = check
+
+def cancel_requested() -> bool:
+    if _cancel_check is None:
+        return False
+    try:
+        return bool(_cancel_check())
+    except Exception:
+        return False
+
+def raise_if_cancelled():
+    if cancel_requested():
+        raise JobCancelled("任务已取消")
+
+def format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None or seconds < 0:
+        return "--:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
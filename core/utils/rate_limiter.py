@@ -0,0 +1,31 @@
+import time
+import asyncio
+import threading
+from typing import Dict, Tuple
+
+class HostRateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _try_take(self, host: str) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                self._buckets[host] = (tokens - 1, now)
+                return 0.0
+            self._buckets[host] = (tokens, now)
+            return (1 - tokens) / self.rate
+
+    async def acquire(self, host: str):
+        if self.rate <= 0:
+            return
+        while True:
+            wait = self._try_take(host)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
@@ -0,0 +1,76 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from . import progress, telemetry
+
+class StageGraph:
+    def __init__(self, max_workers: Optional[int] = None, service: str = 'pipeline'):
+        self.max_workers = max_workers
+        self.service = service
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, func: Callable[[], Any], deps: Sequence[str] = ()):
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"阶段 '{name}' 依赖的阶段 '{dep}' 未定义。")
+        self.stages[name] = {'func': func, 'deps': tuple(deps)}
+
+    def _run_stage(self, name: str, origin: float) -> Any:
+        progress.raise_if_cancelled()
+        start = time.perf_counter()
+        progress.emit('stage_start', stage=name)
+        try:
+            with telemetry.span(self.service, 'stage', labels={'stage': name}):
+                return self.stages[name]['func']()
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.timings[name] = {'start': start - origin, 'end': end - origin, 'duration': end - start}
+            progress.emit('stage_end', stage=name, duration=end - start)
+
+    def run(self) -> Dict[str, Any]:
+        origin = time.perf_counter()
+        pending = dict(self.stages)
+        running = {}
+        error: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(self.stages) or 1) as executor:
+            while pending or running:
+                if error is None:
+                    for name in [n for n, s in pending.items() if all(d in self.results for d in s['deps'])]:
+                        running[executor.submit(self._run_stage, name, origin)] = name
+                        del pending[name]
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except BaseException as e:
+                        error = error or e
+        if error is not None:
+            raise error
+        return self.results
+
+    def critical_path(self) -> List[str]:
+        if not self.timings:
+            return []
+        path = [max(self.timings, key=lambda n: self.timings[n]['end'])]
+        while True:
+            deps = [d for d in self.stages[path[-1]]['deps'] if d in self.timings]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda d: self.timings[d]['end']))
+        return path[::-1]
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'stages': {name: dict(timing, deps=list(self.stages[name]['deps'])) for name, timing in sorted(self.timings.items(), key=lambda item: item[1]['start'])},
+            'critical_path': self.critical_path(),
+            'wall_time': max((t['end'] for t in self.timings.values()), default=0.0),
+        }
@@ -0,0 +1,196 @@
+import os
+import re
+import sys
+import json
+import time
+import socket
+import argparse
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..config import Config
+
+_HOST = socket.gethostname()
+_context: Dict[str, Any] = {}
+
+def set_context(**fields: Any):
+    for key, value in fields.items():
+        if value is None:
+            _context.pop(key, None)
+        else:
+            _context[key] = value
+
+def event(service: str, name: str, duration: Optional[float] = None, bytes_written: Optional[int] = None,
+          labels: Optional[Dict[str, Any]] = None, values: Optional[Dict[str, Optional[float]]] = None, **fields: Any):
+    if not Config.TELEMETRY_ENABLED:
+        return
+    record = {'ts': time.time(), 'host': _HOST, 'pid': os.getpid(), 'service': service, 'event': name, **_context,
+              'labels': {key: str(value) for key, value in (labels or {}).items()}, **fields}
+    if duration is not None:
+        record['duration'] = duration
+    if bytes_written is not None:
+        record['bytes'] = bytes_written
+    if values:
+        record['values'] = {key: value for key, value in values.items() if value is not None}
+    try:
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode('utf-8')
+        os.makedirs(os.path.dirname(Config.TELEMETRY_EVENTS_FILE), exist_ok=True)
+        fd = os.open(Config.TELEMETRY_EVENTS_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    except (OSError, TypeError, ValueError):
+        pass
+
+@contextmanager
+def span(service: str, name: str, labels: Optional[Dict[str, Any]] = None, **fields: Any) -> Iterator[Dict[str, Any]]:
+    record: Dict[str, Any] = {'labels': dict(labels or {}), 'values': {}, 'bytes_written': None, **fields}
+    status = 'ok'
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        name_of_error = type(e).__name__
+        status = 'cancelled' if name_of_error in ('JobCancelled', 'CancelledError', 'GeneratorExit') else 'timeout' if 'Timeout' in name_of_error else 'error'
+        raise
+    finally:
+        record['labels'].setdefault('status', status)
+        event(service, name, time.perf_counter() - start, **record)
+
+class MetricsExporter:
+    PREFIX = "videoflow"
+
+    def __init__(self, events_file: Optional[str] = None, rotate: bool = False):
+        self.events_file = events_file or Config.TELEMETRY_EVENTS_FILE
+        self.rotate = rotate
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self.summaries: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[float]] = {}
+        self.last_event_ts = 0.0
+        self._offset = 0
+        self._inode: Optional[int] = None
+
+    @staticmethod
+    def _metric_name(*parts: str) -> str:
+        return re.sub(r'[^a-zA-Z0-9_]', '_', "_".join(part for part in parts if part)).lower()
+
+    def _consume(self, path: str) -> int:
+        consumed = 0
+        with open(path, 'rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._offset += len(line)
+                try:
+                    self.fold(json.loads(line))
+                    consumed += 1
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return consumed
+
+    def refresh(self) -> int:
+        try:
+            stat = os.stat(self.events_file)
+        except OSError:
+            return 0
+        consumed = 0
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            try:
+                if self._inode is not None and os.stat(self.events_file + ".1").st_ino == self._inode:
+                    consumed += self._consume(self.events_file + ".1")
+            except OSError:
+                pass
+            self._inode, self._offset = stat.st_ino, 0
+
+        consumed += self._consume(self.events_file)
+
+        if self.rotate and stat.st_size > Config.TELEMETRY_MAX_BYTES and self._offset >= stat.st_size:
+            try:
+                os.replace(self.events_file, self.events_file + ".1")
+                self._inode, self._offset = None, 0
+            except OSError:
+                pass
+        return consumed
+
+    def fold(self, record: Dict[str, Any]):
+        base = self._metric_name(self.PREFIX, record['service'], record['event'])
+        labels = tuple(sorted({'host': record.get('host', ''), **record.get('labels', {})}.items()))
+        self._add_counter(f"{base}_total", labels, 1)
+        if record.get('duration') is not None:
+            self._observe(f"{base}_duration_seconds", labels, float(record['duration']))
+        if record.get('bytes') is not None:
+            self._add_counter(f"{base}_bytes_total", labels, float(record['bytes']))
+        for key, value in record.get('values', {}).items():
+            self._observe(self._metric_name(base, key), labels, float(value))
+        self.last_event_ts = max(self.last_event_ts, record.get('ts', 0.0))
+
+    def _add_counter(self, name: str, labels: Tuple[Tuple[str, str], ...], value: float):
+        self.counters[(name, labels)] = self.counters.get((name, labels), 0.0) + value
+
+    def _observe(self, name: str, labels: Tuple[Tuple[str, str], ...], value: float):
+        summary = self.summaries.setdefault((name, labels), [0, 0.0, value])
+        summary[0] += 1
+        summary[1] += value
+        summary[2] = max(summary[2], value)
+
+    @staticmethod
+    def _escape(value: Any) -> str:
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+    @staticmethod
+    def _format_labels(labels: Tuple[Tuple[str, str], ...], **extra: str) -> str:
+        pairs = [*labels, *extra.items()]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{MetricsExporter._metric_name(key)}="{MetricsExporter._escape(value)}"' for key, value in pairs) + "}"
+
+    def render(self) -> str:
+        lines: List[str] = []
+        typed = set()
+        for (name, labels), value in sorted(self.counters.items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{self._format_labels(labels)} {value:g}")
+        peaks: Dict[str, List[str]] = {}
+        for (name, labels), (count, total, peak) in sorted(self.summaries.items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} summary")
+            lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+            lines.append(f"{name}_sum{self._format_labels(labels)} {total:.6g}")
+            peaks.setdefault(f"{name}_max", []).append(f"{name}_max{self._format_labels(labels)} {peak:.6g}")
+        for name, samples in peaks.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+        lines.append(f"# TYPE {self.PREFIX}_telemetry_last_event_timestamp_seconds gauge")
+        lines.append(f"{self.PREFIX}_telemetry_last_event_timestamp_seconds {self.last_event_ts:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[str] = None) -> str:
+        path = path or Config.TELEMETRY_METRICS_FILE
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+        return path
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="将结构化事件日志 (JSONL) 汇总导出为 Prometheus 文本格式快照")
+    parser.add_argument("--events", default=Config.TELEMETRY_EVENTS_FILE, help="事件日志文件路径")
+    parser.add_argument("-o", "--output", default=Config.TELEMETRY_METRICS_FILE, help="指标快照输出路径，'-' 表示输出到标准输出")
+    parser.add_argument("--rotate", action="store_true", help="事件日志超过上限时由本进程负责轮转（同一日志只应有一个轮转者）")
+    args = parser.parse_args(argv)
+
+    exporter = MetricsExporter(args.events, args.rotate)
+    consumed = exporter.refresh()
+    if args.output == "-":
+        sys.stdout.write(exporter.render())
+    else:
+        print(f"已汇总 {consumed} 条事件，指标快照已写入: {exporter.write_prometheus(args.output)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
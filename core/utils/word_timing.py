@@ -0,0 +1,36 @@
+import os
+import json
+from typing import Iterable, List, Optional, Tuple
+
+SIDECAR_SUFFIX = ".timing.jsonl"
+FORMAT_VERSION = 1
+
+def sidecar_path(audio_path: str) -> str:
+    return os.path.splitext(audio_path)[0] + SIDECAR_SUFFIX
+
+def write_sidecar(audio_path: str, boundary_type: str, entries: Iterable[Tuple[int, int, str]], srt_path: Optional[str] = None) -> str:
+    path = sidecar_path(audio_path)
+    header = {'version': FORMAT_VERSION, 'type': boundary_type, 'audio': os.path.basename(audio_path), 'srt': os.path.basename(srt_path) if srt_path else None}
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        f.writelines(json.dumps([start_ms, end_ms, text], ensure_ascii=False) + "\n" for start_ms, end_ms, text in entries)
+    return path
+
+def read_sidecar(path: str) -> Tuple[dict, List[Tuple[int, int, str]]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"不支持的时间戳文件版本: {header.get('version')}")
+        return header, [tuple(json.loads(line)) for line in f if line.strip()]
+
+def load_for_subtitles(audio_path: str, srt_path: str) -> Optional[List[Tuple[int, int, str]]]:
+    path = sidecar_path(audio_path)
+    try:
+        if os.path.getmtime(srt_path) > os.path.getmtime(path):
+            return None
+        header, entries = read_sidecar(path)
+    except (OSError, ValueError):
+        return None
+    if header.get('srt') != os.path.basename(srt_path):
+        return None
+    return entries
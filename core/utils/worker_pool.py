@@ -0,0 +1,153 @@
+import time
+import multiprocessing
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer, pyqtSlot
+
+from .channel_reader import ChannelReader
+from .message_channel import channel_pair
+from .pool_worker import pool_worker_main
+from ..config import Config
+
+class PooledTask(QObject):
+    finished = pyqtSignal(str, str, object)
+    progress = pyqtSignal(str)
+    progress_event = pyqtSignal(dict)
+
+    def __init__(self, pool: 'WorkerPool', task_id: str, target_func: Callable, args: tuple, kwargs: dict):
+        super().__init__()
+        self.pool = pool
+        self.task_id = task_id
+        self.target_func = target_func
+        self.args = args
+        self.kwargs = kwargs
+        self.submitted_at = time.perf_counter()
+
+    def stop(self):
+        self.pool.cancel(self)
+
+class _PoolWorker:
+    def __init__(self, process: multiprocessing.Process, reader: ChannelReader):
+        self.process = process
+        self.reader = reader
+        self.task: Optional[PooledTask] = None
+        self.ready = False
+        self.retiring = False
+
+class WorkerPool(QObject):
+    worker_ready = pyqtSignal(int, float)
+
+    def __init__(self, size: int = Config.WORKER_POOL_SIZE, max_tasks: int = Config.WORKER_MAX_TASKS,
+                 max_memory_growth: int = Config.WORKER_MAX_MEMORY_GROWTH, preload_modules: Optional[List[str]] = None, max_size: Optional[int] = None):
+        super().__init__()
+        self.size = max(1, size)
+        self.max_size = max(self.size, max_size or self.size)
+        self.max_tasks = max_tasks
+        self.max_memory_growth = max_memory_growth
+        self.preload_modules = Config.WORKER_PRELOAD_MODULES if preload_modules is None else preload_modules
+        self.workers: List[_PoolWorker] = []
+        self.pending: Deque[PooledTask] = deque()
+        self.running = False
+
+    def start(self):
+        self.running = True
+        while len(self.workers) < self.size:
+            self._spawn_worker()
+
+    def submit(self, task_id: str, target_func: Callable, *args, **kwargs) -> PooledTask:
+        task = PooledTask(self, task_id, target_func, args, kwargs)
+        self.pending.append(task)
+        QTimer.singleShot(0, self._dispatch)
+        return task
+
+    def cancel(self, task: PooledTask):
+        if task in self.pending:
+            self.pending.remove(task)
+            return
+        for worker in self.workers:
+            if worker.task is task:
+                worker.task = None
+                self._replace_worker(worker)
+                return
+
+    def shutdown(self):
+        self.running = False
+        for worker in self.workers:
+            try:
+                worker.reader.send(None)
+            except OSError:
+                pass
+        for worker in self.workers:
+            worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.reader.close()
+        self.workers = []
+
+    def _spawn_worker(self):
+        parent_sock, child_sock = channel_pair()
+        reader = ChannelReader(parent_sock, self)
+        process = multiprocessing.Process(target=pool_worker_main, args=(child_sock, self.preload_modules, self.max_tasks, self.max_memory_growth), daemon=True)
+        process.start()
+        child_sock.close()
+        worker = _PoolWorker(process, reader)
+        reader.message.connect(lambda message: self._handle_message(worker, message))
+        reader.closed.connect(lambda: self._on_worker_closed(worker))
+        self.workers.append(worker)
+
+    def _replace_worker(self, worker: _PoolWorker):
+        worker.reader.close()
+        if worker.process.is_alive():
+            worker.process.terminate()
+        worker.process.join(timeout=1)
+        self.workers.remove(worker)
+        if self.running:
+            if len(self.workers) < self.size:
+                self._spawn_worker()
+            self._dispatch()
+
+    @pyqtSlot()
+    def _dispatch(self):
+        if not self.running:
+            return
+        idle = sum(1 for worker in self.workers if worker.task is None and not worker.retiring)
+        while len(self.pending) > idle and len(self.workers) < self.max_size:
+            self._spawn_worker()
+            idle += 1
+        for worker in self.workers:
+            if not self.pending:
+                return
+            if worker.task is None and not worker.retiring and worker.process.is_alive():
+                task = self.pending.popleft()
+                try:
+                    worker.reader.send((task.task_id, task.target_func, task.args, task.kwargs))
+                    worker.task = task
+                except Exception as e:
+                    task.finished.emit(task.task_id, 'error', f"提交任务到工作进程失败: {e}")
+
+    def _on_worker_closed(self, worker: _PoolWorker):
+        if worker.task is not None:
+            task, worker.task = worker.task, None
+            task.finished.emit(task.task_id, 'error', '子进程意外终止。')
+        if worker in self.workers:
+            self._replace_worker(worker)
+
+    def _handle_message(self, worker: _PoolWorker, message: tuple):
+        kind = message[0]
+        if kind == 'ready':
+            worker.ready = True
+            self.worker_ready.emit(message[1], message[2])
+        elif kind == 'retire':
+            worker.retiring = True
+            print(f"工作进程 {worker.process.pid} 将被回收: {message[1]}")
+        elif worker.task is None or message[1] != worker.task.task_id:
+            return
+        elif kind == 'progress':
+            worker.task.progress.emit(message[2])
+        elif kind == 'event':
+            worker.task.progress_event.emit(message[2])
+        elif kind == 'finished':
+            task, worker.task = worker.task, None
+            task.finished.emit(message[1], message[2], message[3])
+            self._dispatch()
@@ -0,0 +1,81 @@
+import os
+import sys
+import argparse
+import multiprocessing
+from core.config import Config
+from core.utils.farm_queue import FarmQueue
+from core.services.batch_service import BatchRenderService
+from core.services.render_farm import run_worker_process
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="共享文件系统渲染农场：多台机器共享同一任务目录，领取并渲染视频任务")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    submit = subparsers.add_parser("submit", help="将任务清单 (.jsonl / .csv) 提交到任务目录")
+    submit.add_argument("farm", help="共享任务目录（所有节点挂载到相同路径）")
+    submit.add_argument("manifest", help="任务清单文件路径")
+    submit.add_argument("-o", "--output-dir", default=Config.OUTPUT_DIR, help="未指定 video_output 的任务的输出目录（应位于共享存储上）")
+    submit.add_argument("--gpu", action="store_true", help="默认开启GPU加速（可被清单中的 use_gpu 覆盖）")
+    submit.add_argument("--still-frames", action="store_true", help="默认使用静态帧快速模式（可被清单中的 still_frames 覆盖）")
+
+    worker = subparsers.add_parser("worker", help="在本机启动渲染节点进程")
+    worker.add_argument("farm", help="共享任务目录")
+    worker.add_argument("-j", "--workers", type=int, default=1, help="本机并行的渲染进程数")
+    worker.add_argument("--lease", type=float, default=Config.FARM_LEASE_SECONDS, help="租约时长（秒），超过该时长无心跳的任务会被重新排队")
+    worker.add_argument("--heartbeat", type=float, default=Config.FARM_HEARTBEAT_INTERVAL, help="心跳间隔（秒）")
+    worker.add_argument("--poll", type=float, default=Config.FARM_POLL_INTERVAL, help="队列为空时的轮询间隔（秒）")
+    worker.add_argument("--exit-when-idle", action="store_true", help="队列和进行中的任务都为空时退出")
+
+    status = subparsers.add_parser("status", help="查看任务目录状态")
+    status.add_argument("farm", help="共享任务目录")
+
+    retry = subparsers.add_parser("retry", help="将失败的任务重新排队")
+    retry.add_argument("farm", help="共享任务目录")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    multiprocessing.freeze_support()
+    args = parse_args(argv)
+
+    if args.command == "submit":
+        output_dir = os.path.abspath(args.output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+        try:
+            jobs = BatchRenderService.load_manifest(args.manifest, output_dir, args.gpu, args.still_frames)
+        except (OSError, ValueError) as e:
+            print(f"读取任务清单失败: {e}")
+            return 2
+        farm = FarmQueue(args.farm)
+        for job in jobs:
+            farm.submit(job['params'], job['job_id'])
+        print(f"已提交 {len(jobs)} 个任务到 {farm.root}")
+        return 0
+
+    if args.command == "worker":
+        if args.heartbeat >= args.lease:
+            print("心跳间隔必须小于租约时长。")
+            return 2
+        worker_args = (args.farm, args.lease, args.heartbeat, args.poll, args.exit_when_idle)
+        if args.workers <= 1:
+            run_worker_process(*worker_args)
+            return 0
+        processes = [multiprocessing.Process(target=run_worker_process, args=worker_args) for _ in range(args.workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        return 0
+
+    farm = FarmQueue(args.farm)
+    if args.command == "retry":
+        print(f"已重新排队 {len(farm.retry_failed())} 个失败任务。")
+        return 0
+
+    status = farm.status()
+    print(f"排队: {status['queue']}，进行中: {status['running']}，完成: {status['done']}，失败: {status['failed']}")
+    for job in status['running_jobs']:
+        print(f"  {job['job_id']} @ {job['worker']}，上次心跳 {job['heartbeat_age']:.0f}s 前")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())